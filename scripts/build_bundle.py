@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Build the prebuilt content bundle
+
+Packs every resource, snippet, its parsed frontmatter and the search,
+symbol and section indexes into one memory-mappable file that the server
+maps at startup instead of walking resources/ when
+WORDPRESS_MCP_CONTENT_BUNDLE points at it. Rebuild it whenever
+resources change; `--check` reports whether an existing bundle is out of
+date instead of building one (exit status 1 if it is).
+"""
+
+import os
+import sys
+import logging
+from pathlib import Path
+
+# The bundle must be built from resources/ on disk, never from an older bundle
+os.environ["WORDPRESS_MCP_CONTENT_BUNDLE"] = ""
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_OUTPUT = Path(__file__).parent.parent / "resources.bundle"
+
+def check(path):
+    """Compare the bundle at path with resources/ on disk"""
+    from wordpress_mcp import RESOURCES_DIR, ContentBundle
+
+    bundle = ContentBundle.open(path)
+    if bundle is None:
+        logger.error(f"No usable bundle at {path}")
+        return 1
+    if bundle.warn_if_stale(RESOURCES_DIR):
+        return 1
+    logger.info(f"{path} is up to date with {RESOURCES_DIR}")
+    return 0
+
+def main():
+    """Build the bundle at the path given on the command line, or next to the server"""
+    args = sys.argv[1:]
+    if "--check" in args:
+        args.remove("--check")
+        return check(args[0] if args else str(DEFAULT_OUTPUT))
+    output = args[0] if args else str(DEFAULT_OUTPUT)
+
+    from wordpress_mcp import write_content_bundle
+
+    try:
+        result = write_content_bundle(output)
+    except (OSError, RuntimeError) as e:
+        logger.error(f"Bundle build failed: {e}")
+        return 1
+
+    logger.info(f"Wrote {result['path']}: {result['files']} files, {result['bytes']:,} bytes, "
+                f"{result['documents']} indexed documents, {result['terms']} terms, {result['symbols']} symbols")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,11 @@
+"""Shared fixtures for the WordPress MCP server tests."""
+
+import os
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Serve resources from the tree, never from a prebuilt bundle
+os.environ.setdefault("WORDPRESS_MCP_CONTENT_BUNDLE", "")
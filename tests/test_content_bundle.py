@@ -0,0 +1,106 @@
+"""Prebuilt content bundle."""
+
+import logging
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+import wordpress_mcp as server
+
+
+@pytest.fixture(scope="module")
+def bundle_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("bundle") / "resources.bundle"
+    server.write_content_bundle(str(path))
+    return str(path)
+
+
+def test_bundle_serves_the_tree(bundle_path):
+    bundle = server.ContentBundle.open(bundle_path)
+    records = server.metadata_registry.records()
+    assert len(bundle.files) == len(records)
+    for record in records[:20]:
+        assert bundle.read(record.path) == (server.RESOURCES_DIR / record.path).read_text(encoding="utf-8")
+    assert bundle.search_index() is not None
+
+
+def test_bundled_workers_never_walk_the_tree(bundle_path, tmp_path):
+    empty = tmp_path / "resources"
+    empty.mkdir()
+    store = server.ResourceContentStore(empty, server.ContentBundle.open(bundle_path))
+    registry = server.MetadataRegistry(empty, store)
+    live = {record.path: record.hash for record in server.metadata_registry.records()}
+    assert {record.path: record.hash for record in registry.records()} == live
+    assert store.get(empty / "core" / "database.md") == \
+        (server.RESOURCES_DIR / "core" / "database.md").read_text(encoding="utf-8")
+    with pytest.raises(FileNotFoundError):
+        store.get(empty / "core" / "missing.md")
+
+    index = server.SearchIndex(registry, tmp_path / "index.json")
+    index.virtual_documents = server.search_index.virtual_documents
+    assert index.search("nonce")
+    assert index.built_from == "bundle"
+    assert not (tmp_path / "index.json").exists()
+
+
+def test_fresh_bundle_is_not_stale(bundle_path):
+    assert server.ContentBundle.open(bundle_path).stale_files(server.RESOURCES_DIR) == []
+
+
+def test_stale_files_after_edits(bundle_path, tmp_path):
+    root = tmp_path / "resources"
+    shutil.copytree(server.RESOURCES_DIR, root)  # copy2 keeps mtimes
+    bundle = server.ContentBundle.open(bundle_path)
+    assert bundle.stale_files(root) == []
+
+    edited = sorted(bundle.files)[0]
+    (root / edited).write_text("# Edited\n", encoding="utf-8")
+    (root / "core" / "new-topic.md").write_text("# New\n", encoding="utf-8")
+    removed = sorted(bundle.files)[-1]
+    (root / removed).unlink()
+    assert bundle.stale_files(root) == sorted([edited, "core/new-topic.md", removed])
+
+
+def test_stale_bundle_is_logged(bundle_path, tmp_path, caplog):
+    root = tmp_path / "resources"
+    shutil.copytree(server.RESOURCES_DIR, root)
+    (root / "core" / "new-topic.md").write_text("# New\n", encoding="utf-8")
+    with caplog.at_level(logging.WARNING, logger=server.logger.name):
+        assert server.ContentBundle.open(bundle_path).warn_if_stale(root) == ["core/new-topic.md"]
+    assert "out of date" in caplog.text and "core/new-topic.md" in caplog.text
+
+
+def test_opening_a_bundle_does_not_walk_the_tree(bundle_path, monkeypatch):
+    def walk(self, root):
+        raise AssertionError("stale_files called while opening the bundle")
+
+    monkeypatch.setattr(server.ContentBundle, "stale_files", walk)
+    assert server.ContentBundle.open(bundle_path) is not None
+
+
+def test_build_script_checks_freshness(bundle_path):
+    script = server.RESOURCES_DIR.parent / "scripts" / "build_bundle.py"
+    result = subprocess.run([sys.executable, str(script), "--check", bundle_path],
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert "up to date" in result.stderr
+
+
+def test_bundle_is_opt_in():
+    env = {key: value for key, value in os.environ.items() if key != "WORDPRESS_MCP_CONTENT_BUNDLE"}
+    result = subprocess.run([sys.executable, "-c", "import wordpress_mcp as s; print(repr(s.CONTENT_BUNDLE_PATH))"],
+                            cwd=str(server.RESOURCES_DIR.parent), env=env, capture_output=True, text=True,
+                            timeout=120)
+    assert result.stdout.strip().splitlines()[-1] == "''"
+
+
+def test_unusable_bundles_are_ignored(tmp_path):
+    garbage = tmp_path / "resources.bundle"
+    garbage.write_bytes(b"not a bundle at all")
+    assert server.ContentBundle.open(str(garbage)) is None
+    assert server.ContentBundle.open(str(tmp_path / "missing.bundle")) is None
+    assert server.ContentBundle.open("") is None
+
@@ -0,0 +1,66 @@
+"""In-memory resource content store."""
+
+import os
+
+import pytest
+
+import wordpress_mcp as server
+
+
+@pytest.fixture
+def store(tmp_path):
+    return server.ResourceContentStore(tmp_path, revalidate_interval=0)
+
+
+def _touch(path, content):
+    path.write_text(content, encoding="utf-8")
+    stamp = path.stat().st_mtime_ns + 10**9
+    os.utime(path, ns=(stamp, stamp))
+
+
+def test_files_are_read_once(tmp_path):
+    path = tmp_path / "hooks.md"
+    path.write_text("# Hooks\n", encoding="utf-8")
+    store = server.ResourceContentStore(tmp_path, revalidate_interval=60)
+    assert store.get(path) == "# Hooks\n"
+    path.write_text("# Changed\n", encoding="utf-8")
+    assert store.get(path) == "# Hooks\n"
+    stats = store.stats()
+    assert (stats["hits"], stats["misses"], stats["reloads"]) == (1, 1, 0)
+    assert stats["entries"] == 1
+
+
+def test_changed_files_are_reloaded(store, tmp_path):
+    path = tmp_path / "hooks.md"
+    path.write_text("# Hooks\n", encoding="utf-8")
+    assert store.get(path) == "# Hooks\n"
+    assert store.get(path) == "# Hooks\n"
+    _touch(path, "# Hooks, revised\n")
+    assert store.get(path) == "# Hooks, revised\n"
+    stats = store.stats()
+    assert (stats["hits"], stats["misses"], stats["reloads"]) == (1, 1, 1)
+
+
+def test_removed_files_raise(store, tmp_path):
+    path = tmp_path / "hooks.md"
+    path.write_text("# Hooks\n", encoding="utf-8")
+    store.get(path)
+    path.unlink()
+    with pytest.raises(FileNotFoundError):
+        store.get(path)
+    assert store.stats()["entries"] == 0
+
+
+def test_invalidate_drops_entries(store, tmp_path):
+    path = tmp_path / "hooks.md"
+    path.write_text("# Hooks\n", encoding="utf-8")
+    store.get(path)
+    store.invalidate(path)
+    assert store.stats()["entries"] == 0
+
+
+def test_load_resource_content():
+    expected = (server.RESOURCES_DIR / "core" / "database.md").read_text(encoding="utf-8")
+    assert server.load_resource_content("core", "database") == expected
+    with pytest.raises(FileNotFoundError, match="core/nothing"):
+        server.load_resource_content("core", "nothing")
@@ -0,0 +1,96 @@
+"""Background job timeout and cancellation."""
+
+import threading
+import time
+
+import pytest
+
+import wordpress_mcp as server
+from tools import wp_cli
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setitem(server.TOOL_LIMITS, "test_tool", (1, 0.5))
+    jobs = server.JobManager(max_workers=1, history=10)
+    yield jobs
+    jobs._executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _wait(job, timeout=5.0):
+    job.future.result(timeout=timeout)
+    return job
+
+
+def _sleeper(seconds, lines):
+    end = time.monotonic() + seconds
+    while time.monotonic() < end:
+        if wp_cli.is_cancelled():
+            break
+        time.sleep(0.01)
+    lines.append("done")
+    return server.ToolResult(True, None, lines)
+
+
+def test_job_succeeds(manager):
+    job = _wait(manager.submit("test_tool", "run", _sleeper, 0.0))
+    assert job.status == "succeeded"
+    assert job.lines == ["done"]
+    assert job.finished_at is not None
+
+
+def test_job_times_out(manager):
+    job = _wait(manager.submit("test_tool", "run", _sleeper, 3.0))
+    assert job.status == "timed out"
+    assert job.elapsed() < 2.0
+
+
+def test_deadline_starts_when_job_runs(manager):
+    gate = threading.Event()
+    blocker = manager.submit("test_tool", "block", lambda lines: gate.wait(5) and server.ToolResult(True, None, lines))
+    queued = manager.submit("test_tool", "run", _sleeper, 0.2)
+    time.sleep(0.7)  # longer than the tool timeout while the job is still queued
+    assert queued.status == "queued"
+    gate.set()
+    _wait(blocker)
+    _wait(queued)
+    assert queued.status == "succeeded"
+
+
+def test_cancel_running_job(manager):
+    job = manager.submit("test_tool", "run", _sleeper, 3.0)
+    while job.status == "queued":
+        time.sleep(0.01)
+    manager.cancel(job.id)
+    _wait(job)
+    assert job.status == "cancelled"
+    assert job.finished_at is not None
+
+
+def test_cancel_queued_job(manager):
+    gate = threading.Event()
+    blocker = manager.submit("test_tool", "block", lambda lines: gate.wait(5) and server.ToolResult(True, None, lines))
+    queued = manager.submit("test_tool", "run", _sleeper, 0.0)
+    manager.cancel(queued.id)
+    gate.set()
+    _wait(blocker)
+    assert queued.status == "cancelled"
+    assert queued.finished_at is not None
+    assert queued.lines == []
+
+
+def test_full_install_fails_when_cancelled(monkeypatch, tmp_path):
+    from tools.wordpress_installer import WordPressInstaller
+
+    installer = WordPressInstaller(log=lambda line: None)
+    for step in ("download_wordpress", "setup_database", "create_wp_config", "install_wordpress"):
+        monkeypatch.setattr(installer, step, lambda *args: True)
+    scope = wp_cli.ExecutionScope()
+
+    def install_plugins(plugins, target_dir):
+        scope.cancel()
+        return False
+
+    monkeypatch.setattr(installer, "install_plugins", install_plugins)
+    with wp_cli.execution_scope(scope):
+        assert installer.full_install(str(tmp_path), plugins=["akismet"], themes=[]) is False
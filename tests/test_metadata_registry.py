@@ -0,0 +1,67 @@
+"""Shared frontmatter metadata registry."""
+
+import os
+
+import pytest
+
+import wordpress_mcp as server
+
+SNIPPET = (
+    "---\ndifficulty: Intermediate\ntags: [ajax, security]\n"
+    "use_case: Verify AJAX requests\nrelated: [security/nonces]\n---\n"
+    "# AJAX Nonce\n"
+)
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+
+
+@pytest.fixture
+def registry(tmp_path):
+    _write(tmp_path / "catalog.md", "# Catalog\n")
+    _write(tmp_path / "security" / "nonces.md", "# Nonces\n")
+    _write(tmp_path / "snippets" / "ajax" / "nonce.md", SNIPPET)
+    store = server.ResourceContentStore(tmp_path, revalidate_interval=0)
+    return server.MetadataRegistry(tmp_path, store, revalidate_interval=0)
+
+
+def test_records_are_classified_and_parsed(registry):
+    assert [r.path for r in registry.records()] == [
+        "catalog.md", "security/nonces.md", "snippets/ajax/nonce.md"]
+    assert [r.kind for r in registry.records()] == ["catalog", "resource", "snippet"]
+
+    snippet = registry.get("snippets/ajax/nonce.md")
+    assert (snippet.name, snippet.category) == ("nonce", "ajax")
+    assert snippet.difficulty == "Intermediate"
+    assert snippet.tags == ["ajax", "security"]
+    assert snippet.use_case == "Verify AJAX requests"
+    assert snippet.related == ["security/nonces"]
+    assert snippet.has_frontmatter
+    assert snippet.uri == "wordpress://snippets/ajax/nonce"
+    assert registry.get("security/nonces.md").uri == "wordpress://security/nonces"
+    assert [r.path for r in registry.records("snippet")] == ["snippets/ajax/nonce.md"]
+
+
+def test_only_changed_files_are_reparsed(registry, tmp_path):
+    before = {r.path: r for r in registry.records()}
+    generation = registry.generation
+
+    registry.refresh(force=True)
+    assert registry.generation == generation
+
+    path = tmp_path / "security" / "nonces.md"
+    _write(path, "---\ndifficulty: Advanced\n---\n# Nonces\n")
+    os.utime(path, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+    after = {r.path: r for r in registry.records()}
+    assert registry.generation == generation + 1
+    assert after["security/nonces.md"].difficulty == "Advanced"
+    assert after["snippets/ajax/nonce.md"] is before["snippets/ajax/nonce.md"]
+
+
+def test_removed_files_are_dropped(registry, tmp_path):
+    fingerprint = registry.fingerprint()
+    (tmp_path / "catalog.md").unlink()
+    assert registry.get("catalog.md") is None
+    assert registry.fingerprint() != fingerprint
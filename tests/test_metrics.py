@@ -0,0 +1,78 @@
+"""Request latency metrics."""
+
+import asyncio
+
+import fastmcp
+import pytest
+
+import wordpress_mcp as server
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    metrics = server.RequestMetrics()
+    monkeypatch.setattr(server, "request_metrics", metrics)
+    monkeypatch.setattr(server, "RESOURCE_RATE_LIMIT", 0)
+    return metrics
+
+
+def _read(*uris):
+    async def read():
+        async with fastmcp.Client(server.mcp) as client:
+            for uri in uris:
+                try:
+                    await client.read_resource(uri)
+                except Exception:
+                    pass
+
+    asyncio.run(read())
+
+
+def test_histogram_quantiles(metrics):
+    for _ in range(98):
+        metrics.record("tool", "fast", 0.0008)
+    metrics.record("tool", "fast", 0.2, error=True)
+    metrics.record("tool", "fast", 0.2)
+    (_, _, series), = metrics.snapshot()
+    assert (series.count, series.errors) == (100, 1)
+    assert series.quantile(0.5) == 0.001
+    assert series.quantile(0.99) == 0.2
+
+
+def test_series_are_capped(metrics, monkeypatch):
+    monkeypatch.setattr(server, "METRICS_MAX_SERIES", 2)
+    for name in ("a", "b", "c", "d"):
+        metrics.record("tool", name, 0.01)
+    assert [name for _, name, _ in metrics.snapshot()] == ["(other)", "a", "b"]
+
+
+def test_prometheus_buckets_are_cumulative(metrics):
+    metrics.record("resource", 'wordpress://"quoted"', 0.003)
+    metrics.record("resource", 'wordpress://"quoted"', 400.0)
+    text = metrics.render_prometheus()
+    assert 'name="wordpress://\\"quoted\\"",le="0.005"} 1' in text
+    assert 'le="+Inf"} 2' in text
+    assert 'wordpress_mcp_request_duration_seconds_count{kind="resource",name="wordpress://\\"quoted\\""} 2' in text
+
+
+def test_middleware_times_resource_reads(metrics):
+    _read("wordpress://core/database")
+    (kind, name, series), = metrics.snapshot()
+    assert (kind, name, series.count, series.errors) == ("resource", "wordpress://core/database", 1, 0)
+    assert series.bytes_out > 0
+    assert "`wordpress://core/database`" in metrics.render_markdown()
+
+
+def test_resource_series_ignore_query_and_fragment(metrics):
+    _read("wordpress://core/database",
+          "wordpress://core/database?max_bytes=600",
+          "wordpress://core/database?max_bytes=600&cursor=1.abcdef012345",
+          "wordpress://core/database#database")
+    names = {name for kind, name, _ in metrics.snapshot() if kind == "resource"}
+    assert names == {"wordpress://core/database"}
+
+
+def test_unknown_resources_share_a_template_series(metrics):
+    _read("wordpress://nope/one", "wordpress://nope/two", "wordpress://nope/three?cursor=x")
+    names = {name for kind, name, _ in metrics.snapshot() if kind == "resource"}
+    assert names == {"wordpress://{category}/{topic}{?max_bytes,cursor}"}
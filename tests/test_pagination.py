@@ -0,0 +1,109 @@
+"""Size-capped pages and continuation cursors."""
+
+import asyncio
+
+import fastmcp
+import pytest
+
+import wordpress_mcp as server
+
+
+def _pages(data, max_bytes):
+    pages, cursor = [], ""
+    while True:
+        text, start, end, cursor = server.page_text(data, max_bytes, cursor)
+        pages.append((text, start, end))
+        if cursor is None:
+            return pages
+
+
+def _document():
+    sections = []
+    for i in range(40):
+        sections.append(f"## Section {i}\n\nSome text about hooks and filters, paragraph {i}.\n\n"
+                        f"```php\nadd_action('init', 'callback_{i}');\n```\n")
+    return "# Title\n\n" + "\n".join(sections)
+
+
+def test_cursor_round_trip_covers_content():
+    data = _document().encode("utf-8")
+    pages = _pages(data, 600)
+    assert len(pages) > 1
+    assert "".join(text for text, _, _ in pages).encode("utf-8") == data
+    for (_, _, end), (_, start, _) in zip(pages, pages[1:]):
+        assert end == start
+    assert all(end - start <= 600 for _, start, end in pages)
+
+
+def test_pages_do_not_split_code_blocks():
+    for text, _, _ in _pages(_document().encode("utf-8"), 600):
+        assert text.count("```") % 2 == 0
+
+
+@pytest.mark.parametrize("char", ["é", "€", "😀"])
+def test_pages_split_on_utf8_boundaries(char):
+    data = (char * 2000).encode("utf-8")
+    pages = _pages(data, 513)
+    assert "".join(text for text, _, _ in pages) == char * 2000
+    for _, start, end in pages:
+        assert end - start <= 513
+
+
+def test_short_content_is_one_page():
+    text, start, end, cursor = server.page_text(b"hello", 1000)
+    assert (text, start, end, cursor) == ("hello", 0, 5, None)
+
+
+def test_stale_cursor():
+    data = _document().encode("utf-8")
+    _, _, _, cursor = server.page_text(data, 600)
+    with pytest.raises(ValueError, match="stale"):
+        server.page_text(data + b"changed", 600, cursor)
+
+
+@pytest.mark.parametrize("cursor", ["1.zzz", "abc.123456789abc", "12", "12.", "1.1a2b3c4d5e6fff", "1.1A2B3C4D5E6F"])
+def test_malformed_cursor(cursor):
+    with pytest.raises(ValueError, match="malformed"):
+        server.page_text(_document().encode("utf-8"), 600, cursor)
+
+
+def test_cursor_past_end():
+    data = _document().encode("utf-8")
+    digest = server.page_text(data, 600)[3].split(".")[1]
+    with pytest.raises(ValueError, match="past the end"):
+        server.page_text(data, 600, f"{len(data)}.{digest}")
+
+
+def test_render_page_reports_cursor_errors():
+    assert server.render_page(b"x" * 2000, 600, "1.zzz").startswith("Error: malformed cursor")
+
+
+def test_unknown_resource_raises(monkeypatch):
+    monkeypatch.setattr(server, "RESOURCE_RATE_LIMIT", 0)
+
+    async def read(uri):
+        async with fastmcp.Client(server.mcp) as client:
+            return await client.read_resource(uri)
+
+    for uri in ("wordpress://nope/nothing", "wordpress://nope/nothing?max_bytes=600",
+                "wordpress://nope/nothing#intro"):
+        with pytest.raises(Exception, match="not found|Unknown"):
+            asyncio.run(read(uri))
+    assert asyncio.run(read("wordpress://core/database?max_bytes=600"))[0].text
+
+
+def test_read_resource_tool_reports_unknown_uri():
+    assert server.read_resource("wordpress://nope/nothing").startswith("Error: Unknown resource")
+
+
+def test_paged_resource_read(monkeypatch):
+    monkeypatch.setattr(server, "RESOURCE_RATE_LIMIT", 0)
+
+    async def read(uri):
+        async with fastmcp.Client(server.mcp) as client:
+            return (await client.read_resource(uri))[0].text
+
+    full = asyncio.run(read("wordpress://core/database"))
+    first = asyncio.run(read("wordpress://core/database?max_bytes=600"))
+    assert full.startswith(first[:200])
+    assert len(first) < len(full)
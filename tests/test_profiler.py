@@ -0,0 +1,62 @@
+"""Sampling profiler tool."""
+
+import asyncio
+import threading
+import time
+
+import wordpress_mcp as server
+
+
+def _busy_loop(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+def _busy_thread():
+    stop = threading.Event()
+    thread = threading.Thread(target=_busy_loop, args=(stop,), name="busy;worker")
+    thread.start()
+    return stop, thread
+
+
+def test_sampler_folds_busy_thread_stacks():
+    stop, thread = _busy_thread()
+    try:
+        sampler = server.StackSampler(0.005)
+        sampler.run(0.2)
+    finally:
+        stop.set()
+        thread.join()
+    assert sampler.ticks > 5
+    busy = [stack for stack in sampler.stacks if stack.startswith("busy:worker;")]
+    assert busy and all("_busy_loop" in stack for stack in busy)
+    assert any(label.startswith("_busy_loop ") for label in sampler.total_counts)
+
+
+def test_idle_threads_are_skipped():
+    gate = threading.Event()
+    thread = threading.Thread(target=gate.wait, name="parked")
+    thread.start()
+    try:
+        time.sleep(0.05)
+        idle, active = server.StackSampler(0.01, include_idle=True), server.StackSampler(0.01)
+        idle.sample()
+        active.sample()
+    finally:
+        gate.set()
+        thread.join()
+    assert any(stack.startswith("parked;") for stack in idle.stacks)
+    assert not any(stack.startswith("parked;") for stack in active.stacks)
+
+
+def test_only_one_session_runs_at_a_time():
+    async def main():
+        first = asyncio.create_task(server.profile_server(seconds=0.3, interval_ms=50))
+        await asyncio.sleep(0.05)
+        second = await server.profile_server(seconds=0.1)
+        return await first, second
+
+    report, busy = asyncio.run(main())
+    assert report.startswith("# 🔥 Server Profile")
+    assert "## Collapsed Stacks" in report
+    assert busy == "Error: A profiling session is already running"
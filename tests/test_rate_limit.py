@@ -0,0 +1,114 @@
+"""Sliding-window rate limiter bounds."""
+
+import asyncio
+
+import pytest
+
+import wordpress_mcp as server
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(server.time, "monotonic", clock)
+    return clock
+
+
+def _drain(limiter, key, limit, window):
+    allowed = 0
+    while limiter.allow(key, limit, window):
+        allowed += 1
+    return allowed
+
+
+def test_burst_is_capped_at_limit(clock):
+    limiter = server.SlidingWindowLimiter(max_clients=10)
+    assert _drain(limiter, "client", 100, 60) == 100
+    assert not limiter.allow("client", 100, 60)
+
+
+def test_window_bound(clock):
+    """No span of one window admits more than limit requests, bursting or not."""
+    limit, window = 100, 60.0
+    limiter = server.SlidingWindowLimiter(max_clients=10)
+    admitted = []
+    for step in range(6000):
+        clock.now += 0.1 if step % 700 < 500 else 1.3
+        admitted += [clock.now] * _drain(limiter, "client", limit, window)
+    first = 0
+    for last, at in enumerate(admitted):
+        while admitted[first] <= at - window:
+            first += 1
+        assert last - first + 1 <= limit
+
+
+def test_sustained_rate_matches_limit(clock):
+    limit, window = 100, 60.0
+    limiter = server.SlidingWindowLimiter(max_clients=10)
+    slots = server.SlidingWindowLimiter.SLOTS
+    allowed = 0
+    start = clock.now
+    while clock.now - start < 10 * window:
+        allowed += _drain(limiter, "client", limit, window)
+        clock.now += 0.1
+    assert 10 * limit * slots / (slots + 1) - limit <= allowed <= 10 * limit
+
+
+def test_keys_are_independent(clock):
+    limiter = server.SlidingWindowLimiter(max_clients=10)
+    assert _drain(limiter, "a", 5, 60) == 5
+    assert _drain(limiter, "b", 5, 60) == 5
+
+
+def test_lru_eviction_bounds_memory(clock):
+    limiter = server.SlidingWindowLimiter(max_clients=3)
+    for key in "abcde":
+        limiter.allow(key, 5, 60)
+    assert limiter.stats()["clients"] <= 3
+    assert limiter.evictions == 2
+
+
+def _read(uri, times, meta=None):
+    import fastmcp
+
+    async def read():
+        async with fastmcp.Client(server.mcp) as client:
+            for number in range(times):
+                await client.read_resource(uri, meta=meta(number) if meta else None)
+
+    asyncio.run(read())
+
+
+def test_resource_reads_are_limited(monkeypatch):
+    monkeypatch.setattr(server, "RESOURCE_RATE_LIMIT", 3)
+    monkeypatch.setattr(server.security_manager, "state", server.MemoryStateBackend())
+    _read("wordpress://core/database", 3)
+    with pytest.raises(Exception):
+        _read("wordpress://core/database", 1)
+
+
+def test_resource_limit_is_keyed_per_client(monkeypatch):
+    monkeypatch.setattr(server, "RESOURCE_RATE_LIMIT", 2)
+    monkeypatch.setattr(server.security_manager, "state", server.MemoryStateBackend())
+    for client in ("alice", "bob"):
+        monkeypatch.setattr(server, "request_client_id", lambda: client)
+        server.enforce_resource_rate_limit()
+        server.enforce_resource_rate_limit()
+    with pytest.raises(Exception):
+        server.enforce_resource_rate_limit()
+
+
+def test_client_supplied_id_does_not_reset_the_limit(monkeypatch):
+    monkeypatch.setattr(server, "RESOURCE_RATE_LIMIT", 3)
+    monkeypatch.setattr(server.security_manager, "state", server.MemoryStateBackend())
+    _read("wordpress://core/database", 3, meta=lambda number: {"client_id": f"caller-{number}"})
+    with pytest.raises(Exception):
+        _read("wordpress://core/database", 1, meta=lambda number: {"client_id": "fresh-caller"})
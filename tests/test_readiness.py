@@ -0,0 +1,114 @@
+"""Startup warm-up and readiness."""
+
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import textwrap
+
+import fastmcp
+import pytest
+
+import wordpress_mcp as server
+
+WARM_UP_PROBE = textwrap.dedent("""
+    import asyncio, fastmcp, wordpress_mcp
+
+    def started():
+        return wordpress_mcp.server_state._warm_up is not None
+
+    async def connect():
+        async with fastmcp.Client(wordpress_mcp.mcp) as client:
+            await client.list_tools()
+            return started()
+
+    print(started(), asyncio.run(connect()))
+""")
+
+
+def test_warm_up_starts_with_the_server_not_on_import():
+    result = subprocess.run([sys.executable, "-c", WARM_UP_PROBE], cwd=str(server.Path(server.__file__).parent),
+                            capture_output=True, text=True, timeout=120,
+                            env={**os.environ, "WORDPRESS_MCP_CONTENT_BUNDLE": ""})
+    assert result.stdout.strip().splitlines()[-1] == "False True", result.stderr[-2000:]
+
+
+def test_readiness_after_warm_up():
+    server.server_state.start_warm_up().join(timeout=60)
+
+    async def readiness():
+        async with fastmcp.Client(server.mcp) as client:
+            result = await client.read_resource("wordpress://server/readiness")
+            return json.loads(result[0].text)
+
+    state = asyncio.run(readiness())
+    assert state["status"] == "ready", state
+    assert set(server.READINESS_CHECKS) <= set(state["checks"])
+
+
+def test_warm_up_runs_once():
+    first = server.server_state.start_warm_up()
+    assert server.server_state.start_warm_up() is first
+
+def test_readiness_status_follows_checks():
+    state = server.ServerState()
+    assert state.readiness()["status"] == "starting"
+    state.mark("resources", True)
+    state.mark("metadata", False, "no files")
+    assert state.readiness()["status"] == "failed"
+    assert state.readiness()["checks"]["metadata"] == {"ok": False, "detail": "no files"}
+    for name in server.READINESS_CHECKS:
+        state.mark(name, True)
+    assert state.readiness()["status"] == "ready"
+    assert state.ready_at is not None
+
+
+@pytest.fixture
+def health_runs(monkeypatch):
+    runs = []
+    monkeypatch.setattr(server, "_health_report_cache", {"output": None, "checked_at": 0.0})
+    monkeypatch.setattr(server.security_manager, "state", server.MemoryStateBackend())
+    monkeypatch.setattr(server, "_run_health_check", lambda: runs.append(1) or f"report {len(runs)}")
+    return runs
+
+
+def test_health_report_is_cached(health_runs):
+    assert server.check_server_health() == "report 1"
+    assert server.check_server_health().startswith("report 1\n\n_Cached report from")
+    assert server.check_server_health(force=True) == "report 2"
+    assert len(health_runs) == 2
+
+
+def test_forced_health_checks_are_rate_limited(health_runs):
+    for _ in range(server.HEALTH_CHECK_RATE_LIMIT + 3):
+        server.check_server_health(force=True)
+    assert len(health_runs) == server.HEALTH_CHECK_RATE_LIMIT
+
+
+def test_rate_limit_applies_once_the_cache_expires(monkeypatch):
+    runs = []
+    monkeypatch.setattr(server, "_health_report_cache", {"output": None, "checked_at": 0.0})
+    monkeypatch.setattr(server.security_manager, "state", server.MemoryStateBackend())
+    monkeypatch.setattr(server, "HEALTH_CHECK_CACHE_SECONDS", 0)
+    monkeypatch.setattr(server, "_run_health_check", lambda: runs.append(1) or "Error: health check failed")
+    outputs = [server.check_server_health() for _ in range(server.HEALTH_CHECK_RATE_LIMIT + 2)]
+    assert len(runs) == server.HEALTH_CHECK_RATE_LIMIT
+    assert outputs[-1].startswith("Error: health check failed\n\n_Cached report from")
+
+
+def test_failed_health_reports_are_cached(monkeypatch):
+    runs = []
+    monkeypatch.setattr(server, "_health_report_cache", {"output": None, "checked_at": 0.0})
+    monkeypatch.setattr(server.security_manager, "state", server.MemoryStateBackend())
+    monkeypatch.setattr(server, "_run_health_check", lambda: runs.append(1) or "Error: health check failed")
+    assert server.check_server_health() == "Error: health check failed"
+    assert server.check_server_health().startswith("Error: health check failed\n\n_Cached report from")
+    assert len(runs) == 1
+
+
+def test_rate_limited_health_check_without_report(monkeypatch):
+    monkeypatch.setattr(server, "_health_report_cache", {"output": None, "checked_at": 0.0})
+    monkeypatch.setattr(server.security_manager, "check_rate_limit", lambda *args: False)
+    monkeypatch.setattr(server, "_run_health_check", lambda: pytest.fail("health check ran past the rate limit"))
+    assert server.check_server_health() == "Error: Rate limit exceeded. Please try again later."
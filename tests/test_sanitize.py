@@ -0,0 +1,47 @@
+"""Per-parameter sanitization policies."""
+
+import asyncio
+
+import pytest
+
+import wordpress_mcp as server
+
+
+def test_text_policy_matches_previous_character_set():
+    value = ' <b>"Tom\'s" a&b \\ c/d; f(x)</b> '
+    assert server.security_manager.sanitize_input(value) == "bToms ab  cd fxb"
+    assert server.security_manager.sanitize_input({"k": ["<x>", 3]}) == {"k": ["x", 3]}
+
+
+def test_slug_and_path_policies():
+    assert server.security_manager.sanitize_input("my plugin;rm -rf", "slug") == "mypluginrm-rf"
+    assert server.security_manager.sanitize_input("/var/www/html; ls|`id`", "path") == "/var/www/html lsid"
+    assert server.security_manager.sanitize_input("<?php echo 1;", "trusted") == "<?php echo 1;"
+
+
+def test_sanitizer_is_compiled_from_the_signature():
+    def tool(wp_path: str, plugin: str, limit: int, content: str, note: str = ""):
+        pass
+
+    sanitize = server.compile_sanitizer(tool, {"wp_path": "path", "plugin": "slug", "content": "trusted"})
+    args, kwargs = sanitize(("/srv/wp;", "akismet!", 5), {"content": "<style>", "note": "<i>"})
+    assert args == ("/srv/wp", "akismet", 5)
+    assert kwargs == {"content": "<style>", "note": "i"}
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError, match="Unknown sanitize policy: html"):
+        server.compile_sanitizer(lambda value: value, {"value": "html"})
+
+
+def test_decorator_wraps_sync_and_async_functions():
+    @server.secure_mcp_resource(sanitize={"slug": "slug"})
+    def sync_tool(slug: str, text: str) -> str:
+        return f"{slug}|{text}"
+
+    @server.secure_mcp_resource(sanitize={"slug": "slug"})
+    async def async_tool(slug: str, text: str) -> str:
+        return f"{slug}|{text}"
+
+    assert sync_tool("a b", "<i>") == "ab|i"
+    assert asyncio.run(async_tool("a b", text="<i>")) == "ab|i"
@@ -0,0 +1,186 @@
+"""BM25F ranking and search index caching."""
+
+import json
+import os
+
+import pytest
+
+import wordpress_mcp as server
+
+FILLER = "Background prose about WordPress development and the admin screens.\n" * 20
+
+TREE = {
+    "core/transients.md": "# Transients\n\nStore cached values with an expiry.\n",
+    "core/options.md": "# Options\n\n" + FILLER + "Options can also act as a transients fallback.\n",
+    "core/caching.md": "# Caching\n\nObject cache first, then a transients layer; transients expire.\n",
+    "core/long-caching.md": "# Long Caching\n\n" + FILLER + "Object cache first, then a transients layer; transients expire.\n",
+    "core/rewrite.md": "# Rewrite Rules\n\nRegister rewrite rules and flush them once.\n",
+    "snippets/performance/transient-cache.md": (
+        "---\ntags: [transients, performance]\ndifficulty: beginner\n---\n"
+        "# Transient Cache\n\n```php\nset_transient('key', $value, HOUR_IN_SECONDS);\n```\n"),
+}
+
+
+def _write_tree(root, files=TREE):
+    for relative, content in files.items():
+        path = root / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content, encoding="utf-8")
+
+
+def _index(root, cache_path):
+    store = server.ResourceContentStore(root, None, revalidate_interval=0)
+    registry = server.MetadataRegistry(root, store, revalidate_interval=0)
+    return server.SearchIndex(registry, cache_path)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "resources"
+    _write_tree(root)
+    return root
+
+
+def _paths(results):
+    return [doc.path for doc, _ in results]
+
+
+def test_name_match_ranks_first(tree, tmp_path):
+    index = _index(tree, tmp_path / "index.json")
+    results = index.search("transients")
+    assert _paths(results)[0] == "core/transients.md"
+    assert all(score > 0 for _, score in results)
+    assert [score for _, score in results] == sorted((score for _, score in results), reverse=True)
+
+
+def test_shorter_document_ranks_higher_for_same_terms(tree, tmp_path):
+    paths = _paths(_index(tree, tmp_path / "index.json").search("object cache layer"))
+    assert paths.index("core/caching.md") < paths.index("core/long-caching.md")
+
+
+def test_term_frequency_saturates(tmp_path):
+    root = tmp_path / "resources"
+    _write_tree(root, {
+        "core/once.md": "# Once\n\nzeta alpha beta gamma\n",
+        "core/twice.md": "# Twice\n\nzeta zeta beta gamma\n",
+        "core/other.md": "# Other\n\ndelta alpha beta gamma\n",
+    })
+    scores = dict((doc.path, score) for doc, score in _index(root, tmp_path / "index.json").search("zeta"))
+    # Two mentions beat one in a document of the same length, but by far less than double
+    assert scores["core/twice.md"] > scores["core/once.md"]
+    assert scores["core/twice.md"] < 2 * scores["core/once.md"]
+
+
+def test_all_terms_must_match(tree, tmp_path):
+    index = _index(tree, tmp_path / "index.json")
+    assert _paths(index.search("rewrite transients")) == []
+    assert _paths(index.search("rewrite flush")) == ["core/rewrite.md"]
+
+
+def test_prefixes_expand_to_indexed_terms(tree, tmp_path):
+    index = _index(tree, tmp_path / "index.json")
+    assert _paths(index.search("rewr")) == ["core/rewrite.md"]
+    assert _paths(index.search("zz")) == []
+
+
+def test_snake_case_identifiers_match_their_parts(tree, tmp_path):
+    index = _index(tree, tmp_path / "index.json")
+    assert _paths(index.search("set_transient")) == ["snippets/performance/transient-cache.md"]
+    assert _paths(index.search("hour")) == ["snippets/performance/transient-cache.md"]
+
+
+def test_frontmatter_is_indexed_as_fields(tree, tmp_path):
+    index = _index(tree, tmp_path / "index.json")
+    snippet = dict((doc.path, doc) for doc, _ in index.search("", kind="snippet"))
+    doc = snippet["snippets/performance/transient-cache.md"]
+    assert doc.tags == ["transients", "performance"]
+    assert doc.category == "performance"
+
+
+def test_rare_terms_weigh_more(tree, tmp_path):
+    index = _index(tree, tmp_path / "index.json")
+    common = dict((doc.path, score) for doc, score in index.search("cache"))
+    rare = dict((doc.path, score) for doc, score in index.search("expiry"))
+    assert rare["core/transients.md"] > common.get("core/transients.md", 0.0)
+
+
+def test_kind_filter_and_empty_query(tree, tmp_path):
+    index = _index(tree, tmp_path / "index.json")
+    assert _paths(index.search("transients", kind="snippet")) == ["snippets/performance/transient-cache.md"]
+    assert len(index.search("")) == len(TREE)
+
+
+def test_typo_matches_score_below_exact_matches(tree, tmp_path):
+    index = _index(tree, tmp_path / "index.json")
+    exact = dict((doc.path, score) for doc, score in index.search("rewrite"))
+    typo = dict((doc.path, score) for doc, score in index.search("rewrute"))
+    assert _paths(index.search("rewrute")) == ["core/rewrite.md"]
+    assert typo["core/rewrite.md"] < exact["core/rewrite.md"]
+
+
+def test_edit_distance_is_bounded():
+    assert server.edit_distance("rewrite", "rewrute", 2) == 1
+    assert server.edit_distance("nonce", "nonces", 1) == 1
+    assert server.edit_distance("transient", "options", 2) == 3
+    assert [server.max_edit_distance(term) for term in ("ajax", "rewrite", "transients")] == [1, 1, 2]
+    assert server.max_edit_distance("wp") == 0
+
+
+def test_substrings_match_through_trigrams(tree, tmp_path):
+    index = _index(tree, tmp_path / "index.json")
+    index.ensure_current()
+    assert index.substring_terms("ansient") == ["transient", "transients", "set_transient"]
+    assert "core/transients.md" in _paths(index.search("ansient"))
+
+
+def test_suggestions_for_misspelled_terms(tree, tmp_path):
+    index = _index(tree, tmp_path / "index.json")
+    assert index.suggest("rewrute flush") == {"rewrute": "rewrite"}
+    assert index.suggest("rewrite flush") == {}
+
+
+def test_index_is_cached_and_reused(tree, tmp_path):
+    cache = tmp_path / "index.json"
+    first = _index(tree, cache)
+    results = first.search("transients cache")
+    assert first.built_from == "source"
+    assert cache.exists()
+
+    second = _index(tree, cache)
+    assert [(doc.path, score) for doc, score in second.search("transients cache")] == \
+        [(doc.path, score) for doc, score in results]
+    assert second.built_from == "cache"
+
+
+def test_cache_is_rebuilt_when_content_changes(tree, tmp_path):
+    cache = tmp_path / "index.json"
+    _index(tree, cache).ensure_current()
+    path = tree / "core" / "rewrite.md"
+    path.write_text("# Rewrite Rules\n\nRegister rewrite rules and transients.\n", encoding="utf-8")
+    os.utime(path, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+
+    index = _index(tree, cache)
+    assert "core/rewrite.md" in _paths(index.search("transients"))
+    assert index.built_from == "source"
+
+
+def test_index_follows_edits_in_place(tree, tmp_path):
+    index = _index(tree, tmp_path / "index.json")
+    assert _paths(index.search("sitemap")) == []
+    _write_tree(tree, {"core/sitemaps.md": "# Sitemaps\n\nCore sitemap providers.\n"})
+    assert _paths(index.search("sitemaps")) == ["core/sitemaps.md"]
+
+
+@pytest.mark.parametrize("content", ["not json", json.dumps({"version": -1})])
+def test_unusable_cache_is_ignored(tree, tmp_path, content):
+    cache = tmp_path / "index.json"
+    cache.write_text(content, encoding="utf-8")
+    index = _index(tree, cache)
+    assert _paths(index.search("transients"))[0] == "core/transients.md"
+    assert index.built_from == "source"
+    assert json.loads(cache.read_text(encoding="utf-8"))["version"] == server.SEARCH_INDEX_VERSION
+
+
+def test_search_tools_use_the_index():
+    assert "nonces" in server.search_snippets(query="nonce").lower()
+    assert "No Snippets Found" in server.search_snippets(query="zzzqqq")
@@ -0,0 +1,41 @@
+"""Resource sections served from the heading offset index."""
+
+import inspect
+import re
+
+import pytest
+
+import wordpress_mcp as server
+
+EXAMPLES = re.findall(r"^\s*(get_section\(.*\))\s*$", inspect.getdoc(server.get_section), re.M)
+
+
+def test_docstring_has_examples():
+    assert len(EXAMPLES) >= 3
+
+
+@pytest.mark.parametrize("example", EXAMPLES)
+def test_documented_examples_resolve(example):
+    result = eval(example, {"get_section": server.get_section})
+    assert not result.startswith(("Error", "Section not found")), result
+
+
+def test_section_by_anchor_and_heading_text():
+    uri = "wordpress://snippets/security/nonces"
+    by_anchor = server.get_section(uri=uri, section="ajax-nonce")
+    assert "AJAX Nonce" in by_anchor.splitlines()[0]
+    assert server.get_section(uri=uri, section="AJAX Nonce") == by_anchor
+    assert server.get_section(uri=f"{uri}#ajax-nonce") == by_anchor
+
+
+def test_missing_section_lists_anchors():
+    result = server.get_section(uri="wordpress://snippets/security/nonces", section="verify-nonce")
+    assert result.startswith("Section not found")
+    assert "`ajax-nonce`" in result
+
+
+def test_outline_and_non_file_resources():
+    outline = server.get_section(uri="wordpress://snippets/security/nonces")
+    assert "ajax-nonce" in outline
+    assert server.get_section(uri="wordpress://server/metrics", section="x").startswith(
+        "Error: wordpress://server/metrics is not a file-backed resource")
@@ -0,0 +1,79 @@
+"""Security events written through the background log listener."""
+
+import json
+import logging
+import time
+
+import wordpress_mcp as server
+
+
+class Collect(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def _wait_for(handler, text, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if any(text in message for message in handler.messages):
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_events_reach_handlers_added_after_import():
+    handler = Collect()
+    root = logging.getLogger()
+    root.addHandler(handler)
+    try:
+        server.security_manager.log_security_event("test_event", {"ip": "203.0.113.7"})
+        assert _wait_for(handler, "test_event")
+    finally:
+        root.removeHandler(handler)
+
+
+def test_events_reach_parent_logger_handlers():
+    handler = Collect()
+    parent = server.security_logger.parent
+    parent.addHandler(handler)
+    try:
+        server.security_manager.log_security_event("parent_event", {})
+        assert _wait_for(handler, "parent_event")
+    finally:
+        parent.removeHandler(handler)
+
+
+def test_events_are_recorded_in_memory():
+    server.security_manager.log_security_event("ring_event", {"ip": "198.51.100.1"})
+    events = server.security_manager.security_events(["ring_event"])
+    assert events[-1]["ip"] == "198.51.100.1"
+
+
+def test_event_log_is_a_bounded_ring_buffer():
+    manager = server.MCPSecurityManager()
+    for number in range(server.SECURITY_LOG_CAPACITY + 5):
+        manager.log_security_event("bulk_event", {"n": number})
+    events = manager.security_events()
+    assert len(events) == server.SECURITY_LOG_CAPACITY
+    assert events[0]["details"]["n"] == 5
+    assert manager.security_events(limit=2)[-1]["details"]["n"] == server.SECURITY_LOG_CAPACITY + 4
+
+
+def test_event_times_accept_epochs_isos_and_ages():
+    assert server._parse_event_time("") is None
+    assert server._parse_event_time("1700000000") == 1700000000.0
+    assert abs(server._parse_event_time("15m") - (time.time() - 900)) < 5
+    assert server._parse_event_time("2026-01-01T00:00:00+00:00") == 1767225600.0
+
+
+def test_export_filters_by_type_and_time():
+    server.security_manager.log_security_event("export_a", {"ip": "192.0.2.1"})
+    server.security_manager.log_security_event("export_b", {"ip": "192.0.2.2"})
+    lines = server.export_security_events(event_type="export_a, export_b", since="1m").splitlines()
+    assert [json.loads(line)["event_type"] for line in lines] == ["export_a", "export_b"]
+    assert server.export_security_events(event_type="export_a", until="1700000000") == ""
+    assert server.export_security_events(since="yesterday").startswith("Error: Invalid time range")
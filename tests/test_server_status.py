@@ -0,0 +1,50 @@
+"""Capability registry and what get_server_status reports."""
+
+import asyncio
+import json
+import re
+
+import wordpress_mcp as server
+
+
+def test_capabilities_match_registered_components():
+    capabilities = server.capability_registry.capabilities()
+    tools = {c.name for c in capabilities if c.kind == "tool"}
+    assert tools == {tool.name for tool in asyncio.run(server.mcp.list_tools())}
+    templates = {c.name for c in capabilities if c.kind == "template"}
+    assert "wordpress://snippets/{category}/{topic}" in {t.split("{?")[0] for t in templates}
+
+
+def test_file_backed_resources_carry_metadata():
+    by_name = {c.name: c for c in server.capability_registry.capabilities()}
+    database = by_name["wordpress://core/database"]
+    record = server.metadata_registry.get("core/database.md")
+    assert database.path == "core/database.md"
+    assert (database.size, database.hash) == (record.size, record.hash)
+
+
+def test_stats_count_components_and_files():
+    stats = server.capability_registry.stats()
+    assert stats["tools"] == len(asyncio.run(server.mcp.list_tools()))
+    assert stats["snippets"] == len(server.metadata_registry.records("snippet"))
+    assert 0 < stats["file_backed_resources"] <= stats["resources"]
+    listed = json.loads(server.get_server_capabilities())["capabilities"]
+    assert len(listed) == sum(stats[kind] for kind in ("tools", "resources", "templates", "prompts"))
+
+
+def test_tool_list_matches_registered_tools():
+    status = server.get_server_status()
+    section = status.split("## 🔧 Available Tools", 1)[1].split("\n## ", 1)[0]
+    listed = re.findall(r"^\d+\. `([^`]+)`", section, re.M)
+    registered = [tool.name for tool in asyncio.run(server.mcp.list_tools())]
+    assert sorted(listed) == sorted(registered)
+    assert len(listed) > 8
+
+
+def test_readiness_comes_from_startup_checks():
+    server.server_state.start_warm_up().join(timeout=60)
+    status = server.get_server_status()
+    assert "Server syntax validated" not in status
+    assert "## 🔍 Readiness (ready)" in status
+    for name in server.READINESS_CHECKS:
+        assert f"**{name}:**" in status
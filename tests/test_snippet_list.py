@@ -0,0 +1,60 @@
+"""Memoized wordpress://snippets/list rendering."""
+
+import os
+
+import pytest
+
+import wordpress_mcp as server
+
+
+def _write(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content, encoding="utf-8")
+    os.utime(path, ns=(path.stat().st_mtime_ns + 10**9,) * 2)
+
+
+@pytest.fixture
+def renders(tmp_path, monkeypatch):
+    _write(tmp_path / "snippets" / "ajax" / "nonce.md", "---\ndifficulty: Beginner\n---\n# Nonce\n")
+    _write(tmp_path / "core" / "options.md", "# Options\n")
+    store = server.ResourceContentStore(tmp_path, revalidate_interval=0)
+    monkeypatch.setattr(server, "metadata_registry",
+                        server.MetadataRegistry(tmp_path, store, revalidate_interval=0))
+    monkeypatch.setattr(server, "_snippet_list_cache",
+                        {"generation": None, "fingerprint": None, "output": ""})
+
+    calls = []
+    render = server._render_snippet_list
+
+    def counting(snippets):
+        calls.append(len(snippets))
+        return render(snippets)
+
+    monkeypatch.setattr(server, "_render_snippet_list", counting)
+    return calls
+
+
+def test_list_is_rendered_once(renders):
+    first = server.list_code_snippets()
+    assert "### nonce" in first
+    assert server.list_code_snippets() is first
+    assert renders == [1]
+
+
+def test_only_snippet_changes_rerender(renders, tmp_path):
+    server.list_code_snippets()
+    _write(tmp_path / "core" / "options.md", "# Options\n\nAutoload.\n")
+    server.list_code_snippets()
+    assert renders == [1]
+
+    _write(tmp_path / "snippets" / "ajax" / "handler.md", "---\ndifficulty: Advanced\n---\n# Handler\n")
+    output = server.list_code_snippets()
+    assert "### handler" in output
+    assert renders == [1, 2]
+
+
+def test_render_matches_live_registry():
+    snippets = server.metadata_registry.records("snippet")
+    output = server._render_snippet_list(snippets)
+    assert f"**Total Snippets:** {len(snippets)}" in output
+    assert all(snippet.uri in output for snippet in snippets)
@@ -0,0 +1,77 @@
+"""Shared state backends for rate limits and API keys."""
+
+import sqlite3
+
+import pytest
+
+import wordpress_mcp as server
+
+
+def _drain(backend, key, limit, window=60.0):
+    allowed = 0
+    for _ in range(limit * 2):
+        allowed += backend.take_token(key, limit, window)
+    return allowed
+
+
+def test_memory_backend_hashes_api_keys():
+    backend = server.MemoryStateBackend()
+    backend.add_api_key("secret-key", "ci")
+    assert backend.has_api_key("secret-key")
+    assert "secret-key" not in backend._api_keys
+    backend.remove_api_key("secret-key")
+    assert not backend.has_api_key("secret-key")
+
+
+def test_sqlite_workers_share_one_limit(tmp_path):
+    path = str(tmp_path / "state.db")
+    first, second = server.SQLiteStateBackend(path), server.SQLiteStateBackend(path)
+    assert _drain(first, "client", 10) + _drain(second, "client", 10) == 10
+    assert first.stats()["denied"] == 10
+
+
+def test_leases_cut_writes_without_exceeding_the_limit(tmp_path, monkeypatch):
+    monkeypatch.setattr(server.time, "time", lambda: 1000.0)
+    path = str(tmp_path / "state.db")
+    workers = [server.SQLiteStateBackend(path, lease=5) for _ in range(3)]
+    for _ in range(50):
+        assert workers[0].take_token("client", 100, 60.0)
+    assert workers[0].transactions == 10
+    assert 50 + sum(_drain(worker, "client", 100) for worker in workers) <= 100
+
+
+def test_sqlite_api_keys_are_shared_and_hashed(tmp_path):
+    path = str(tmp_path / "state.db")
+    server.SQLiteStateBackend(path).add_api_key("secret-key", "ci")
+    assert server.SQLiteStateBackend(path).has_api_key("secret-key")
+    assert b"secret-key" not in (tmp_path / "state.db").read_bytes()
+
+
+def test_backend_is_chosen_from_spec(tmp_path):
+    assert isinstance(server.create_state_backend("memory"), server.MemoryStateBackend)
+    backend = server.create_state_backend(f"sqlite:{tmp_path / 'state.db'}")
+    assert isinstance(backend, server.SQLiteStateBackend)
+    assert backend.lease == server.RATE_LIMIT_LEASE
+    with pytest.raises(ValueError, match="Unknown state backend"):
+        server.create_state_backend("redis://localhost")
+
+
+def test_rate_limit_fails_open_when_state_is_unavailable(monkeypatch):
+    class Locked(server.MemoryStateBackend):
+        __slots__ = ()
+
+        def take_token(self, key, limit, window):
+            raise sqlite3.OperationalError("database is locked")
+
+    assert server.MCPSecurityManager(Locked()).check_rate_limit("client", 1, 60)
+
+
+def test_sqlite_window_slides(tmp_path, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(server.time, "time", lambda: now[0])
+    backend = server.SQLiteStateBackend(str(tmp_path / "state.db"))
+    assert _drain(backend, "client", 10) == 10
+    now[0] += 59.0
+    assert _drain(backend, "client", 10) == 0
+    now[0] += 7.0
+    assert _drain(backend, "client", 10) == 10
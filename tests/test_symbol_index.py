@@ -0,0 +1,63 @@
+"""WordPress symbol extraction and lookup_symbol."""
+
+import wordpress_mcp as server
+
+DOC = """# Example
+
+add_action( 'init', 'outside_code' );
+
+```php
+add_action( 'save_post', 'myplugin_save', 10, 2 );
+$query = new WP_Query( array( 'post_type' => 'book' ) );
+class Book_Controller extends WP_REST_Controller {}
+register_rest_route( 'myplugin/v1', '/books', array() );
+function myplugin_save( $post_id ) {
+    update_post_meta( $post_id, 'isbn', sanitize_text_field( $_POST['isbn'] ) );
+}
+```
+
+```js
+wp.hooks.addFilter( 'blocks.registerBlockType', 'myplugin/attrs', addAttrs );
+apiFetch( { path: '/wp/v2/posts' } );
+```
+"""
+
+
+def _symbols(kind):
+    return {(name, role) for found_kind, name, _, role in server.extract_symbols(DOC) if found_kind == kind}
+
+
+def test_hooks_in_php_and_js_blocks():
+    assert _symbols("hook") == {("save_post", "add_action"), ("blocks.registerBlockType", "addFilter")}
+
+
+def test_functions_skip_language_constructs_and_definitions():
+    functions = {name for name, _ in _symbols("function")}
+    assert {"add_action", "update_post_meta", "sanitize_text_field"} <= functions
+    assert not functions & {"array", "myplugin_save", "outside_code"}
+
+
+def test_classes_and_routes():
+    assert {("WP_Query", "new"), ("Book_Controller", "class"), ("WP_REST_Controller", "extends")} <= _symbols("class")
+    assert _symbols("rest_route") == {("myplugin/v1/books", "register_rest_route"), ("wp/v2/posts", "request")}
+
+
+def test_lines_are_document_lines():
+    lines = {name: line for _, name, line, _ in server.extract_symbols(DOC)}
+    assert lines["save_post"] == 6
+    assert lines["wp/v2/posts"] == 17
+
+
+def test_lookup_symbol_lists_locations():
+    output = server.lookup_symbol("save_post", kind="hook")
+    assert output.startswith("# ")
+    assert "wordpress://" in output
+    matched, rows = server.symbol_index.lookup("wp_query")
+    assert matched == "WP_Query" and rows
+
+
+def test_lookup_symbol_misses_and_errors():
+    assert server.lookup_symbol("save_psot").startswith("# Symbol Not Found: `save_psot`")
+    assert "save_post" in server.symbol_index.suggest("save_psot")
+    assert server.lookup_symbol("  ") == "Error: name is required"
+    assert server.lookup_symbol("save_post", kind="widget").startswith("Error: kind must be one of")
@@ -0,0 +1,65 @@
+"""Per-tool concurrency caps and timeouts for management tools."""
+
+import asyncio
+import sys
+import threading
+import time
+
+import wordpress_mcp as server
+from tools import wp_cli
+
+SLEEPER = wp_cli.WPCLIInfo([sys.executable, "-c", "import time; time.sleep(10)"],
+                           sys.executable, 0, True)
+
+
+def test_timeout_kills_wp_cli_and_frees_the_slot():
+    limiter = server.ToolLimiter({"slow": (1, 0.3)})
+    finished = threading.Event()
+
+    def work():
+        result = wp_cli.run_command(SLEEPER, ["status"], ".")
+        finished.set()
+        return server.ToolResult(*result[:1], None, [result[2]])
+
+    async def main():
+        start = time.monotonic()
+        result = await limiter.run("slow", work)
+        assert time.monotonic() - start < 5
+        assert not result.success
+        assert "timed out" in result.output[0]
+        assert finished.wait(5)
+        await asyncio.sleep(0.05)
+        assert limiter.stats()["active"] == {"slow": 0}
+
+    asyncio.run(main())
+
+
+def test_concurrency_is_capped_per_tool():
+    limiter = server.ToolLimiter({"capped": (2, 5.0)})
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def work():
+        with lock:
+            running.append(1)
+            peak.append(len(running))
+        time.sleep(0.1)
+        with lock:
+            running.pop()
+        return server.ToolResult(True)
+
+    async def main():
+        results = await asyncio.gather(*(limiter.run("capped", work) for _ in range(5)))
+        assert all(result.success for result in results)
+
+    asyncio.run(main())
+    assert max(peak) == 2
+    assert limiter.stats()["active"] == {"capped": 0}
+
+
+def test_isolated_calls_are_killed_on_timeout():
+    limiter = server.ToolLimiter({"slow": (1, 0.3)})
+    result = asyncio.run(limiter.run_process("slow", [sys.executable, "-c", "import time; time.sleep(10)"]))
+    assert not result.success
+    assert limiter.timeouts == 1
@@ -0,0 +1,69 @@
+"""In-process management tool runners."""
+
+import types
+
+import pytest
+
+import wordpress_mcp as server
+
+
+class FakePluginManager:
+    def __init__(self, wp_path, log=print):
+        self.wp_path = wp_path
+        self.log = log
+
+    def list_plugins(self, status):
+        self.log(f"Listing {status} plugins")
+        return [{"name": "akismet", "status": "active"}]
+
+    def install_plugin(self, slug, activate):
+        self.log(f"Installing {slug}")
+        return slug != "missing"
+
+    def install_from_zip(self, path, activate):
+        return True
+
+    def install_from_url(self, url, activate):
+        return True
+
+    def activate_plugin(self, slug):
+        return True
+
+    deactivate_plugin = uninstall_plugin = update_plugin = activate_plugin
+
+
+@pytest.fixture
+def fake_tools(monkeypatch):
+    module = types.SimpleNamespace(PluginManager=FakePluginManager)
+    monkeypatch.setattr(server, "_import_tool", lambda name: module)
+
+
+def test_result_text_joins_log_and_data():
+    assert server.ToolResult(True, {"a": 1}, ["done"]).text() == 'done\n{\n  "a": 1\n}'
+    assert server.ToolResult(True, True, ["done"]).text() == "done"
+
+
+def test_log_lines_are_collected_not_printed(fake_tools, capsys):
+    result = server.run_plugin_manager("/srv/wp", "list", status="active")
+    assert result.success
+    assert result.data == [{"name": "akismet", "status": "active"}]
+    assert result.output == ["Listing active plugins"]
+    assert capsys.readouterr().out == ""
+
+
+def test_per_item_actions_report_each_target(fake_tools):
+    result = server.run_plugin_manager("/srv/wp", "install", plugins=["akismet", "missing"])
+    assert not result.success
+    assert result.data == {"akismet": True, "missing": False}
+
+
+def test_unknown_action_fails(fake_tools):
+    result = server.run_plugin_manager("/srv/wp", "explode", plugin="akismet")
+    assert not result.success
+    assert result.output == ["Unknown plugin action: explode"]
+
+
+def test_tool_classes_default_to_print(tmp_path, capsys):
+    manager = server._import_tool("plugin_manager").PluginManager(str(tmp_path))
+    manager.log("hello")
+    assert capsys.readouterr().out == "hello\n"
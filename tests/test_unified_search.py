@@ -0,0 +1,43 @@
+"""Unified search over docs, snippets, prompts and the catalog."""
+
+import re
+
+import wordpress_mcp as server
+
+
+def _hits(output):
+    return re.findall(r"^### \d+\. (\S+) \[(\w+)\]", output, re.M)
+
+
+def test_hits_are_typed_and_ranked():
+    output = server.search("nonce ajax")
+    hits = _hits(output)
+    assert hits and {hit_type for _, hit_type in hits} <= {"doc", "snippet", "prompt", "catalog"}
+    scores = [float(score) for score in re.findall(r"\*\*Score:\*\* ([\d.]+)", output)]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_prompts_are_searchable_and_readable():
+    output = server.search("security audit", types="prompt", limit=1)
+    assert _hits(output) == [("security_audit", "prompt")]
+    assert "**URI:** `wordpress://prompts/security_audit`" in output
+    assert server.get_prompt_text("security_audit") == server.security_audit()
+    assert server.get_prompt_text("nope").startswith("Prompt not found: nope")
+
+
+def test_catalog_is_indexed():
+    assert _hits(server.search("resource catalog", types="catalog")) == [("catalog", "catalog")]
+
+
+def test_limit_and_type_filters():
+    assert len(_hits(server.search("security", limit=3))) == 3
+    assert {hit_type for _, hit_type in _hits(server.search("security", types="snippet"))} == {"snippet"}
+
+
+def test_invalid_requests():
+    assert server.search("  ").startswith("Error: query is required")
+    assert server.search("nonce", types="doc,video").startswith("Error: unknown type(s) video")
+
+
+def test_misspelled_query_suggests_a_correction():
+    assert "**Did you mean:** sanitize" in server.search("sanitise")
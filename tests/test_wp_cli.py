@@ -0,0 +1,166 @@
+"""WP-CLI helpers shared by the management tools."""
+
+import os
+import sys
+import textwrap
+
+import pytest
+
+from tools import wp_cli
+from tools.database_manager import DatabaseManager
+from tools.plugin_manager import PluginManager
+from tools.theme_customizer import ThemeCustomizer
+
+FAKE_WP = """\
+    #!{python}
+    import base64, json, os, re, sys
+    args = sys.argv[1:]
+    with open(os.path.join({bindir!r}, "calls"), "a") as log:
+        log.write(" ".join(args) + "\\n")
+    if args[:1] == ["cli"]:
+        print('{{"php_version": "8.2.1", "wp_cli_version": "2.9.0"}}')
+    elif args[:1] == ["eval-file"]:
+        if os.environ.get("FAKE_WP_NO_EVAL"):
+            sys.exit(1)
+        source = open(args[1]).read()
+        batch = json.loads(base64.b64decode(re.search(r"base64_decode\\( '([^']*)'", source).group(1)))
+        results = []
+        for index, command in enumerate(batch["commands"]):
+            ok = "bad" not in command
+            results.append([0 if ok else 1, command, "" if ok else "failed"])
+            if not ok and index < batch["required"]:
+                break
+        print("notice from a plugin\\n__WP_CLI_BATCH_RESULTS__" + json.dumps(results))
+    elif args[:1] == ["pwd"]:
+        print(os.getcwd())
+    else:
+        sys.exit(1 if "bad" in args else 0)
+"""
+
+
+@pytest.fixture
+def fake_wp(tmp_path, monkeypatch):
+    bindir = tmp_path / "bin"
+    bindir.mkdir()
+    wp = bindir / "wp"
+    wp.write_text(textwrap.dedent(FAKE_WP.format(python=sys.executable, bindir=str(bindir))))
+    wp.chmod(0o755)
+    monkeypatch.setenv("PATH", f"{bindir}{os.pathsep}{os.environ['PATH']}")
+    wp_cli.clear_cache()
+    yield bindir / "calls"
+    wp_cli.clear_cache()
+
+
+def _calls(log):
+    return [line for line in log.read_text().splitlines() if not line.startswith("cli ")]
+
+
+def _probes(log):
+    return [line for line in log.read_text().splitlines() if line.startswith("cli ")]
+
+
+def test_detection_is_probed_once_per_path(fake_wp, tmp_path):
+    info = wp_cli.detect_wp_cli(str(tmp_path))
+    assert (info.wp_cli_version, info.php_version) == ("2.9.0", "8.2.1")
+    assert wp_cli.detect_wp_cli(str(tmp_path)) is info
+    assert len(_probes(fake_wp)) == 1
+
+    wp_cli.detect_wp_cli(str(tmp_path / "other"))
+    assert len(_probes(fake_wp)) == 2
+
+
+def test_changed_binary_is_probed_again(fake_wp, tmp_path):
+    wp_cli.detect_wp_cli(str(tmp_path))
+    wp = fake_wp.parent / "wp"
+    os.utime(wp, ns=(wp.stat().st_mtime_ns + 10**9,) * 2)
+    wp_cli.detect_wp_cli(str(tmp_path))
+    assert len(_probes(fake_wp)) == 2
+
+
+def test_tools_reuse_the_probe(fake_wp, tmp_path):
+    tool = PluginManager(str(tmp_path), log=lambda line: None)
+    assert tool.run_wp_cli("plugin list")[0]
+    assert tool.run_wp_cli("option get home")[0]
+    assert len(_probes(fake_wp)) == 1
+    assert _calls(fake_wp) == ["plugin list", "option get home"]
+
+
+@pytest.mark.parametrize("manager", [PluginManager, ThemeCustomizer, DatabaseManager])
+def test_batch_uses_one_process(manager, fake_wp, tmp_path):
+    tool = manager(str(tmp_path), log=lambda line: None)
+    results = tool.run_wp_cli_batch(["plugin activate akismet", "option get home"])
+    assert results == [(True, "plugin activate akismet", ""), (True, "option get home", "")]
+    assert len(_calls(fake_wp)) == 1
+
+
+def test_batch_skips_after_required_failure(fake_wp, tmp_path):
+    tool = PluginManager(str(tmp_path), log=lambda line: None)
+    results = tool.run_wp_cli_batch(["bad command", "option get home"], required=1)
+    assert results[0] == (False, "bad command", "failed")
+    assert results[1][0] is False and "Skipped" in results[1][2]
+
+
+def test_batch_falls_back_to_single_commands(fake_wp, tmp_path, monkeypatch):
+    monkeypatch.setenv("FAKE_WP_NO_EVAL", "1")
+    tool = ThemeCustomizer(str(tmp_path), log=lambda line: None)
+    results = tool.run_wp_cli_batch(["theme list", "bad", "option get home"], required=2)
+    assert [ok for ok, _, _ in results] == [True, False, False]
+    assert _calls(fake_wp)[1:] == ["theme list", "bad"]
+
+def test_commands_run_as_argv_in_the_wordpress_dir(fake_wp, tmp_path):
+    site = tmp_path / "site"
+    site.mkdir()
+    cwd = os.getcwd()
+    tool = ThemeCustomizer(str(site), log=lambda line: None)
+    assert tool.set_theme_mod("tagline", "it's $(touch pwned)")
+    assert _calls(fake_wp)[-1] == "theme mod set tagline it's $(touch pwned)"
+    assert not list(tmp_path.rglob("pwned"))
+
+    assert tool.run_wp_cli(["pwd"])[1].strip() == str(site)
+    assert tool.run_wp_cli(["pwd"], cwd=str(tmp_path))[1].strip() == str(tmp_path)
+    assert os.getcwd() == cwd
+
+
+def test_without_wp_cli(tmp_path, monkeypatch):
+    monkeypatch.setenv("PATH", str(tmp_path))
+    wp_cli.clear_cache()
+    assert wp_cli.detect_wp_cli(str(tmp_path)) is None
+    tool = DatabaseManager(str(tmp_path), log=lambda line: None)
+    assert tool.run_wp_cli_batch(["db check"]) == [(False, "", "WP-CLI not available")]
+    wp_cli.clear_cache()
+
+
+def test_run_external_redirects_files(tmp_path):
+    source, target = tmp_path / "in.sql", tmp_path / "out.sql"
+    source.write_text("CREATE TABLE wp_posts;\n")
+    with open(source) as stdin, open(target, "w") as stdout:
+        ok, error = wp_cli.run_external([sys.executable, "-c", "import sys; sys.stdout.write(sys.stdin.read())"],
+                                        stdin=stdin, stdout=stdout)
+    assert (ok, error) == (True, "")
+    assert target.read_text() == "CREATE TABLE wp_posts;\n"
+
+
+def test_run_external_reports_stderr():
+    ok, error = wp_cli.run_external([sys.executable, "-c", "import sys; sys.exit('access denied')"])
+    assert not ok and "access denied" in error
+
+
+def test_run_external_honours_scope_deadline():
+    import time
+
+    scope = wp_cli.ExecutionScope(0.3)
+    start = time.monotonic()
+    with wp_cli.execution_scope(scope):
+        ok, error = wp_cli.run_external([sys.executable, "-c", "import time; time.sleep(10)"])
+    assert not ok and "timed out" in error
+    assert time.monotonic() - start < 5
+
+
+def test_installer_detects_wp_cli_for_target_dir(tmp_path, monkeypatch):
+    from tools import wordpress_installer
+
+    probed = []
+    monkeypatch.setattr(wordpress_installer, "detect_wp_cli", lambda path: probed.append(path))
+    installer = wordpress_installer.WordPressInstaller(log=lambda line: None)
+    assert installer.run_wp_cli("core version", str(tmp_path)) == (False, "", "WP-CLI not available")
+    assert probed == [str(tmp_path)]
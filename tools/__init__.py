@@ -0,0 +1,7 @@
+"""
+WordPress management tools.
+
+Each module is both a standalone CLI script and an importable API used
+in-process by the MCP server (see the MANAGEMENT TOOL RUNNERS section of
+wordpress_mcp.py).
+"""
@@ -13,18 +13,25 @@ import zipfile
 import gzip
 import shutil
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable, Union
 import argparse
 from datetime import datetime
 import hashlib
 import tempfile
 
-class WordPressBackup:
+try:
+    from tools.wp_cli import WPCLIMixin, count_dump_tables, is_cancelled, report_progress, run_external
+except ImportError:  # running as a script from inside tools/
+    from wp_cli import WPCLIMixin, count_dump_tables, is_cancelled, report_progress, run_external
+
+class WordPressBackup(WPCLIMixin):
     """WordPress backup and restore tool"""
     
-    def __init__(self, wp_path: str = None):
+    def __init__(self, wp_path: str = None, log: Callable[[str], None] = print):
+        self.log = log
         self.wp_path = os.path.abspath(wp_path) if wp_path else os.getcwd()
         self.wp_cli_path = None
+        self.wp_cli_info = None
         self.backup_config = {
             'exclude_files': [
                 'wp-content/cache/*',
@@ -51,53 +58,9 @@ class WordPressBackup:
             ]
         }
     
-    def check_wp_cli(self) -> bool:
-        """Check if WP-CLI is available"""
-        try:
-            result = subprocess.run(['wp', '--version'], 
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                self.wp_cli_path = 'wp'
-                return True
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-        
-        # Check for local wp-cli.phar
-        wp_cli_path = os.path.join(self.wp_path, 'wp-cli.phar')
-        if os.path.exists(wp_cli_path):
-            try:
-                result = subprocess.run(['php', wp_cli_path, '--version'], 
-                                      capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    self.wp_cli_path = f'php {wp_cli_path}'
-                    return True
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                pass
-        
-        return False
-    
-    def run_wp_cli(self, command: str) -> Tuple[bool, str, str]:
-        """Run WP-CLI command"""
-        if not self.check_wp_cli():
-            return False, "", "WP-CLI not available"
-        
-        try:
-            original_dir = os.getcwd()
-            os.chdir(self.wp_path)
-            
-            full_command = f"{self.wp_cli_path} {command}"
-            result = subprocess.run(full_command, shell=True, capture_output=True, text=True)
-            
-            return result.returncode == 0, result.stdout, result.stderr
-            
-        except Exception as e:
-            return False, "", str(e)
-        finally:
-            os.chdir(original_dir)
-    
     def get_backup_info(self) -> Dict[str, Any]:
         """Get information about the WordPress installation for backup"""
-        print("Gathering WordPress installation information...")
+        self.log("Gathering WordPress installation information...")
         
         info = {
             'wp_path': self.wp_path,
@@ -169,7 +132,7 @@ class WordPressBackup:
                     config[key] = match.group(1)
             
         except Exception as e:
-            print(f"Failed to extract database config: {e}")
+            self.log(f"Failed to extract database config: {e}")
         
         return config
     
@@ -226,7 +189,7 @@ class WordPressBackup:
     
     def create_full_backup(self, output_path: str, compress: bool = True) -> bool:
         """Create a full WordPress backup including files and database"""
-        print(f"Creating full WordPress backup: {output_path}")
+        self.log(f"Creating full WordPress backup: {output_path}")
         
         try:
             # Create temporary directory for backup
@@ -262,16 +225,16 @@ class WordPressBackup:
                     else:
                         self.create_tar_archive(backup_dir, output_path, compress=False)
                 
-                print(f"Full backup created successfully: {output_path}")
+                self.log(f"Full backup created successfully: {output_path}")
                 return True
                 
         except Exception as e:
-            print(f"Failed to create full backup: {e}")
+            self.log(f"Failed to create full backup: {e}")
             return False
     
     def backup_files(self, output_path: str) -> bool:
         """Backup WordPress files"""
-        print("Backing up WordPress files...")
+        self.log("Backing up WordPress files...")
         
         try:
             with tarfile.open(output_path, 'w') as tar:
@@ -283,30 +246,36 @@ class WordPressBackup:
                         file_path = os.path.join(root, file)
                         
                         if not self.should_exclude_file(file_path):
+                            if is_cancelled():
+                                self.log("File backup cancelled")
+                                return False
                             arcname = os.path.relpath(file_path, self.wp_path)
                             tar.add(file_path, arcname=arcname)
+                            report_progress('files_archived')
+                            report_progress('bytes_archived', os.lstat(file_path).st_size)
             
-            print(f"Files backed up successfully: {output_path}")
+            self.log(f"Files backed up successfully: {output_path}")
             return True
             
         except Exception as e:
-            print(f"Failed to backup files: {e}")
+            self.log(f"Failed to backup files: {e}")
             return False
     
     def backup_database(self, output_path: str) -> bool:
         """Backup WordPress database"""
-        print("Backing up WordPress database...")
+        self.log("Backing up WordPress database...")
         
         if self.check_wp_cli():
-            success, output, error = self.run_wp_cli(f"db export {output_path}")
+            success, output, error = self.run_wp_cli(['db', 'export', output_path])
             if success:
-                print(f"Database backed up successfully: {output_path}")
+                report_progress('tables_dumped', count_dump_tables(output_path))
+                self.log(f"Database backed up successfully: {output_path}")
                 return True
             else:
-                print(f"WP-CLI database backup failed: {error}")
+                self.log(f"WP-CLI database backup failed: {error}")
         
         # Fallback to manual database backup
-        print("WP-CLI not available, attempting manual database backup...")
+        self.log("WP-CLI not available, attempting manual database backup...")
         return self.manual_database_backup(output_path)
     
     def manual_database_backup(self, output_path: str) -> bool:
@@ -315,7 +284,7 @@ class WordPressBackup:
             db_config = self.extract_db_config(os.path.join(self.wp_path, 'wp-config.php'))
             
             if not db_config:
-                print("Database configuration not found")
+                self.log("Database configuration not found")
                 return False
             
             # Try to use mysqldump
@@ -331,17 +300,18 @@ class WordPressBackup:
             ]
             
             with open(output_path, 'w') as f:
-                result = subprocess.run(cmd, stdout=f, stderr=subprocess.PIPE, text=True)
+                success, error = run_external(cmd, stdout=f)
             
-            if result.returncode == 0:
-                print(f"Database backed up successfully: {output_path}")
+            if success:
+                report_progress('tables_dumped', count_dump_tables(output_path))
+                self.log(f"Database backed up successfully: {output_path}")
                 return True
             else:
-                print(f"mysqldump failed: {result.stderr}")
+                self.log(f"mysqldump failed: {error}")
                 return False
                 
         except Exception as e:
-            print(f"Manual database backup failed: {e}")
+            self.log(f"Manual database backup failed: {e}")
             return False
     
     def create_tar_archive(self, source_dir: str, output_path: str, compress: bool = True) -> bool:
@@ -355,7 +325,7 @@ class WordPressBackup:
             return True
             
         except Exception as e:
-            print(f"Failed to create tar archive: {e}")
+            self.log(f"Failed to create tar archive: {e}")
             return False
     
     def create_zip_archive(self, source_dir: str, output_path: str) -> bool:
@@ -371,7 +341,7 @@ class WordPressBackup:
             return True
             
         except Exception as e:
-            print(f"Failed to create zip archive: {e}")
+            self.log(f"Failed to create zip archive: {e}")
             return False
     
     def restore_backup(self, backup_path: str, target_path: str = None) -> bool:
@@ -379,11 +349,11 @@ class WordPressBackup:
         if not target_path:
             target_path = self.wp_path
         
-        print(f"Restoring WordPress backup: {backup_path}")
-        print(f"Target path: {target_path}")
+        self.log(f"Restoring WordPress backup: {backup_path}")
+        self.log(f"Target path: {target_path}")
         
         if not os.path.exists(backup_path):
-            print(f"Backup file not found: {backup_path}")
+            self.log(f"Backup file not found: {backup_path}")
             return False
         
         try:
@@ -412,16 +382,16 @@ class WordPressBackup:
                     if not self.restore_database(db_backup, target_path):
                         return False
                 
-                print("WordPress backup restored successfully!")
+                self.log("WordPress backup restored successfully!")
                 return True
                 
         except Exception as e:
-            print(f"Failed to restore backup: {e}")
+            self.log(f"Failed to restore backup: {e}")
             return False
     
     def extract_backup(self, backup_path: str, extract_dir: str) -> bool:
         """Extract backup archive"""
-        print(f"Extracting backup: {backup_path}")
+        self.log(f"Extracting backup: {backup_path}")
         
         try:
             if backup_path.endswith('.zip'):
@@ -434,18 +404,18 @@ class WordPressBackup:
                 with tarfile.open(backup_path, 'r') as tar:
                     tar.extractall(extract_dir)
             else:
-                print(f"Unsupported backup format: {backup_path}")
+                self.log(f"Unsupported backup format: {backup_path}")
                 return False
             
             return True
             
         except Exception as e:
-            print(f"Failed to extract backup: {e}")
+            self.log(f"Failed to extract backup: {e}")
             return False
     
     def restore_files(self, files_backup: str, target_path: str) -> bool:
         """Restore WordPress files"""
-        print("Restoring WordPress files...")
+        self.log("Restoring WordPress files...")
         
         try:
             # Create target directory if it doesn't exist
@@ -455,33 +425,28 @@ class WordPressBackup:
             with tarfile.open(files_backup, 'r') as tar:
                 tar.extractall(target_path)
             
-            print("Files restored successfully!")
+            self.log("Files restored successfully!")
             return True
             
         except Exception as e:
-            print(f"Failed to restore files: {e}")
+            self.log(f"Failed to restore files: {e}")
             return False
     
     def restore_database(self, db_backup: str, target_path: str) -> bool:
         """Restore WordPress database"""
-        print("Restoring WordPress database...")
+        self.log("Restoring WordPress database...")
         
         if self.check_wp_cli():
-            original_dir = os.getcwd()
-            os.chdir(target_path)
-            
-            success, output, error = self.run_wp_cli(f"db import {db_backup}")
-            
-            os.chdir(original_dir)
+            success, output, error = self.run_wp_cli(['db', 'import', db_backup], cwd=target_path)
             
             if success:
-                print("Database restored successfully!")
+                self.log("Database restored successfully!")
                 return True
             else:
-                print(f"WP-CLI database restore failed: {error}")
+                self.log(f"WP-CLI database restore failed: {error}")
         
         # Fallback to manual database restore
-        print("WP-CLI not available, attempting manual database restore...")
+        self.log("WP-CLI not available, attempting manual database restore...")
         return self.manual_database_restore(db_backup, target_path)
     
     def manual_database_restore(self, db_backup: str, target_path: str) -> bool:
@@ -491,7 +456,7 @@ class WordPressBackup:
             db_config = self.extract_db_config(wp_config_path)
             
             if not db_config:
-                print("Database configuration not found")
+                self.log("Database configuration not found")
                 return False
             
             # Try to use mysql command
@@ -504,17 +469,17 @@ class WordPressBackup:
             ]
             
             with open(db_backup, 'r') as f:
-                result = subprocess.run(cmd, stdin=f, stderr=subprocess.PIPE, text=True)
+                success, error = run_external(cmd, stdin=f)
             
-            if result.returncode == 0:
-                print("Database restored successfully!")
+            if success:
+                self.log("Database restored successfully!")
                 return True
             else:
-                print(f"mysql restore failed: {result.stderr}")
+                self.log(f"mysql restore failed: {error}")
                 return False
                 
         except Exception as e:
-            print(f"Manual database restore failed: {e}")
+            self.log(f"Manual database restore failed: {e}")
             return False
     
     def list_backups(self, backup_dir: str) -> List[Dict[str, Any]]:
@@ -548,10 +513,10 @@ class WordPressBackup:
     
     def verify_backup(self, backup_path: str) -> bool:
         """Verify backup integrity"""
-        print(f"Verifying backup: {backup_path}")
+        self.log(f"Verifying backup: {backup_path}")
         
         if not os.path.exists(backup_path):
-            print("Backup file not found")
+            self.log("Backup file not found")
             return False
         
         try:
@@ -559,7 +524,7 @@ class WordPressBackup:
             if backup_path.endswith('.zip'):
                 with zipfile.ZipFile(backup_path, 'r') as zipf:
                     if zipf.testzip() is not None:
-                        print("Backup archive is corrupted")
+                        self.log("Backup archive is corrupted")
                         return False
             elif backup_path.endswith('.tar.gz') or backup_path.endswith('.tgz'):
                 with tarfile.open(backup_path, 'r:gz') as tar:
@@ -568,11 +533,11 @@ class WordPressBackup:
                 with tarfile.open(backup_path, 'r') as tar:
                     pass  # Test opening
             
-            print("Backup verification successful!")
+            self.log("Backup verification successful!")
             return True
             
         except Exception as e:
-            print(f"Backup verification failed: {e}")
+            self.log(f"Backup verification failed: {e}")
             return False
 
 def main():
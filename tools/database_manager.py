@@ -11,18 +11,25 @@ import json
 import sqlite3
 import mysql.connector
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable, Union
 import argparse
 from datetime import datetime
 import gzip
 import shutil
 
-class DatabaseManager:
+try:
+    from tools.wp_cli import WPCLIMixin, count_dump_tables, quote_arg, report_progress, run_external
+except ImportError:  # running as a script from inside tools/
+    from wp_cli import WPCLIMixin, count_dump_tables, quote_arg, report_progress, run_external
+
+class DatabaseManager(WPCLIMixin):
     """WordPress database management tool"""
     
-    def __init__(self, wp_path: str = None):
+    def __init__(self, wp_path: str = None, log: Callable[[str], None] = print):
+        self.log = log
         self.wp_path = wp_path or os.getcwd()
         self.wp_cli_path = None
+        self.wp_cli_info = None
         self.db_config = self.get_db_config()
         
     def get_db_config(self) -> Dict[str, str]:
@@ -30,7 +37,7 @@ class DatabaseManager:
         wp_config_path = os.path.join(self.wp_path, 'wp-config.php')
         
         if not os.path.exists(wp_config_path):
-            print("wp-config.php not found")
+            self.log("wp-config.php not found")
             return {}
         
         config = {}
@@ -62,58 +69,14 @@ class DatabaseManager:
                 config['table_prefix'] = table_prefix_match.group(1)
             
         except Exception as e:
-            print(f"Failed to read wp-config.php: {e}")
+            self.log(f"Failed to read wp-config.php: {e}")
         
         return config
     
-    def check_wp_cli(self) -> bool:
-        """Check if WP-CLI is available"""
-        try:
-            result = subprocess.run(['wp', '--version'], 
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                self.wp_cli_path = 'wp'
-                return True
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-        
-        # Check for local wp-cli.phar
-        wp_cli_path = os.path.join(self.wp_path, 'wp-cli.phar')
-        if os.path.exists(wp_cli_path):
-            try:
-                result = subprocess.run(['php', wp_cli_path, '--version'], 
-                                      capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    self.wp_cli_path = f'php {wp_cli_path}'
-                    return True
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                pass
-        
-        return False
-    
-    def run_wp_cli(self, command: str) -> Tuple[bool, str, str]:
-        """Run WP-CLI command"""
-        if not self.check_wp_cli():
-            return False, "", "WP-CLI not available"
-        
-        try:
-            original_dir = os.getcwd()
-            os.chdir(self.wp_path)
-            
-            full_command = f"{self.wp_cli_path} {command}"
-            result = subprocess.run(full_command, shell=True, capture_output=True, text=True)
-            
-            return result.returncode == 0, result.stdout, result.stderr
-            
-        except Exception as e:
-            return False, "", str(e)
-        finally:
-            os.chdir(original_dir)
-    
     def get_database_connection(self):
         """Get database connection based on configuration"""
         if not self.db_config:
-            print("Database configuration not found")
+            self.log("Database configuration not found")
             return None
         
         db_host = self.db_config.get('db_host', 'localhost')
@@ -124,7 +87,7 @@ class DatabaseManager:
             try:
                 return sqlite3.connect(db_path)
             except Exception as e:
-                print(f"Failed to connect to SQLite database: {e}")
+                self.log(f"Failed to connect to SQLite database: {e}")
                 return None
         
         # MySQL/MariaDB connection
@@ -136,12 +99,12 @@ class DatabaseManager:
                 password=self.db_config['db_pass']
             )
         except Exception as e:
-            print(f"Failed to connect to MySQL database: {e}")
+            self.log(f"Failed to connect to MySQL database: {e}")
             return None
     
     def get_database_info(self) -> Dict[str, Any]:
         """Get database information"""
-        print("Getting database information...")
+        self.log("Getting database information...")
         
         conn = self.get_database_connection()
         if not conn:
@@ -197,14 +160,14 @@ class DatabaseManager:
             return info
             
         except Exception as e:
-            print(f"Failed to get database info: {e}")
+            self.log(f"Failed to get database info: {e}")
             return {}
         finally:
             conn.close()
     
     def list_tables(self) -> List[str]:
         """List all WordPress tables"""
-        print("Listing WordPress tables...")
+        self.log("Listing WordPress tables...")
         
         conn = self.get_database_connection()
         if not conn:
@@ -225,14 +188,14 @@ class DatabaseManager:
             return tables
             
         except Exception as e:
-            print(f"Failed to list tables: {e}")
+            self.log(f"Failed to list tables: {e}")
             return []
         finally:
             conn.close()
     
     def get_table_info(self, table_name: str) -> Dict[str, Any]:
         """Get information about a specific table"""
-        print(f"Getting information for table: {table_name}")
+        self.log(f"Getting information for table: {table_name}")
         
         conn = self.get_database_connection()
         if not conn:
@@ -278,36 +241,37 @@ class DatabaseManager:
             return info
             
         except Exception as e:
-            print(f"Failed to get table info: {e}")
+            self.log(f"Failed to get table info: {e}")
             return {}
         finally:
             conn.close()
     
     def backup_database(self, output_file: str, compress: bool = True) -> bool:
         """Backup the WordPress database"""
-        print(f"Creating database backup: {output_file}")
+        self.log(f"Creating database backup: {output_file}")
         
         if not self.db_config:
-            print("Database configuration not found")
+            self.log("Database configuration not found")
             return False
         
         try:
             # Use WP-CLI for backup if available
             if self.check_wp_cli():
-                success, output, error = self.run_wp_cli(f"db export {output_file}")
+                success, output, error = self.run_wp_cli(['db', 'export', output_file])
                 if success:
+                    report_progress('tables_dumped', count_dump_tables(output_file))
                     if compress and not output_file.endswith('.gz'):
                         # Compress the backup
                         with open(output_file, 'rb') as f_in:
                             with gzip.open(f"{output_file}.gz", 'wb') as f_out:
                                 shutil.copyfileobj(f_in, f_out)
                         os.remove(output_file)
-                        print(f"Database backup created and compressed: {output_file}.gz")
+                        self.log(f"Database backup created and compressed: {output_file}.gz")
                     else:
-                        print(f"Database backup created: {output_file}")
+                        self.log(f"Database backup created: {output_file}")
                     return True
                 else:
-                    print(f"WP-CLI backup failed: {error}")
+                    self.log(f"WP-CLI backup failed: {error}")
             
             # Fallback to direct database backup
             conn = self.get_database_connection()
@@ -321,8 +285,6 @@ class DatabaseManager:
                 backup_conn.close()
             else:
                 # MySQL backup using mysqldump
-                import subprocess
-                
                 cmd = [
                     'mysqldump',
                     '-h', self.db_config['db_host'],
@@ -335,11 +297,12 @@ class DatabaseManager:
                 ]
                 
                 with open(output_file, 'w') as f:
-                    result = subprocess.run(cmd, stdout=f, stderr=subprocess.PIPE, text=True)
+                    success, error = run_external(cmd, stdout=f)
                 
-                if result.returncode != 0:
-                    print(f"mysqldump failed: {result.stderr}")
+                if not success:
+                    self.log(f"mysqldump failed: {error}")
                     return False
+                report_progress('tables_dumped', count_dump_tables(output_file))
             
             conn.close()
             
@@ -349,22 +312,22 @@ class DatabaseManager:
                     with gzip.open(f"{output_file}.gz", 'wb') as f_out:
                         shutil.copyfileobj(f_in, f_out)
                 os.remove(output_file)
-                print(f"Database backup created and compressed: {output_file}.gz")
+                self.log(f"Database backup created and compressed: {output_file}.gz")
             else:
-                print(f"Database backup created: {output_file}")
+                self.log(f"Database backup created: {output_file}")
             
             return True
             
         except Exception as e:
-            print(f"Failed to create database backup: {e}")
+            self.log(f"Failed to create database backup: {e}")
             return False
     
     def restore_database(self, backup_file: str) -> bool:
         """Restore database from backup"""
-        print(f"Restoring database from: {backup_file}")
+        self.log(f"Restoring database from: {backup_file}")
         
         if not os.path.exists(backup_file):
-            print(f"Backup file not found: {backup_file}")
+            self.log(f"Backup file not found: {backup_file}")
             return False
         
         try:
@@ -379,12 +342,12 @@ class DatabaseManager:
             
             # Use WP-CLI for restore if available
             if self.check_wp_cli():
-                success, output, error = self.run_wp_cli(f"db import {backup_file}")
+                success, output, error = self.run_wp_cli(['db', 'import', backup_file])
                 if success:
-                    print("Database restored successfully!")
+                    self.log("Database restored successfully!")
                     return True
                 else:
-                    print(f"WP-CLI restore failed: {error}")
+                    self.log(f"WP-CLI restore failed: {error}")
             
             # Fallback to direct database restore
             conn = self.get_database_connection()
@@ -397,8 +360,6 @@ class DatabaseManager:
                 shutil.copy2(backup_file, conn.execute("PRAGMA database_list").fetchone()[2])
             else:
                 # MySQL restore
-                import subprocess
-                
                 cmd = [
                     'mysql',
                     '-h', self.db_config['db_host'],
@@ -408,17 +369,17 @@ class DatabaseManager:
                 ]
                 
                 with open(backup_file, 'r') as f:
-                    result = subprocess.run(cmd, stdin=f, stderr=subprocess.PIPE, text=True)
+                    success, error = run_external(cmd, stdin=f)
                 
-                if result.returncode != 0:
-                    print(f"mysql restore failed: {result.stderr}")
+                if not success:
+                    self.log(f"mysql restore failed: {error}")
                     return False
             
-            print("Database restored successfully!")
+            self.log("Database restored successfully!")
             return True
             
         except Exception as e:
-            print(f"Failed to restore database: {e}")
+            self.log(f"Failed to restore database: {e}")
             return False
         finally:
             # Clean up decompressed file if it was created
@@ -427,15 +388,15 @@ class DatabaseManager:
     
     def optimize_database(self) -> bool:
         """Optimize WordPress database"""
-        print("Optimizing database...")
+        self.log("Optimizing database...")
         
         if self.check_wp_cli():
             success, output, error = self.run_wp_cli("db optimize")
             if success:
-                print("Database optimized successfully!")
+                self.log("Database optimized successfully!")
                 return True
             else:
-                print(f"WP-CLI optimization failed: {error}")
+                self.log(f"WP-CLI optimization failed: {error}")
         
         # Fallback to manual optimization
         conn = self.get_database_connection()
@@ -454,26 +415,26 @@ class DatabaseManager:
             
             conn.commit()
             cursor.close()
-            print("Database optimized successfully!")
+            self.log("Database optimized successfully!")
             return True
             
         except Exception as e:
-            print(f"Failed to optimize database: {e}")
+            self.log(f"Failed to optimize database: {e}")
             return False
         finally:
             conn.close()
     
     def repair_database(self) -> bool:
         """Repair WordPress database"""
-        print("Repairing database...")
+        self.log("Repairing database...")
         
         if self.check_wp_cli():
             success, output, error = self.run_wp_cli("db repair")
             if success:
-                print("Database repaired successfully!")
+                self.log("Database repaired successfully!")
                 return True
             else:
-                print(f"WP-CLI repair failed: {error}")
+                self.log(f"WP-CLI repair failed: {error}")
         
         # Fallback to manual repair
         conn = self.get_database_connection()
@@ -493,67 +454,75 @@ class DatabaseManager:
             
             conn.commit()
             cursor.close()
-            print("Database repaired successfully!")
+            self.log("Database repaired successfully!")
             return True
             
         except Exception as e:
-            print(f"Failed to repair database: {e}")
+            self.log(f"Failed to repair database: {e}")
             return False
         finally:
             conn.close()
     
     def clean_database(self) -> bool:
         """Clean up WordPress database"""
-        print("Cleaning database...")
+        self.log("Cleaning database...")
         
         if self.check_wp_cli():
-            # Clean revisions, spam comments, etc.
-            commands = [
-                "post delete $(wp post list --post_type=revision --format=ids)",
-                "comment delete $(wp comment list --status=spam --format=ids)",
-                "comment delete $(wp comment list --status=trash --format=ids)",
-                "post delete $(wp post list --post_status=trash --format=ids)",
-                "post delete $(wp post list --post_type=attachment --post_status=inherit --format=ids)",
+            # Clean revisions, spam comments, etc. One bootstrap collects the IDs,
+            # a second deletes them, instead of two WP-CLI processes per step.
+            cleanups = [
+                ("post", "post list --post_type=revision --format=ids"),
+                ("comment", "comment list --status=spam --format=ids"),
+                ("comment", "comment list --status=trash --format=ids"),
+                ("post", "post list --post_status=trash --format=ids"),
+                ("post", "post list --post_type=attachment --post_status=inherit --format=ids"),
             ]
             
-            for command in commands:
-                success, output, error = self.run_wp_cli(command)
+            listings = self.run_wp_cli_batch([list_command for _, list_command in cleanups])
+            deletes = []
+            for (object_type, list_command), (success, output, error) in zip(cleanups, listings):
+                if not success:
+                    self.log(f"Cleanup command failed: {error}")
+                elif output.split():
+                    deletes.append(f"{object_type} delete {' '.join(output.split())}")
+            
+            for success, output, error in self.run_wp_cli_batch(deletes):
                 if not success:
-                    print(f"Cleanup command failed: {error}")
+                    self.log(f"Cleanup command failed: {error}")
             
-            print("Database cleaned successfully!")
+            self.log("Database cleaned successfully!")
             return True
         
-        print("WP-CLI not available for database cleaning")
+        self.log("WP-CLI not available for database cleaning")
         return False
     
     def search_replace(self, search: str, replace: str, dry_run: bool = True) -> bool:
         """Search and replace in database"""
-        print(f"Search and replace: '{search}' -> '{replace}'")
+        self.log(f"Search and replace: '{search}' -> '{replace}'")
         
         if self.check_wp_cli():
-            command = f"search-replace '{search}' '{replace}'"
+            command = ['search-replace', search, replace]
             if dry_run:
-                command += " --dry-run"
+                command.append('--dry-run')
             
             success, output, error = self.run_wp_cli(command)
             
             if success:
                 if dry_run:
-                    print("Dry run completed. Use --execute to perform the replacement.")
+                    self.log("Dry run completed. Use --execute to perform the replacement.")
                 else:
-                    print("Search and replace completed successfully!")
+                    self.log("Search and replace completed successfully!")
                 return True
             else:
-                print(f"Search and replace failed: {error}")
+                self.log(f"Search and replace failed: {error}")
                 return False
         
-        print("WP-CLI not available for search and replace")
+        self.log("WP-CLI not available for search and replace")
         return False
     
     def query_database(self, query: str) -> List[Tuple]:
         """Execute a custom database query"""
-        print(f"Executing query: {query}")
+        self.log(f"Executing query: {query}")
         
         conn = self.get_database_connection()
         if not conn:
@@ -567,7 +536,7 @@ class DatabaseManager:
             return results
             
         except Exception as e:
-            print(f"Query failed: {e}")
+            self.log(f"Query failed: {e}")
             return []
         finally:
             conn.close()
@@ -12,47 +12,29 @@ import requests
 import zipfile
 import tempfile
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable, Union
 import argparse
 from datetime import datetime
 
-class PluginManager:
+try:
+    from tools.wp_cli import WPCLIMixin, quote_arg
+except ImportError:  # running as a script from inside tools/
+    from wp_cli import WPCLIMixin, quote_arg
+
+class PluginManager(WPCLIMixin):
     """WordPress plugin management tool"""
     
-    def __init__(self, wp_path: str = None):
+    def __init__(self, wp_path: str = None, log: Callable[[str], None] = print):
+        self.log = log
         self.wp_path = wp_path or os.getcwd()
         self.wp_cli_path = None
+        self.wp_cli_info = None
         self.plugin_cache = {}
         self.cache_file = os.path.join(self.wp_path, '.plugin_cache.json')
         
         # Load plugin cache
         self.load_cache()
     
-    def check_wp_cli(self) -> bool:
-        """Check if WP-CLI is available"""
-        try:
-            result = subprocess.run(['wp', '--version'], 
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                self.wp_cli_path = 'wp'
-                return True
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-        
-        # Check for local wp-cli.phar
-        wp_cli_path = os.path.join(self.wp_path, 'wp-cli.phar')
-        if os.path.exists(wp_cli_path):
-            try:
-                result = subprocess.run(['php', wp_cli_path, '--version'], 
-                                      capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    self.wp_cli_path = f'php {wp_cli_path}'
-                    return True
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                pass
-        
-        return False
-    
     def load_cache(self):
         """Load plugin cache from file"""
         try:
@@ -68,42 +50,23 @@ class PluginManager:
             with open(self.cache_file, 'w') as f:
                 json.dump(self.plugin_cache, f, indent=2)
         except Exception as e:
-            print(f"Failed to save cache: {e}")
-    
-    def run_wp_cli(self, command: str) -> Tuple[bool, str, str]:
-        """Run WP-CLI command"""
-        if not self.check_wp_cli():
-            return False, "", "WP-CLI not available"
-        
-        try:
-            original_dir = os.getcwd()
-            os.chdir(self.wp_path)
-            
-            full_command = f"{self.wp_cli_path} {command}"
-            result = subprocess.run(full_command, shell=True, capture_output=True, text=True)
-            
-            return result.returncode == 0, result.stdout, result.stderr
-            
-        except Exception as e:
-            return False, "", str(e)
-        finally:
-            os.chdir(original_dir)
+            self.log(f"Failed to save cache: {e}")
     
     def list_plugins(self, status: str = 'all') -> List[Dict[str, Any]]:
         """List WordPress plugins"""
-        print(f"Listing {status} plugins...")
+        self.log(f"Listing {status} plugins...")
         
         success, output, error = self.run_wp_cli(f"plugin list --status={status} --format=json")
         
         if not success:
-            print(f"Failed to list plugins: {error}")
+            self.log(f"Failed to list plugins: {error}")
             return []
         
         try:
             plugins = json.loads(output)
             return plugins
         except json.JSONDecodeError:
-            print("Failed to parse plugin list")
+            self.log("Failed to parse plugin list")
             return []
     
     def get_plugin_info(self, plugin_slug: str) -> Optional[Dict[str, Any]]:
@@ -114,12 +77,12 @@ class PluginManager:
             if datetime.now().timestamp() - cached_info['cached_at'] < 3600:  # 1 hour cache
                 return cached_info['info']
         
-        print(f"Getting plugin information for: {plugin_slug}")
+        self.log(f"Getting plugin information for: {plugin_slug}")
         
-        success, output, error = self.run_wp_cli(f"plugin get {plugin_slug} --format=json")
+        success, output, error = self.run_wp_cli(['plugin', 'get', plugin_slug, '--format=json'])
         
         if not success:
-            print(f"Failed to get plugin info: {error}")
+            self.log(f"Failed to get plugin info: {error}")
             return None
         
         try:
@@ -134,229 +97,244 @@ class PluginManager:
             
             return plugin_info
         except json.JSONDecodeError:
-            print("Failed to parse plugin information")
+            self.log("Failed to parse plugin information")
             return None
     
     def search_plugins(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search for plugins in WordPress repository"""
-        print(f"Searching plugins for: {query}")
+        self.log(f"Searching plugins for: {query}")
         
-        success, output, error = self.run_wp_cli(f"plugin search {query} --format=json --per-page={limit}")
+        success, output, error = self.run_wp_cli(['plugin', 'search', query, '--format=json', f'--per-page={limit}'])
         
         if not success:
-            print(f"Failed to search plugins: {error}")
+            self.log(f"Failed to search plugins: {error}")
             return []
         
         try:
             plugins = json.loads(output)
             return plugins
         except json.JSONDecodeError:
-            print("Failed to parse search results")
+            self.log("Failed to parse search results")
             return []
     
     def install_plugin(self, plugin_slug: str, activate: bool = False) -> bool:
         """Install a WordPress plugin"""
-        print(f"Installing plugin: {plugin_slug}")
+        self.log(f"Installing plugin: {plugin_slug}")
         
-        command = f"plugin install {plugin_slug}"
+        command = ['plugin', 'install', plugin_slug]
         if activate:
-            command += " --activate"
+            command.append('--activate')
         
         success, output, error = self.run_wp_cli(command)
         
         if success:
-            print(f"Plugin '{plugin_slug}' installed successfully!")
+            self.log(f"Plugin '{plugin_slug}' installed successfully!")
             if activate:
-                print(f"Plugin '{plugin_slug}' activated!")
+                self.log(f"Plugin '{plugin_slug}' activated!")
         else:
-            print(f"Failed to install plugin '{plugin_slug}': {error}")
+            self.log(f"Failed to install plugin '{plugin_slug}': {error}")
         
         return success
     
     def activate_plugin(self, plugin_slug: str) -> bool:
         """Activate a WordPress plugin"""
-        print(f"Activating plugin: {plugin_slug}")
+        self.log(f"Activating plugin: {plugin_slug}")
         
-        success, output, error = self.run_wp_cli(f"plugin activate {plugin_slug}")
+        success, output, error = self.run_wp_cli(['plugin', 'activate', plugin_slug])
         
         if success:
-            print(f"Plugin '{plugin_slug}' activated successfully!")
+            self.log(f"Plugin '{plugin_slug}' activated successfully!")
         else:
-            print(f"Failed to activate plugin '{plugin_slug}': {error}")
+            self.log(f"Failed to activate plugin '{plugin_slug}': {error}")
         
         return success
     
     def deactivate_plugin(self, plugin_slug: str) -> bool:
         """Deactivate a WordPress plugin"""
-        print(f"Deactivating plugin: {plugin_slug}")
+        self.log(f"Deactivating plugin: {plugin_slug}")
         
-        success, output, error = self.run_wp_cli(f"plugin deactivate {plugin_slug}")
+        success, output, error = self.run_wp_cli(['plugin', 'deactivate', plugin_slug])
         
         if success:
-            print(f"Plugin '{plugin_slug}' deactivated successfully!")
+            self.log(f"Plugin '{plugin_slug}' deactivated successfully!")
         else:
-            print(f"Failed to deactivate plugin '{plugin_slug}': {error}")
+            self.log(f"Failed to deactivate plugin '{plugin_slug}': {error}")
         
         return success
     
     def uninstall_plugin(self, plugin_slug: str) -> bool:
         """Uninstall a WordPress plugin"""
-        print(f"Uninstalling plugin: {plugin_slug}")
+        self.log(f"Uninstalling plugin: {plugin_slug}")
         
-        success, output, error = self.run_wp_cli(f"plugin uninstall {plugin_slug} --deactivate")
+        success, output, error = self.run_wp_cli(['plugin', 'uninstall', plugin_slug, '--deactivate'])
         
         if success:
-            print(f"Plugin '{plugin_slug}' uninstalled successfully!")
+            self.log(f"Plugin '{plugin_slug}' uninstalled successfully!")
         else:
-            print(f"Failed to uninstall plugin '{plugin_slug}': {error}")
+            self.log(f"Failed to uninstall plugin '{plugin_slug}': {error}")
         
         return success
     
     def update_plugin(self, plugin_slug: str = None) -> bool:
         """Update a specific plugin or all plugins"""
         if plugin_slug:
-            print(f"Updating plugin: {plugin_slug}")
-            command = f"plugin update {plugin_slug}"
+            self.log(f"Updating plugin: {plugin_slug}")
+            command = ['plugin', 'update', plugin_slug]
         else:
-            print("Updating all plugins...")
+            self.log("Updating all plugins...")
             command = "plugin update --all"
         
         success, output, error = self.run_wp_cli(command)
         
         if success:
             if plugin_slug:
-                print(f"Plugin '{plugin_slug}' updated successfully!")
+                self.log(f"Plugin '{plugin_slug}' updated successfully!")
             else:
-                print("All plugins updated successfully!")
+                self.log("All plugins updated successfully!")
         else:
-            print(f"Failed to update plugins: {error}")
+            self.log(f"Failed to update plugins: {error}")
         
         return success
     
     def install_from_zip(self, zip_path: str, activate: bool = False) -> bool:
         """Install a plugin from a ZIP file"""
-        print(f"Installing plugin from ZIP: {zip_path}")
+        self.log(f"Installing plugin from ZIP: {zip_path}")
         
         if not os.path.exists(zip_path):
-            print(f"ZIP file not found: {zip_path}")
+            self.log(f"ZIP file not found: {zip_path}")
             return False
         
-        command = f"plugin install {zip_path} --activate" if activate else f"plugin install {zip_path}"
+        command = ['plugin', 'install', zip_path] + (['--activate'] if activate else [])
         
         success, output, error = self.run_wp_cli(command)
         
         if success:
-            print(f"Plugin installed from ZIP successfully!")
+            self.log(f"Plugin installed from ZIP successfully!")
             if activate:
-                print("Plugin activated!")
+                self.log("Plugin activated!")
         else:
-            print(f"Failed to install plugin from ZIP: {error}")
+            self.log(f"Failed to install plugin from ZIP: {error}")
         
         return success
     
     def install_from_url(self, url: str, activate: bool = False) -> bool:
         """Install a plugin from a URL"""
-        print(f"Installing plugin from URL: {url}")
+        self.log(f"Installing plugin from URL: {url}")
         
-        command = f"plugin install {url} --activate" if activate else f"plugin install {url}"
+        command = ['plugin', 'install', url] + (['--activate'] if activate else [])
         
         success, output, error = self.run_wp_cli(command)
         
         if success:
-            print(f"Plugin installed from URL successfully!")
+            self.log(f"Plugin installed from URL successfully!")
             if activate:
-                print("Plugin activated!")
+                self.log("Plugin activated!")
         else:
-            print(f"Failed to install plugin from URL: {error}")
+            self.log(f"Failed to install plugin from URL: {error}")
         
         return success
     
     def get_plugin_updates(self) -> List[Dict[str, Any]]:
         """Get list of plugins that need updates"""
-        print("Checking for plugin updates...")
+        self.log("Checking for plugin updates...")
         
         success, output, error = self.run_wp_cli("plugin list --update=available --format=json")
         
         if not success:
-            print(f"Failed to check for updates: {error}")
+            self.log(f"Failed to check for updates: {error}")
             return []
         
         try:
             updates = json.loads(output)
             return updates
         except json.JSONDecodeError:
-            print("Failed to parse update information")
+            self.log("Failed to parse update information")
             return []
     
-    def bulk_install_plugins(self, plugin_list: List[str], activate: bool = False) -> Dict[str, bool]:
-        """Install multiple plugins at once"""
-        print(f"Bulk installing {len(plugin_list)} plugins...")
+    def _bulk_plugin_command(self, verb: str, plugin_list: List[str], suffix: str = "") -> Dict[str, bool]:
+        """Run one `wp plugin <verb>` per plugin inside a single WP-CLI bootstrap"""
+        past = {'install': 'installed', 'activate': 'activated', 'deactivate': 'deactivated'}[verb]
         
-        results = {}
+        # Slugs WP-CLI cannot parse inside a batch are run on their own
+        batchable = [p for p in plugin_list if quote_arg(p) is not None]
+        commands = [f"plugin {verb} {quote_arg(p)}{suffix}" for p in batchable]
+        outcomes = dict(zip(batchable, self.run_wp_cli_batch(commands)))
         
+        results = {}
         for plugin in plugin_list:
-            results[plugin] = self.install_plugin(plugin, activate)
+            if plugin in outcomes:
+                success, output, error = outcomes[plugin]
+            else:
+                success, output, error = self.run_wp_cli(['plugin', verb, plugin] + suffix.split())
+            
+            if success:
+                self.log(f"Plugin '{plugin}' {past} successfully!")
+            else:
+                self.log(f"Failed to {verb} plugin '{plugin}': {error}")
+            results[plugin] = success
+        
+        return results
+    
+    def bulk_install_plugins(self, plugin_list: List[str], activate: bool = False) -> Dict[str, bool]:
+        """Install multiple plugins at once"""
+        self.log(f"Bulk installing {len(plugin_list)} plugins...")
+        
+        results = self._bulk_plugin_command('install', plugin_list, " --activate" if activate else "")
         
         successful = sum(1 for success in results.values() if success)
-        print(f"Successfully installed {successful}/{len(plugin_list)} plugins")
+        self.log(f"Successfully installed {successful}/{len(plugin_list)} plugins")
         
         return results
     
     def bulk_activate_plugins(self, plugin_list: List[str]) -> Dict[str, bool]:
         """Activate multiple plugins at once"""
-        print(f"Bulk activating {len(plugin_list)} plugins...")
-        
-        results = {}
+        self.log(f"Bulk activating {len(plugin_list)} plugins...")
         
-        for plugin in plugin_list:
-            results[plugin] = self.activate_plugin(plugin)
+        results = self._bulk_plugin_command('activate', plugin_list)
         
         successful = sum(1 for success in results.values() if success)
-        print(f"Successfully activated {successful}/{len(plugin_list)} plugins")
+        self.log(f"Successfully activated {successful}/{len(plugin_list)} plugins")
         
         return results
     
     def bulk_deactivate_plugins(self, plugin_list: List[str]) -> Dict[str, bool]:
         """Deactivate multiple plugins at once"""
-        print(f"Bulk deactivating {len(plugin_list)} plugins...")
+        self.log(f"Bulk deactivating {len(plugin_list)} plugins...")
         
-        results = {}
-        
-        for plugin in plugin_list:
-            results[plugin] = self.deactivate_plugin(plugin)
+        results = self._bulk_plugin_command('deactivate', plugin_list)
         
         successful = sum(1 for success in results.values() if success)
-        print(f"Successfully deactivated {successful}/{len(plugin_list)} plugins")
+        self.log(f"Successfully deactivated {successful}/{len(plugin_list)} plugins")
         
         return results
     
     def export_plugin_list(self, output_file: str) -> bool:
         """Export list of installed plugins to a file"""
-        print(f"Exporting plugin list to: {output_file}")
+        self.log(f"Exporting plugin list to: {output_file}")
         
         plugins = self.list_plugins('active')
         
         if not plugins:
-            print("No plugins found")
+            self.log("No plugins found")
             return False
         
         try:
             with open(output_file, 'w') as f:
                 json.dump(plugins, f, indent=2)
             
-            print(f"Plugin list exported successfully to {output_file}")
+            self.log(f"Plugin list exported successfully to {output_file}")
             return True
             
         except Exception as e:
-            print(f"Failed to export plugin list: {e}")
+            self.log(f"Failed to export plugin list: {e}")
             return False
     
     def import_plugin_list(self, input_file: str, activate: bool = False) -> bool:
         """Import and install plugins from a file"""
-        print(f"Importing plugin list from: {input_file}")
+        self.log(f"Importing plugin list from: {input_file}")
         
         if not os.path.exists(input_file):
-            print(f"Input file not found: {input_file}")
+            self.log(f"Input file not found: {input_file}")
             return False
         
         try:
@@ -366,26 +344,26 @@ class PluginManager:
             if isinstance(plugin_data, list):
                 plugin_slugs = [plugin['name'] for plugin in plugin_data if 'name' in plugin]
             else:
-                print("Invalid plugin list format")
+                self.log("Invalid plugin list format")
                 return False
             
             if not plugin_slugs:
-                print("No plugins found in file")
+                self.log("No plugins found in file")
                 return False
             
             results = self.bulk_install_plugins(plugin_slugs, activate)
             successful = sum(1 for success in results.values() if success)
             
-            print(f"Successfully imported {successful}/{len(plugin_slugs)} plugins")
+            self.log(f"Successfully imported {successful}/{len(plugin_slugs)} plugins")
             return successful > 0
             
         except Exception as e:
-            print(f"Failed to import plugin list: {e}")
+            self.log(f"Failed to import plugin list: {e}")
             return False
     
     def get_plugin_health(self) -> Dict[str, Any]:
         """Get plugin health information"""
-        print("Checking plugin health...")
+        self.log("Checking plugin health...")
         
         all_plugins = self.list_plugins('all')
         active_plugins = [p for p in all_plugins if p.get('status') == 'active']
@@ -13,16 +13,23 @@ import zipfile
 import tempfile
 import shutil
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Tuple, Callable, Union
 import argparse
 from datetime import datetime
 
-class ThemeCustomizer:
+try:
+    from tools.wp_cli import WPCLIMixin, quote_arg
+except ImportError:  # running as a script from inside tools/
+    from wp_cli import WPCLIMixin, quote_arg
+
+class ThemeCustomizer(WPCLIMixin):
     """WordPress theme management and customization tool"""
     
-    def __init__(self, wp_path: str = None):
+    def __init__(self, wp_path: str = None, log: Callable[[str], None] = print):
+        self.log = log
         self.wp_path = wp_path or os.getcwd()
         self.wp_cli_path = None
+        self.wp_cli_info = None
         self.themes_dir = os.path.join(self.wp_path, 'wp-content', 'themes')
         self.customizer_cache = {}
         self.cache_file = os.path.join(self.wp_path, '.theme_cache.json')
@@ -30,31 +37,6 @@ class ThemeCustomizer:
         # Load customizer cache
         self.load_cache()
     
-    def check_wp_cli(self) -> bool:
-        """Check if WP-CLI is available"""
-        try:
-            result = subprocess.run(['wp', '--version'], 
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                self.wp_cli_path = 'wp'
-                return True
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-        
-        # Check for local wp-cli.phar
-        wp_cli_path = os.path.join(self.wp_path, 'wp-cli.phar')
-        if os.path.exists(wp_cli_path):
-            try:
-                result = subprocess.run(['php', wp_cli_path, '--version'], 
-                                      capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    self.wp_cli_path = f'php {wp_cli_path}'
-                    return True
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                pass
-        
-        return False
-    
     def load_cache(self):
         """Load customizer cache from file"""
         try:
@@ -70,52 +52,33 @@ class ThemeCustomizer:
             with open(self.cache_file, 'w') as f:
                 json.dump(self.customizer_cache, f, indent=2)
         except Exception as e:
-            print(f"Failed to save cache: {e}")
-    
-    def run_wp_cli(self, command: str) -> Tuple[bool, str, str]:
-        """Run WP-CLI command"""
-        if not self.check_wp_cli():
-            return False, "", "WP-CLI not available"
-        
-        try:
-            original_dir = os.getcwd()
-            os.chdir(self.wp_path)
-            
-            full_command = f"{self.wp_cli_path} {command}"
-            result = subprocess.run(full_command, shell=True, capture_output=True, text=True)
-            
-            return result.returncode == 0, result.stdout, result.stderr
-            
-        except Exception as e:
-            return False, "", str(e)
-        finally:
-            os.chdir(original_dir)
+            self.log(f"Failed to save cache: {e}")
     
     def list_themes(self, status: str = 'all') -> List[Dict[str, Any]]:
         """List WordPress themes"""
-        print(f"Listing {status} themes...")
+        self.log(f"Listing {status} themes...")
         
         success, output, error = self.run_wp_cli(f"theme list --status={status} --format=json")
         
         if not success:
-            print(f"Failed to list themes: {error}")
+            self.log(f"Failed to list themes: {error}")
             return []
         
         try:
             themes = json.loads(output)
             return themes
         except json.JSONDecodeError:
-            print("Failed to parse theme list")
+            self.log("Failed to parse theme list")
             return []
     
     def get_current_theme(self) -> Optional[str]:
         """Get the currently active theme"""
-        print("Getting current theme...")
+        self.log("Getting current theme...")
         
         success, output, error = self.run_wp_cli("theme list --status=active --format=json")
         
         if not success:
-            print(f"Failed to get current theme: {error}")
+            self.log(f"Failed to get current theme: {error}")
             return None
         
         try:
@@ -124,84 +87,84 @@ class ThemeCustomizer:
                 return themes[0]['name']
             return None
         except json.JSONDecodeError:
-            print("Failed to parse current theme")
+            self.log("Failed to parse current theme")
             return None
     
     def activate_theme(self, theme_name: str) -> bool:
         """Activate a WordPress theme"""
-        print(f"Activating theme: {theme_name}")
+        self.log(f"Activating theme: {theme_name}")
         
-        success, output, error = self.run_wp_cli(f"theme activate {theme_name}")
+        success, output, error = self.run_wp_cli(['theme', 'activate', theme_name])
         
         if success:
-            print(f"Theme '{theme_name}' activated successfully!")
+            self.log(f"Theme '{theme_name}' activated successfully!")
         else:
-            print(f"Failed to activate theme '{theme_name}': {error}")
+            self.log(f"Failed to activate theme '{theme_name}': {error}")
         
         return success
     
     def install_theme(self, theme_slug: str) -> bool:
         """Install a WordPress theme"""
-        print(f"Installing theme: {theme_slug}")
+        self.log(f"Installing theme: {theme_slug}")
         
-        success, output, error = self.run_wp_cli(f"theme install {theme_slug}")
+        success, output, error = self.run_wp_cli(['theme', 'install', theme_slug])
         
         if success:
-            print(f"Theme '{theme_slug}' installed successfully!")
+            self.log(f"Theme '{theme_slug}' installed successfully!")
         else:
-            print(f"Failed to install theme '{theme_slug}': {error}")
+            self.log(f"Failed to install theme '{theme_slug}': {error}")
         
         return success
     
     def delete_theme(self, theme_name: str) -> bool:
         """Delete a WordPress theme"""
-        print(f"Deleting theme: {theme_name}")
+        self.log(f"Deleting theme: {theme_name}")
         
-        success, output, error = self.run_wp_cli(f"theme delete {theme_name}")
+        success, output, error = self.run_wp_cli(['theme', 'delete', theme_name])
         
         if success:
-            print(f"Theme '{theme_name}' deleted successfully!")
+            self.log(f"Theme '{theme_name}' deleted successfully!")
         else:
-            print(f"Failed to delete theme '{theme_name}': {error}")
+            self.log(f"Failed to delete theme '{theme_name}': {error}")
         
         return success
     
     def update_theme(self, theme_name: str = None) -> bool:
         """Update a specific theme or all themes"""
         if theme_name:
-            print(f"Updating theme: {theme_name}")
-            command = f"theme update {theme_name}"
+            self.log(f"Updating theme: {theme_name}")
+            command = ['theme', 'update', theme_name]
         else:
-            print("Updating all themes...")
+            self.log("Updating all themes...")
             command = "theme update --all"
         
         success, output, error = self.run_wp_cli(command)
         
         if success:
             if theme_name:
-                print(f"Theme '{theme_name}' updated successfully!")
+                self.log(f"Theme '{theme_name}' updated successfully!")
             else:
-                print("All themes updated successfully!")
+                self.log("All themes updated successfully!")
         else:
-            print(f"Failed to update themes: {error}")
+            self.log(f"Failed to update themes: {error}")
         
         return success
     
     def search_themes(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Search for themes in WordPress repository"""
-        print(f"Searching themes for: {query}")
+        self.log(f"Searching themes for: {query}")
         
-        success, output, error = self.run_wp_cli(f"theme search {query} --format=json --per-page={limit}")
+        success, output, error = self.run_wp_cli(['theme', 'search', query, '--format=json', f'--per-page={limit}'])
         
         if not success:
-            print(f"Failed to search themes: {error}")
+            self.log(f"Failed to search themes: {error}")
             return []
         
         try:
             themes = json.loads(output)
             return themes
         except json.JSONDecodeError:
-            print("Failed to parse search results")
+            self.log("Failed to parse search results")
             return []
     
     def create_child_theme(self, parent_theme: str, child_name: str, child_slug: str = None) -> bool:
@@ -209,13 +172,13 @@ class ThemeCustomizer:
         if not child_slug:
             child_slug = child_name.lower().replace(' ', '-')
         
-        print(f"Creating child theme '{child_name}' for parent '{parent_theme}'...")
+        self.log(f"Creating child theme '{child_name}' for parent '{parent_theme}'...")
         
         child_theme_dir = os.path.join(self.themes_dir, child_slug)
         
         # Check if child theme already exists
         if os.path.exists(child_theme_dir):
-            print(f"Child theme directory already exists: {child_theme_dir}")
+            self.log(f"Child theme directory already exists: {child_theme_dir}")
             return False
         
         try:
@@ -276,24 +239,24 @@ add_action('wp_enqueue_scripts', '{child_slug}_enqueue_styles');
             if os.path.exists(parent_index):
                 shutil.copy2(parent_index, os.path.join(child_theme_dir, 'index.php'))
             
-            print(f"Child theme '{child_name}' created successfully!")
-            print(f"Directory: {child_theme_dir}")
+            self.log(f"Child theme '{child_name}' created successfully!")
+            self.log(f"Directory: {child_theme_dir}")
             
             return True
             
         except Exception as e:
-            print(f"Failed to create child theme: {e}")
+            self.log(f"Failed to create child theme: {e}")
             return False
     
     def customize_theme_file(self, theme_name: str, file_path: str, content: str, backup: bool = True) -> bool:
         """Customize a theme file"""
-        print(f"Customizing {file_path} in theme '{theme_name}'...")
+        self.log(f"Customizing {file_path} in theme '{theme_name}'...")
         
         theme_dir = os.path.join(self.themes_dir, theme_name)
         full_file_path = os.path.join(theme_dir, file_path)
         
         if not os.path.exists(full_file_path):
-            print(f"File not found: {full_file_path}")
+            self.log(f"File not found: {full_file_path}")
             return False
         
         try:
@@ -301,111 +264,111 @@ add_action('wp_enqueue_scripts', '{child_slug}_enqueue_styles');
             if backup:
                 backup_path = f"{full_file_path}.backup.{int(datetime.now().timestamp())}"
                 shutil.copy2(full_file_path, backup_path)
-                print(f"Backup created: {backup_path}")
+                self.log(f"Backup created: {backup_path}")
             
             # Write new content
             with open(full_file_path, 'w') as f:
                 f.write(content)
             
-            print(f"File '{file_path}' customized successfully!")
+            self.log(f"File '{file_path}' customized successfully!")
             return True
             
         except Exception as e:
-            print(f"Failed to customize file: {e}")
+            self.log(f"Failed to customize file: {e}")
             return False
     
     def get_theme_customizations(self, theme_name: str) -> Dict[str, Any]:
         """Get theme customizations from customizer"""
-        print(f"Getting customizations for theme '{theme_name}'...")
+        self.log(f"Getting customizations for theme '{theme_name}'...")
         
-        success, output, error = self.run_wp_cli(f"theme get {theme_name} --format=json")
+        success, output, error = self.run_wp_cli(['theme', 'get', theme_name, '--format=json'])
         
         if not success:
-            print(f"Failed to get theme customizations: {error}")
+            self.log(f"Failed to get theme customizations: {error}")
             return {}
         
         try:
             customizations = json.loads(output)
             return customizations
         except json.JSONDecodeError:
-            print("Failed to parse customizations")
+            self.log("Failed to parse customizations")
             return {}
     
     def set_theme_mod(self, key: str, value: str) -> bool:
         """Set a theme modification"""
-        print(f"Setting theme mod '{key}' to '{value}'...")
+        self.log(f"Setting theme mod '{key}' to '{value}'...")
         
-        success, output, error = self.run_wp_cli(f"theme mod set {key} '{value}'")
+        success, output, error = self.run_wp_cli(['theme', 'mod', 'set', key, value])
         
         if success:
-            print(f"Theme mod '{key}' set successfully!")
+            self.log(f"Theme mod '{key}' set successfully!")
         else:
-            print(f"Failed to set theme mod '{key}': {error}")
+            self.log(f"Failed to set theme mod '{key}': {error}")
         
         return success
     
     def get_theme_mod(self, key: str) -> Optional[str]:
         """Get a theme modification"""
-        print(f"Getting theme mod '{key}'...")
+        self.log(f"Getting theme mod '{key}'...")
         
-        success, output, error = self.run_wp_cli(f"theme mod get {key}")
+        success, output, error = self.run_wp_cli(['theme', 'mod', 'get', key])
         
         if success:
             return output.strip()
         else:
-            print(f"Failed to get theme mod '{key}': {error}")
+            self.log(f"Failed to get theme mod '{key}': {error}")
             return None
     
     def list_theme_mods(self) -> Dict[str, str]:
         """List all theme modifications"""
-        print("Listing theme modifications...")
+        self.log("Listing theme modifications...")
         
         success, output, error = self.run_wp_cli("theme mod list --format=json")
         
         if not success:
-            print(f"Failed to list theme mods: {error}")
+            self.log(f"Failed to list theme mods: {error}")
             return {}
         
         try:
             mods = json.loads(output)
             return mods
         except json.JSONDecodeError:
-            print("Failed to parse theme mods")
+            self.log("Failed to parse theme mods")
             return {}
     
     def install_from_zip(self, zip_path: str) -> bool:
         """Install a theme from a ZIP file"""
-        print(f"Installing theme from ZIP: {zip_path}")
+        self.log(f"Installing theme from ZIP: {zip_path}")
         
         if not os.path.exists(zip_path):
-            print(f"ZIP file not found: {zip_path}")
+            self.log(f"ZIP file not found: {zip_path}")
             return False
         
-        success, output, error = self.run_wp_cli(f"theme install {zip_path}")
+        success, output, error = self.run_wp_cli(['theme', 'install', zip_path])
         
         if success:
-            print("Theme installed from ZIP successfully!")
+            self.log("Theme installed from ZIP successfully!")
         else:
-            print(f"Failed to install theme from ZIP: {error}")
+            self.log(f"Failed to install theme from ZIP: {error}")
         
         return success
     
     def install_from_url(self, url: str) -> bool:
         """Install a theme from a URL"""
-        print(f"Installing theme from URL: {url}")
+        self.log(f"Installing theme from URL: {url}")
         
-        success, output, error = self.run_wp_cli(f"theme install {url}")
+        success, output, error = self.run_wp_cli(['theme', 'install', url])
         
         if success:
-            print("Theme installed from URL successfully!")
+            self.log("Theme installed from URL successfully!")
         else:
-            print(f"Failed to install theme from URL: {error}")
+            self.log(f"Failed to install theme from URL: {error}")
         
         return success
     
     def export_theme_config(self, theme_name: str, output_file: str) -> bool:
         """Export theme configuration"""
-        print(f"Exporting theme configuration for '{theme_name}'...")
+        self.log(f"Exporting theme configuration for '{theme_name}'...")
         
         try:
             # Get theme info
@@ -413,7 +376,7 @@ add_action('wp_enqueue_scripts', '{child_slug}_enqueue_styles');
             theme_info = next((t for t in themes if t['name'] == theme_name), None)
             
             if not theme_info:
-                print(f"Theme '{theme_name}' not found")
+                self.log(f"Theme '{theme_name}' not found")
                 return False
             
             # Get theme mods
@@ -433,42 +396,71 @@ add_action('wp_enqueue_scripts', '{child_slug}_enqueue_styles');
             with open(output_file, 'w') as f:
                 json.dump(config, f, indent=2)
             
-            print(f"Theme configuration exported to: {output_file}")
+            self.log(f"Theme configuration exported to: {output_file}")
             return True
             
         except Exception as e:
-            print(f"Failed to export theme configuration: {e}")
+            self.log(f"Failed to export theme configuration: {e}")
             return False
     
     def import_theme_config(self, config_file: str) -> bool:
         """Import theme configuration"""
-        print(f"Importing theme configuration from: {config_file}")
+        self.log(f"Importing theme configuration from: {config_file}")
         
         if not os.path.exists(config_file):
-            print(f"Configuration file not found: {config_file}")
+            self.log(f"Configuration file not found: {config_file}")
             return False
         
         try:
             with open(config_file, 'r') as f:
                 config = json.load(f)
             
-            # Activate theme if specified
+            # Activation and every theme mod share one WP-CLI bootstrap;
+            # a failed activation stops the batch before any mods are applied
+            commands = []
+            required = 0
             if 'theme_name' in config:
-                if not self.activate_theme(config['theme_name']):
-                    print(f"Failed to activate theme: {config['theme_name']}")
+                theme_arg = quote_arg(config['theme_name'])
+                if theme_arg is None:
+                    if not self.activate_theme(config['theme_name']):
+                        self.log(f"Failed to activate theme: {config['theme_name']}")
+                        return False
+                else:
+                    commands.append(f"theme activate {theme_arg}")
+                    required = 1
+            
+            unbatched = {}
+            mod_keys = []
+            for key, value in config.get('theme_mods', {}).items():
+                key_arg, value_arg = quote_arg(str(key)), quote_arg(str(value))
+                if key_arg is None or value_arg is None:
+                    unbatched[key] = str(value)
+                else:
+                    commands.append(f"theme mod set {key_arg} {value_arg}")
+                    mod_keys.append(key)
+            
+            results = self.run_wp_cli_batch(commands, required)
+            if required:
+                success, output, error = results.pop(0)
+                if not success:
+                    self.log(f"Failed to activate theme '{config['theme_name']}': {error}")
                     return False
+                self.log(f"Theme '{config['theme_name']}' activated successfully!")
             
             # Apply theme mods
-            if 'theme_mods' in config:
-                for key, value in config['theme_mods'].items():
-                    if not self.set_theme_mod(key, str(value)):
-                        print(f"Failed to set theme mod: {key}")
+            for key, (success, output, error) in zip(mod_keys, results):
+                if not success:
+                    self.log(f"Failed to set theme mod: {key}")
+            for key, value in unbatched.items():
+                if not self.set_theme_mod(key, value):
+                    self.log(f"Failed to set theme mod: {key}")
+            self.log(f"Processed {len(mod_keys) + len(unbatched)} theme mods")
             
-            print("Theme configuration imported successfully!")
+            self.log("Theme configuration imported successfully!")
             return True
             
         except Exception as e:
-            print(f"Failed to import theme configuration: {e}")
+            self.log(f"Failed to import theme configuration: {e}")
             return False
     
     def create_custom_css(self, css_content: str, output_file: str = None) -> bool:
@@ -476,22 +468,22 @@ add_action('wp_enqueue_scripts', '{child_slug}_enqueue_styles');
         if not output_file:
             output_file = os.path.join(self.wp_path, 'wp-content', 'custom.css')
         
-        print(f"Creating custom CSS file: {output_file}")
+        self.log(f"Creating custom CSS file: {output_file}")
         
         try:
             with open(output_file, 'w') as f:
                 f.write(css_content)
             
-            print("Custom CSS file created successfully!")
+            self.log("Custom CSS file created successfully!")
             return True
             
         except Exception as e:
-            print(f"Failed to create custom CSS: {e}")
+            self.log(f"Failed to create custom CSS: {e}")
             return False
     
     def get_theme_health(self) -> Dict[str, Any]:
         """Get theme health information"""
-        print("Checking theme health...")
+        self.log("Checking theme health...")
         
         all_themes = self.list_themes('all')
         active_theme = self.get_current_theme()
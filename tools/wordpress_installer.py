@@ -13,14 +13,21 @@ import tempfile
 import json
 import sqlite3
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple, Callable, Union
 import argparse
 
+try:
+    from tools.wp_cli import detect_wp_cli, is_cancelled, report_progress, run_command
+except ImportError:  # running as a script from inside tools/
+    from wp_cli import detect_wp_cli, is_cancelled, report_progress, run_command
+
 class WordPressInstaller:
     """WordPress installation and configuration tool"""
     
-    def __init__(self):
+    def __init__(self, log: Callable[[str], None] = print):
+        self.log = log
         self.wp_cli_path = None
+        self.wp_cli_info = None
         self.wordpress_version = "latest"
         self.default_config = {
             'db_host': 'localhost',
@@ -35,59 +42,51 @@ class WordPressInstaller:
             'site_title': 'My WordPress Site'
         }
     
-    def check_wp_cli(self) -> bool:
-        """Check if WP-CLI is installed and available"""
-        try:
-            result = subprocess.run(['wp', '--version'], 
-                                  capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                self.wp_cli_path = 'wp'
-                return True
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            pass
-        
-        # Check for local wp-cli.phar
-        if os.path.exists('wp-cli.phar'):
-            try:
-                result = subprocess.run(['php', 'wp-cli.phar', '--version'], 
-                                      capture_output=True, text=True, timeout=10)
-                if result.returncode == 0:
-                    self.wp_cli_path = 'php wp-cli.phar'
-                    return True
-            except (subprocess.TimeoutExpired, FileNotFoundError):
-                pass
-        
-        return False
+    def check_wp_cli(self, target_dir: str) -> bool:
+        """Check if WP-CLI is available for ``target_dir`` (probed once per process, see wp_cli.detect_wp_cli)"""
+        info = detect_wp_cli(target_dir)
+        if info is None:
+            return False
+        self.wp_cli_path = info.command
+        self.wp_cli_info = info
+        return True
     
-    def install_wp_cli(self) -> bool:
-        """Install WP-CLI if not available"""
-        print("Installing WP-CLI...")
+    def install_wp_cli(self, target_dir: str) -> bool:
+        """Install WP-CLI as wp-cli.phar in ``target_dir`` if not available"""
+        self.log("Installing WP-CLI...")
+        phar_path = os.path.join(target_dir, 'wp-cli.phar')
         try:
             # Download WP-CLI
             response = requests.get('https://raw.githubusercontent.com/wp-cli/wp-cli/gh-pages/phar/wp-cli.phar')
             response.raise_for_status()
             
-            with open('wp-cli.phar', 'wb') as f:
+            with open(phar_path, 'wb') as f:
                 f.write(response.content)
             
             # Make it executable
-            os.chmod('wp-cli.phar', 0o755)
+            os.chmod(phar_path, 0o755)
             
             # Test installation
-            result = subprocess.run(['php', 'wp-cli.phar', '--version'], 
+            result = subprocess.run(['php', phar_path, '--version'], 
                                   capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                self.wp_cli_path = 'php wp-cli.phar'
-                print("WP-CLI installed successfully!")
+            if result.returncode == 0 and self.check_wp_cli(target_dir):
+                self.log("WP-CLI installed successfully!")
                 return True
         except Exception as e:
-            print(f"Failed to install WP-CLI: {e}")
+            self.log(f"Failed to install WP-CLI: {e}")
         
         return False
     
+    def run_wp_cli(self, command: Union[str, List[str]], cwd: str) -> Tuple[bool, str, str]:
+        """Run WP-CLI command in ``cwd`` without changing the process working directory"""
+        if self.wp_cli_info is None and not self.check_wp_cli(cwd):
+            return False, "", "WP-CLI not available"
+        
+        return run_command(self.wp_cli_info, command, cwd)
+    
     def download_wordpress(self, target_dir: str, version: str = "latest") -> bool:
         """Download WordPress to target directory"""
-        print(f"Downloading WordPress {version}...")
+        self.log(f"Downloading WordPress {version}...")
         
         try:
             if version == "latest":
@@ -101,9 +100,17 @@ class WordPressInstaller:
             
             # Create temporary file
             with tempfile.NamedTemporaryFile(delete=False, suffix='.zip') as tmp_file:
+                tmp_file_path = tmp_file.name
                 for chunk in response.iter_content(chunk_size=8192):
+                    if is_cancelled():
+                        break
                     tmp_file.write(chunk)
-                tmp_file_path = tmp_file.name
+                    report_progress('bytes_downloaded', len(chunk))
+            
+            if is_cancelled():
+                os.unlink(tmp_file_path)
+                self.log("WordPress download cancelled")
+                return False
             
             # Extract WordPress
             with zipfile.ZipFile(tmp_file_path, 'r') as zip_ref:
@@ -131,16 +138,16 @@ class WordPressInstaller:
             # Clean up
             os.unlink(tmp_file_path)
             
-            print("WordPress downloaded successfully!")
+            self.log("WordPress downloaded successfully!")
             return True
             
         except Exception as e:
-            print(f"Failed to download WordPress: {e}")
+            self.log(f"Failed to download WordPress: {e}")
             return False
     
     def create_wp_config(self, config: Dict[str, str], target_dir: str) -> bool:
         """Create wp-config.php file"""
-        print("Creating wp-config.php...")
+        self.log("Creating wp-config.php...")
         
         try:
             config_content = f"""<?php
@@ -189,11 +196,11 @@ require_once ABSPATH . 'wp-settings.php';
             with open(config_path, 'w') as f:
                 f.write(config_content)
             
-            print("wp-config.php created successfully!")
+            self.log("wp-config.php created successfully!")
             return True
             
         except Exception as e:
-            print(f"Failed to create wp-config.php: {e}")
+            self.log(f"Failed to create wp-config.php: {e}")
             return False
     
     def generate_salt(self) -> str:
@@ -206,105 +213,96 @@ require_once ABSPATH . 'wp-settings.php';
     
     def install_wordpress(self, config: Dict[str, str], target_dir: str) -> bool:
         """Install WordPress using WP-CLI"""
-        if not self.check_wp_cli():
-            if not self.install_wp_cli():
-                print("WP-CLI is required for WordPress installation")
+        if not self.check_wp_cli(target_dir):
+            if not self.install_wp_cli(target_dir):
+                self.log("WP-CLI is required for WordPress installation")
                 return False
         
-        print("Installing WordPress...")
+        self.log("Installing WordPress...")
         
         try:
-            # Change to target directory
-            original_dir = os.getcwd()
-            os.chdir(target_dir)
-            
             # Install WordPress
-            cmd = f"{self.wp_cli_path} core install --url={config['site_url']} " \
-                  f"--title='{config['site_title']}' " \
-                  f"--admin_user={config['admin_user']} " \
-                  f"--admin_password={config['admin_pass']} " \
-                  f"--admin_email={config['admin_email']} " \
-                  f"--skip-email"
-            
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                print("WordPress installed successfully!")
-                print(f"Admin URL: {config['site_url']}/wp-admin/")
-                print(f"Admin Username: {config['admin_user']}")
-                print(f"Admin Password: {config['admin_pass']}")
+            cmd = ['core', 'install',
+                   f"--url={config['site_url']}",
+                   f"--title={config['site_title']}",
+                   f"--admin_user={config['admin_user']}",
+                   f"--admin_password={config['admin_pass']}",
+                   f"--admin_email={config['admin_email']}",
+                   '--skip-email']
+            
+            success, output, error = self.run_wp_cli(cmd, target_dir)
+            
+            if success:
+                self.log("WordPress installed successfully!")
+                self.log(f"Admin URL: {config['site_url']}/wp-admin/")
+                self.log(f"Admin Username: {config['admin_user']}")
+                self.log(f"Admin Password: {config['admin_pass']}")
                 return True
             else:
-                print(f"WordPress installation failed: {result.stderr}")
+                self.log(f"WordPress installation failed: {error}")
                 return False
                 
         except Exception as e:
-            print(f"Failed to install WordPress: {e}")
+            self.log(f"Failed to install WordPress: {e}")
             return False
-        finally:
-            os.chdir(original_dir)
     
     def install_plugins(self, plugins: List[str], target_dir: str) -> bool:
         """Install WordPress plugins"""
         if not self.wp_cli_path:
-            print("WP-CLI is required for plugin installation")
+            self.log("WP-CLI is required for plugin installation")
             return False
         
-        print(f"Installing plugins: {', '.join(plugins)}")
+        self.log(f"Installing plugins: {', '.join(plugins)}")
         
         try:
-            original_dir = os.getcwd()
-            os.chdir(target_dir)
-            
             for plugin in plugins:
-                cmd = f"{self.wp_cli_path} plugin install {plugin} --activate"
-                result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+                if is_cancelled():
+                    self.log("Plugin installation cancelled")
+                    return False
+                success, output, error = self.run_wp_cli(['plugin', 'install', plugin, '--activate'], target_dir)
                 
-                if result.returncode == 0:
-                    print(f"Plugin '{plugin}' installed successfully!")
+                if success:
+                    report_progress('plugins_installed')
+                    self.log(f"Plugin '{plugin}' installed successfully!")
                 else:
-                    print(f"Failed to install plugin '{plugin}': {result.stderr}")
+                    self.log(f"Failed to install plugin '{plugin}': {error}")
             
             return True
             
         except Exception as e:
-            print(f"Failed to install plugins: {e}")
+            self.log(f"Failed to install plugins: {e}")
             return False
-        finally:
-            os.chdir(original_dir)
     
     def install_themes(self, themes: List[str], target_dir: str) -> bool:
         """Install WordPress themes"""
         if not self.wp_cli_path:
-            print("WP-CLI is required for theme installation")
+            self.log("WP-CLI is required for theme installation")
             return False
         
-        print(f"Installing themes: {', '.join(themes)}")
+        self.log(f"Installing themes: {', '.join(themes)}")
         
         try:
-            original_dir = os.getcwd()
-            os.chdir(target_dir)
-            
             for theme in themes:
-                cmd = f"{self.wp_cli_path} theme install {theme}"
-                result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+                if is_cancelled():
+                    self.log("Theme installation cancelled")
+                    return False
+                success, output, error = self.run_wp_cli(['theme', 'install', theme], target_dir)
                 
-                if result.returncode == 0:
-                    print(f"Theme '{theme}' installed successfully!")
+                if success:
+                    report_progress('themes_installed')
+                    self.log(f"Theme '{theme}' installed successfully!")
                 else:
-                    print(f"Failed to install theme '{theme}': {result.stderr}")
+                    self.log(f"Failed to install theme '{theme}': {error}")
             
             return True
             
         except Exception as e:
-            print(f"Failed to install themes: {e}")
+            self.log(f"Failed to install themes: {e}")
             return False
-        finally:
-            os.chdir(original_dir)
     
     def setup_database(self, config: Dict[str, str]) -> bool:
         """Setup database for WordPress"""
-        print("Setting up database...")
+        self.log("Setting up database...")
         
         try:
             if config['db_host'] == 'localhost' and not config['db_pass']:
@@ -315,12 +313,12 @@ require_once ABSPATH . 'wp-settings.php';
                 return self.setup_mysql_database(config)
                 
         except Exception as e:
-            print(f"Failed to setup database: {e}")
+            self.log(f"Failed to setup database: {e}")
             return False
     
     def setup_sqlite_database(self, config: Dict[str, str]) -> bool:
         """Setup SQLite database for local development"""
-        print("Setting up SQLite database...")
+        self.log("Setting up SQLite database...")
         
         try:
             db_path = f"{config['db_name']}.db"
@@ -332,16 +330,16 @@ require_once ABSPATH . 'wp-settings.php';
             # Update config for SQLite
             config['db_host'] = f"localhost:{db_path}"
             
-            print("SQLite database created successfully!")
+            self.log("SQLite database created successfully!")
             return True
             
         except Exception as e:
-            print(f"Failed to create SQLite database: {e}")
+            self.log(f"Failed to create SQLite database: {e}")
             return False
     
     def setup_mysql_database(self, config: Dict[str, str]) -> bool:
         """Setup MySQL database"""
-        print("Setting up MySQL database...")
+        self.log("Setting up MySQL database...")
         
         try:
             import mysql.connector
@@ -361,15 +359,15 @@ require_once ABSPATH . 'wp-settings.php';
             cursor.close()
             conn.close()
             
-            print("MySQL database created successfully!")
+            self.log("MySQL database created successfully!")
             return True
             
         except ImportError:
-            print("mysql-connector-python is required for MySQL support")
-            print("Install it with: pip install mysql-connector-python")
+            self.log("mysql-connector-python is required for MySQL support")
+            self.log("Install it with: pip install mysql-connector-python")
             return False
         except Exception as e:
-            print(f"Failed to create MySQL database: {e}")
+            self.log(f"Failed to create MySQL database: {e}")
             return False
     
     def full_install(self, target_dir: str, config: Optional[Dict[str, str]] = None, 
@@ -384,8 +382,8 @@ require_once ABSPATH . 'wp-settings.php';
         if themes is None:
             themes = ['twentytwentythree']
         
-        print("Starting WordPress installation...")
-        print(f"Target directory: {target_dir}")
+        self.log("Starting WordPress installation...")
+        self.log(f"Target directory: {target_dir}")
         
         # Create target directory
         os.makedirs(target_dir, exist_ok=True)
@@ -409,18 +407,22 @@ require_once ABSPATH . 'wp-settings.php';
         # Install plugins
         if plugins:
             if not self.install_plugins(plugins, target_dir):
-                print("Plugin installation failed, but WordPress is installed")
+                self.log("Plugin installation failed, but WordPress is installed")
+            if is_cancelled():
+                return False
         
         # Install themes
         if themes:
             if not self.install_themes(themes, target_dir):
-                print("Theme installation failed, but WordPress is installed")
+                self.log("Theme installation failed, but WordPress is installed")
+            if is_cancelled():
+                return False
         
-        print("\n🎉 WordPress installation completed successfully!")
-        print(f"Site URL: {config['site_url']}")
-        print(f"Admin URL: {config['site_url']}/wp-admin/")
-        print(f"Admin Username: {config['admin_user']}")
-        print(f"Admin Password: {config['admin_pass']}")
+        self.log("\n🎉 WordPress installation completed successfully!")
+        self.log(f"Site URL: {config['site_url']}")
+        self.log(f"Admin URL: {config['site_url']}/wp-admin/")
+        self.log(f"Admin Username: {config['admin_user']}")
+        self.log(f"Admin Password: {config['admin_pass']}")
         
         return True
 
@@ -0,0 +1,394 @@
+"""
+WP-CLI Discovery, Execution and Batching
+Locates WP-CLI once per process and WordPress path and remembers the result,
+runs commands under an optional per-thread deadline/cancellation scope that
+also collects progress counters, and
+runs groups of WP-CLI commands inside a single WordPress bootstrap
+"""
+
+import os
+import re
+import json
+import base64
+import shlex
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import IO, Dict, List, Optional, Tuple, Union
+
+class WPCLIInfo:
+    """Resolved WP-CLI binary and the versions it reported"""
+    __slots__ = ('argv', 'binary', 'mtime_ns', 'available', 'wp_cli_version', 'php_version')
+
+    def __init__(self, argv: List[str], binary: str, mtime_ns: int, available: bool,
+                 wp_cli_version: Optional[str] = None, php_version: Optional[str] = None):
+        self.argv = argv
+        self.binary = binary
+        self.mtime_ns = mtime_ns
+        self.available = available
+        self.wp_cli_version = wp_cli_version
+        self.php_version = php_version
+
+    @property
+    def command(self) -> str:
+        """Shell-quoted command prefix"""
+        return ' '.join(shlex.quote(part) for part in self.argv)
+
+    def to_dict(self) -> Dict[str, Optional[str]]:
+        return {
+            'command': self.command,
+            'binary': self.binary,
+            'wp_cli_version': self.wp_cli_version,
+            'php_version': self.php_version,
+        }
+
+_cache: Dict[str, WPCLIInfo] = {}
+_lock = threading.Lock()
+
+def _locate(wp_path: str) -> Optional[List[str]]:
+    """Find WP-CLI on PATH, falling back to a wp-cli.phar in the WordPress directory"""
+    wp_binary = shutil.which('wp')
+    if wp_binary:
+        return [wp_binary]
+
+    phar_path = os.path.join(wp_path, 'wp-cli.phar')
+    if os.path.exists(phar_path):
+        return ['php', phar_path]
+
+    return None
+
+def _probe(argv: List[str], binary: str, mtime_ns: int) -> WPCLIInfo:
+    """Run WP-CLI once to confirm it works and record its versions"""
+    try:
+        result = subprocess.run(argv + ['cli', 'info', '--format=json'],
+                                capture_output=True, text=True, timeout=10)
+        if result.returncode == 0:
+            try:
+                info = json.loads(result.stdout)
+                return WPCLIInfo(argv, binary, mtime_ns, True,
+                                 info.get('wp_cli_version'), info.get('php_version'))
+            except (ValueError, AttributeError):
+                pass
+
+        # Older WP-CLI releases may not support `cli info --format=json`
+        result = subprocess.run(argv + ['--version'], capture_output=True, text=True, timeout=10)
+        if result.returncode == 0:
+            version = result.stdout.strip().replace('WP-CLI', '').strip() or None
+            return WPCLIInfo(argv, binary, mtime_ns, True, version)
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        pass
+
+    return WPCLIInfo(argv, binary, mtime_ns, False)
+
+def detect_wp_cli(wp_path: Optional[str] = None) -> Optional[WPCLIInfo]:
+    """
+    Return WP-CLI details for ``wp_path``, or None if WP-CLI is unavailable.
+
+    The probe runs once per process and WordPress path; later calls only
+    stat() the binary and probe again if its mtime changed. Failed probes
+    are remembered the same way, so a broken binary is not retried on
+    every command.
+    """
+    key = os.path.abspath(wp_path or os.getcwd())
+
+    cached = _cache.get(key)
+    if cached is not None:
+        try:
+            if os.stat(cached.binary).st_mtime_ns == cached.mtime_ns:
+                return cached if cached.available else None
+        except OSError:
+            pass
+
+    with _lock:
+        argv = _locate(key)
+        if argv is None:
+            _cache.pop(key, None)
+            return None
+
+        binary = argv[-1]
+        try:
+            mtime_ns = os.stat(binary).st_mtime_ns
+        except OSError:
+            return None
+
+        cached = _cache.get(key)
+        if cached is None or cached.binary != binary or cached.mtime_ns != mtime_ns:
+            cached = _cache[key] = _probe(argv, binary, mtime_ns)
+
+        return cached if cached.available else None
+
+def clear_cache():
+    """Forget all WP-CLI probe results"""
+    with _lock:
+        _cache.clear()
+
+def run_command(info: WPCLIInfo, command: Union[str, List[str]], cwd: str,
+                timeout: Optional[float] = None) -> Tuple[bool, str, str]:
+    """
+    Run one WP-CLI command in ``cwd`` and return ``(success, stdout, stderr)``.
+
+    ``command`` is either an argument list, passed through untouched, or a
+    string split with shell rules. No shell is involved and the process
+    working directory is never changed, so this is safe to call from
+    several threads at once.
+    """
+    args = shlex.split(command) if isinstance(command, str) else list(command)
+    try:
+        returncode, stdout, stderr = _communicate(info.argv + args, cwd, timeout)
+    except subprocess.TimeoutExpired:
+        return False, '', 'WP-CLI command cancelled or timed out'
+    except (OSError, ValueError) as e:
+        return False, '', str(e)
+    return returncode == 0, stdout, stderr
+
+class ExecutionScope:
+    """
+    Deadline and cancellation flag shared by every WP-CLI process started
+    from one thread while the scope is active. ``cancel()`` may be called
+    from any thread and kills the processes that are still running.
+    Long-running tool code reports progress counters into the scope with
+    ``report_progress()`` and polls ``is_cancelled()`` between steps.
+    """
+    __slots__ = ('deadline', 'cancelled', 'counters', '_processes', '_lock')
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.deadline = time.monotonic() + timeout if timeout else None
+        self.cancelled = threading.Event()
+        self.counters: Dict[str, int] = {}
+        self._processes = set()
+        self._lock = threading.Lock()
+
+    def remaining(self, timeout: Optional[float] = None) -> Optional[float]:
+        """Smaller of ``timeout`` and the time left before the deadline"""
+        if self.deadline is None:
+            return timeout
+        left = max(self.deadline - time.monotonic(), 0.0)
+        return left if timeout is None else min(timeout, left)
+
+    def cancel(self):
+        self.cancelled.set()
+        with self._lock:
+            processes = list(self._processes)
+        for process in processes:
+            try:
+                process.kill()
+            except OSError:
+                pass
+
+    def expired(self) -> bool:
+        return self.cancelled.is_set() or self.remaining() == 0
+
+    def progress(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def register(self, process: subprocess.Popen):
+        with self._lock:
+            self._processes.add(process)
+        if self.cancelled.is_set():
+            process.kill()
+
+    def unregister(self, process: subprocess.Popen):
+        with self._lock:
+            self._processes.discard(process)
+
+_local = threading.local()
+
+@contextmanager
+def execution_scope(scope: ExecutionScope):
+    """Apply ``scope`` to WP-CLI commands run from the current thread"""
+    previous = getattr(_local, 'scope', None)
+    _local.scope = scope
+    try:
+        yield scope
+    finally:
+        _local.scope = previous
+
+def report_progress(name: str, amount: int = 1):
+    """Add ``amount`` to a progress counter of the current thread's scope, if any"""
+    scope = getattr(_local, 'scope', None)
+    if scope is not None:
+        scope.progress(name, amount)
+
+def is_cancelled() -> bool:
+    """True if the current thread's scope was cancelled or ran past its deadline"""
+    scope = getattr(_local, 'scope', None)
+    return scope is not None and scope.expired()
+
+def _communicate(argv: List[str], cwd: Optional[str], timeout: Optional[float],
+                 stdin: Optional[IO] = None, stdout: Optional[IO] = None) -> Tuple[int, str, str]:
+    """
+    subprocess.run() equivalent that honours the thread's ExecutionScope.
+    ``stdin``/``stdout`` may be open files; stdout is captured otherwise.
+    """
+    scope = getattr(_local, 'scope', None)
+    if scope is not None:
+        if scope.cancelled.is_set():
+            raise subprocess.TimeoutExpired(argv, 0)
+        timeout = scope.remaining(timeout)
+
+    process = subprocess.Popen(argv, cwd=cwd, stdin=stdin,
+                               stdout=subprocess.PIPE if stdout is None else stdout,
+                               stderr=subprocess.PIPE, text=True)
+    if scope is not None:
+        scope.register(process)
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.communicate()
+        raise
+    finally:
+        if scope is not None:
+            scope.unregister(process)
+
+    if scope is not None and scope.cancelled.is_set():
+        raise subprocess.TimeoutExpired(argv, 0)
+    return process.returncode, stdout or '', stderr
+
+def run_external(argv: List[str], stdin: Optional[IO] = None, stdout: Optional[IO] = None,
+                 timeout: Optional[float] = None) -> Tuple[bool, str]:
+    """
+    Run a non-WP-CLI program such as mysqldump under the thread's
+    ExecutionScope, so cancelling a job or reaching its deadline kills it.
+    Returns ``(success, stderr)``.
+    """
+    try:
+        returncode, _, stderr = _communicate(argv, None, timeout, stdin, stdout)
+    except subprocess.TimeoutExpired:
+        return False, f'{argv[0]} cancelled or timed out'
+    return returncode == 0, stderr
+
+def count_dump_tables(dump_path: str) -> int:
+    """Number of CREATE TABLE statements in a SQL dump such as ``wp db export`` writes"""
+    count = 0
+    try:
+        with open(dump_path, 'rb') as dump:
+            for line in dump:
+                if line.startswith(b'CREATE TABLE'):
+                    count += 1
+    except OSError:
+        pass
+    return count
+
+# Printed before the JSON results so stray output from plugins can be skipped
+BATCH_MARKER = '__WP_CLI_BATCH_RESULTS__'
+
+# Runs each command through WP_CLI::runcommand() without relaunching PHP.
+# Once one of the first `required` commands fails the rest are skipped.
+_BATCH_SCRIPT = r"""<?php
+$batch = json_decode( base64_decode( '%s' ), true );
+$results = array();
+foreach ( $batch['commands'] as $index => $command ) {
+	$result = WP_CLI::runcommand( $command, array(
+		'return'     => 'all',
+		'launch'     => false,
+		'exit_error' => false,
+	) );
+	$results[] = array( $result->return_code, $result->stdout, $result->stderr );
+	if ( $result->return_code !== 0 && $index < $batch['required'] ) {
+		break;
+	}
+}
+echo "\n" . '%s' . json_encode( $results );
+"""
+
+_PLAIN_ARG_RE = re.compile(r'^[\w.,:/@%+=-]+$')
+
+def quote_arg(value: str) -> Optional[str]:
+    """
+    Quote a value for a WP-CLI command string, or return None if WP-CLI's
+    own argument parser cannot represent it (both quote kinds, or a
+    trailing backslash). Callers should run such commands individually.
+    """
+    if _PLAIN_ARG_RE.match(value):
+        return value
+    if value.endswith('\\'):
+        return None
+    if "'" not in value:
+        return f"'{value}'"
+    if '"' not in value:
+        return f'"{value}"'
+    return None
+
+def run_batch(info: WPCLIInfo, commands: List[str], cwd: str, required: int = 0,
+              timeout: Optional[float] = None) -> Optional[List[Tuple[bool, str, str]]]:
+    """
+    Run WP-CLI commands (without the leading ``wp``) through one generated
+    ``wp eval-file`` script, so WordPress is bootstrapped once for the
+    whole group. Returns one ``(success, stdout, stderr)`` tuple per
+    command, or None if the batch script itself could not run and the
+    caller should fall back to one process per command.
+    """
+    if not commands:
+        return []
+
+    payload = base64.b64encode(json.dumps({'commands': commands, 'required': required}).encode()).decode()
+    with tempfile.NamedTemporaryFile('w', suffix='.php', delete=False) as script:
+        script.write(_BATCH_SCRIPT % (payload, BATCH_MARKER))
+        script_path = script.name
+
+    try:
+        _, stdout, _ = _communicate(info.argv + ['eval-file', script_path], cwd, timeout)
+    except subprocess.TimeoutExpired:
+        scope = getattr(_local, 'scope', None)
+        if scope is not None and scope.expired():
+            return [(False, '', 'WP-CLI command cancelled or timed out')] * len(commands)
+        return None
+    except OSError:
+        return None
+    finally:
+        os.unlink(script_path)
+
+    _, marker, payload = stdout.rpartition(BATCH_MARKER)
+    if not marker:
+        return None
+    try:
+        rows = json.loads(payload)
+    except ValueError:
+        return None
+
+    results = [(code == 0, stdout, stderr) for code, stdout, stderr in rows]
+    skipped = (False, '', 'Skipped after an earlier required command failed')
+    return results + [skipped] * (len(commands) - len(results))
+
+class WPCLIMixin:
+    """
+    WP-CLI helpers shared by the management tools. The class using it sets
+    ``wp_path`` (the WordPress directory), ``wp_cli_path`` and ``wp_cli_info``.
+    """
+
+    def check_wp_cli(self) -> bool:
+        """Check if WP-CLI is available (probed once per process, see detect_wp_cli)"""
+        info = detect_wp_cli(self.wp_path)
+        if info is None:
+            return False
+        self.wp_cli_path = info.command
+        self.wp_cli_info = info
+        return True
+
+    def run_wp_cli(self, command: Union[str, List[str]], cwd: Optional[str] = None) -> Tuple[bool, str, str]:
+        """Run WP-CLI command in the WordPress directory (or ``cwd``)"""
+        if not self.check_wp_cli():
+            return False, "", "WP-CLI not available"
+
+        return run_command(self.wp_cli_info, command, cwd or self.wp_path)
+
+    def run_wp_cli_batch(self, commands: List[str], required: int = 0) -> List[Tuple[bool, str, str]]:
+        """Run several WP-CLI commands with a single WordPress bootstrap"""
+        if not self.check_wp_cli():
+            return [(False, "", "WP-CLI not available")] * len(commands)
+
+        results = run_batch(self.wp_cli_info, commands, self.wp_path, required)
+        if results is None:
+            # eval-file unavailable or the batch crashed; fall back to one process per command
+            results = []
+            for index, command in enumerate(commands):
+                results.append(self.run_wp_cli(command))
+                if not results[-1][0] and index < required:
+                    results.extend([(False, "", "Skipped after an earlier required command failed")] * (len(commands) - len(results)))
+                    break
+        return results
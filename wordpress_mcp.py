@@ -42,8 +42,24 @@ DEPLOYMENT STATUS
 """
 
 from pathlib import Path
+import asyncio
+import bisect
+import hashlib
+import importlib
+import json
 import logging
+import math
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from datetime import datetime
+from typing import Optional, Dict, Any, List, Tuple, Callable
 
 from fastmcp import FastMCP
 
@@ -127,16 +143,769 @@ CURRENT_STATS = {
     ]
 }
 
-mcp = FastMCP("WordPress Development Resources")
+@asynccontextmanager
+async def server_lifespan(server):
+    """Start loading the content indexes when the server starts (see LIVENESS AND READINESS)."""
+    server_state.start_warm_up()
+    yield {}
+
+mcp = FastMCP("WordPress Development Resources", lifespan=server_lifespan)
 RESOURCES_DIR = Path(__file__).parent / "resources"
 
+# === REQUEST METRICS ===
+
+# Latency histogram bucket upper bounds, in seconds (plus an implicit +Inf bucket)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+# Distinct (kind, name) series kept; calls to further names (e.g. unknown tools) are grouped as "(other)"
+METRICS_MAX_SERIES = 1000
+
+class _Series:
+    """Counters and a fixed-bucket latency histogram for one tool, resource or prompt."""
+    __slots__ = ("count", "errors", "total", "max", "buckets", "bytes_in", "bytes_out")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-th quantile (max for the +Inf bucket)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.buckets):
+            seen += bucket_count
+            if seen >= rank:
+                return min(LATENCY_BUCKETS[index], self.max) if index < len(LATENCY_BUCKETS) else self.max
+        return self.max
+
+class RequestMetrics:
+    """
+    Per-handler call counts, error counts, payload sizes and latency
+    histograms, keyed by (kind, name) where kind is tool, resource or
+    prompt. Recording is a bisect plus a few integer updates under a lock.
+    """
+    __slots__ = ("started_at", "_series", "_lock")
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, name: str, seconds: float, error: bool = False,
+               bytes_in: int = 0, bytes_out: int = 0):
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            series = self._series.get((kind, name))
+            if series is None:
+                if len(self._series) >= METRICS_MAX_SERIES:
+                    name = "(other)"
+                series = self._series.get((kind, name))
+                if series is None:
+                    series = self._series[(kind, name)] = _Series()
+            series.count += 1
+            series.errors += error
+            series.total += seconds
+            if seconds > series.max:
+                series.max = seconds
+            series.buckets[bucket] += 1
+            series.bytes_in += bytes_in
+            series.bytes_out += bytes_out
+
+    def snapshot(self) -> List[Tuple[str, str, _Series]]:
+        """Copies of every series, sorted by kind and name."""
+        with self._lock:
+            items = []
+            for (kind, name), series in sorted(self._series.items()):
+                copy = _Series()
+                for slot in _Series.__slots__:
+                    value = getattr(series, slot)
+                    setattr(copy, slot, list(value) if isinstance(value, list) else value)
+                items.append((kind, name, copy))
+        return items
+
+    def render_markdown(self) -> str:
+        uptime = time.time() - self.started_at
+        lines = [
+            "# 📈 Server Metrics",
+            "",
+            f"**Uptime:** {uptime:.0f}s",
+            "",
+            "| Kind | Name | Calls | Errors | Avg ms | p50 ms | p95 ms | p99 ms | Max ms | Avg bytes out |",
+            "|------|------|------:|-------:|-------:|-------:|-------:|-------:|-------:|--------------:|",
+        ]
+        for kind, name, series in self.snapshot():
+            lines.append(
+                f"| {kind} | `{name}` | {series.count} | {series.errors} "
+                f"| {series.total / series.count * 1000:.2f} "
+                f"| {series.quantile(0.5) * 1000:.2f} | {series.quantile(0.95) * 1000:.2f} "
+                f"| {series.quantile(0.99) * 1000:.2f} | {series.max * 1000:.2f} "
+                f"| {series.bytes_out // series.count:,} |"
+            )
+        return "\n".join(lines) + "\n"
+
+    def render_prometheus(self) -> str:
+        def labels(kind: str, name: str, **extra: str) -> str:
+            pairs = {"kind": kind, "name": name, **extra}
+            return ",".join(
+                f'{key}="' + value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") + '"'
+                for key, value in pairs.items()
+            )
+
+        snapshot = self.snapshot()
+        out = [
+            "# HELP wordpress_mcp_request_duration_seconds Handler latency by tool, resource or prompt.",
+            "# TYPE wordpress_mcp_request_duration_seconds histogram",
+        ]
+        for kind, name, series in snapshot:
+            cumulative = 0
+            for bound, bucket_count in zip(LATENCY_BUCKETS + (float("inf"),), series.buckets):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                out.append(f"wordpress_mcp_request_duration_seconds_bucket{{{labels(kind, name, le=le)}}} {cumulative}")
+            out.append(f"wordpress_mcp_request_duration_seconds_sum{{{labels(kind, name)}}} {series.total}")
+            out.append(f"wordpress_mcp_request_duration_seconds_count{{{labels(kind, name)}}} {series.count}")
+        out += [
+            "# HELP wordpress_mcp_request_errors_total Handler calls that raised or returned an error.",
+            "# TYPE wordpress_mcp_request_errors_total counter",
+        ]
+        out += [f"wordpress_mcp_request_errors_total{{{labels(kind, name)}}} {series.errors}"
+                for kind, name, series in snapshot]
+        out += [
+            "# HELP wordpress_mcp_payload_bytes_total Request argument and response payload sizes.",
+            "# TYPE wordpress_mcp_payload_bytes_total counter",
+        ]
+        for kind, name, series in snapshot:
+            out.append(f"wordpress_mcp_payload_bytes_total{{{labels(kind, name, direction='in')}}} {series.bytes_in}")
+            out.append(f"wordpress_mcp_payload_bytes_total{{{labels(kind, name, direction='out')}}} {series.bytes_out}")
+        return "\n".join(out) + "\n"
+
+request_metrics = RequestMetrics()
+
+def _payload_size(value: Any) -> int:
+    """Approximate size of a request or response payload in characters/bytes."""
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return sum(_payload_size(item) for item in value)
+    if isinstance(value, dict):
+        return len(json.dumps(value, default=str))
+    for attr in ("content", "contents", "messages", "text", "blob"):
+        inner = getattr(value, attr, None)
+        if inner is not None:
+            return _payload_size(inner)
+    return 0
+
+try:
+    from fastmcp.server.middleware import Middleware
+except ImportError:  # FastMCP releases before middleware support
+    Middleware = None
+
+if Middleware is not None:
+    class MetricsMiddleware(Middleware):
+        """Times every tool call, resource read and prompt render."""
+
+        def __init__(self):
+            self._resources: Optional[set] = None
+            self._templates: List[Any] = []
+
+        async def _resource_series(self, uri: str) -> str:
+            """
+            Series name for a resource read: the resource URI without its
+            query and fragment, or the URI template it matched, so paging
+            cursors, anchors and unknown URIs cannot create new series.
+            """
+            if self._resources is None:
+                self._resources = {str(resource.uri) for resource in await mcp.list_resources()}
+                self._templates = list(await mcp.list_resource_templates())
+            base = uri.split("#", 1)[0].split("?", 1)[0]
+            if base in self._resources:
+                return base
+            for template in self._templates:
+                if template.matches(uri) is not None:
+                    return template.uri_template
+            return "(unknown)"
+
+        async def _measure(self, kind: str, name: str, arguments: Any, context, call_next):
+            start = time.perf_counter()
+            try:
+                result = await call_next(context)
+            except Exception:
+                request_metrics.record(kind, name, time.perf_counter() - start, True, _payload_size(arguments))
+                raise
+            request_metrics.record(kind, name, time.perf_counter() - start,
+                                   bool(getattr(result, "is_error", False)),
+                                   _payload_size(arguments), _payload_size(result))
+            return result
+
+        async def on_call_tool(self, context, call_next):
+            message = context.message
+            return await self._measure("tool", message.name, message.arguments, context, call_next)
+
+        async def on_read_resource(self, context, call_next):
+            name = await self._resource_series(str(context.message.uri))
+            return await self._measure("resource", name, None, context, call_next)
+
+        async def on_get_prompt(self, context, call_next):
+            message = context.message
+            return await self._measure("prompt", message.name, message.arguments, context, call_next)
+
+    mcp.add_middleware(MetricsMiddleware())
+else:
+    logger.warning("FastMCP middleware unavailable; request metrics are disabled")
+
+# === CONTENT BUNDLE ===
+
+CONTENT_BUNDLE_FORMAT = 1
+CONTENT_BUNDLE_MAGIC = b"WPMCPBDL"
+# Bundle built by scripts/build_bundle.py to serve from; unset or empty reads resources/ directly
+CONTENT_BUNDLE_PATH = os.getenv("WORDPRESS_MCP_CONTENT_BUNDLE", "")
+
+# magic, format, header length
+_BUNDLE_PREFIX = struct.Struct("<8sIQ")
+
+class ContentBundle:
+    """
+    Read-only, memory-mapped pack of every file under resources/.
+
+    Layout: a fixed prefix (magic, format, header length), a JSON header
+    and then the UTF-8 file bodies and the serialized search index back to
+    back. The header lists each file as ``[path, offset, length, mtime_ns,
+    hash, frontmatter]`` with offsets relative to the end of the header.
+    Bodies are decoded straight from the mapping on each read, so every
+    worker process that maps the same bundle shares its page-cache pages.
+    """
+    __slots__ = ("path", "header", "files", "_map", "_data_offset")
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, fmt, header_length = _BUNDLE_PREFIX.unpack_from(self._map, 0)
+            if magic != CONTENT_BUNDLE_MAGIC:
+                raise ValueError("not a content bundle")
+            if fmt != CONTENT_BUNDLE_FORMAT:
+                raise ValueError(f"bundle format {fmt}, expected {CONTENT_BUNDLE_FORMAT}")
+            self._data_offset = _BUNDLE_PREFIX.size + header_length
+            self.header = json.loads(self._map[_BUNDLE_PREFIX.size:self._data_offset])
+            self.files: Dict[str, list] = {entry[0]: entry for entry in self.header['files']}
+        except Exception:
+            self._map.close()
+            raise
+
+    @classmethod
+    def open(cls, path: Optional[str]) -> Optional["ContentBundle"]:
+        """Map the bundle at ``path``, or return None if it is missing or unusable."""
+        if not path or not os.path.isfile(path):
+            return None
+        try:
+            bundle = cls(path)
+        except (OSError, ValueError, KeyError, TypeError, struct.error) as e:
+            logger.warning(f"Ignoring content bundle {path}: {e}")
+            return None
+        logger.info(f"Serving resources from content bundle {path} "
+                    f"({len(bundle.files)} files, built {bundle.header.get('built_at')})")
+        return bundle
+
+    def warn_if_stale(self, root: Path) -> List[str]:
+        """Log a warning naming the files under ``root`` the bundle is missing changes for."""
+        stale = self.stale_files(root)
+        if stale:
+            logger.warning(f"Content bundle {self.path} is out of date: {len(stale)} files under {root} "
+                           f"changed since it was built ({', '.join(stale[:5])}"
+                           f"{', ...' if len(stale) > 5 else ''}); rebuild it with scripts/build_bundle.py")
+        return stale
+
+    def stale_files(self, root: Path) -> List[str]:
+        """
+        Files under ``root`` added, removed or modified since the bundle was
+        built, compared by mtime. Empty if ``root`` does not exist (a
+        deployment that ships only the bundle).
+        """
+        if not root.is_dir():
+            return []
+        on_disk = {}
+        for path in root.glob("**/*.md"):
+            try:
+                on_disk[path.relative_to(root).as_posix()] = path.stat().st_mtime_ns
+            except OSError:
+                continue
+        stale = [name for name, entry in self.files.items() if on_disk.get(name) != entry[3]]
+        stale += [name for name in on_disk if name not in self.files]
+        return sorted(stale)
+
+    def _slice(self, offset: int, length: int) -> bytes:
+        start = self._data_offset + offset
+        return self._map[start:start + length]
+
+    def read(self, relative_path: str) -> Optional[str]:
+        entry = self.files.get(relative_path)
+        if entry is None:
+            return None
+        return self._slice(entry[1], entry[2]).decode('utf-8')
+
+    def view(self, relative_path: str) -> Optional[memoryview]:
+        """Read-only view of a file's UTF-8 bytes straight from the mapping, without copying."""
+        entry = self.files.get(relative_path)
+        if entry is None:
+            return None
+        start = self._data_offset + entry[1]
+        return memoryview(self._map)[start:start + entry[2]]
+
+    def section(self, name: str) -> Optional[Dict[str, Any]]:
+        """A serialized index stored after the file bodies, or None if the bundle lacks it."""
+        location = self.header.get(name)
+        if not location:
+            return None
+        return json.loads(self._slice(*location))
+
+    def search_index(self) -> Optional[Dict[str, Any]]:
+        """The serialized search index, in the same shape as the JSON cache file."""
+        return self.section('search_index')
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "path": self.path,
+            "format": CONTENT_BUNDLE_FORMAT,
+            "server_version": self.header.get('server_version'),
+            "built_at": self.header.get('built_at'),
+            "files": len(self.files),
+            "bytes": len(self._map),
+        }
+
+def write_content_bundle(path: str) -> Dict[str, Any]:
+    """
+    Pack every resource, snippet, its parsed frontmatter and the search,
+    symbol and section indexes into a bundle at ``path``. Reads from resources/ on disk, so run
+    it in a process that is not itself serving from a bundle.
+    """
+    if content_store.bundle is not None:
+        raise RuntimeError("Cannot build a bundle while serving from one; unset WORDPRESS_MCP_CONTENT_BUNDLE")
+    metadata_registry.refresh(force=True)
+    search_index.ensure_current()
+    symbol_index.ensure_current()
+    section_index.ensure_current()
+
+    files = []
+    chunks = []
+    offset = 0
+    for record in metadata_registry.records():
+        body = content_store.get(RESOURCES_DIR / record.path).encode('utf-8')
+        files.append([record.path, offset, len(body), record.mtime_ns, record.hash, {
+            'difficulty': record.difficulty, 'tags': record.tags, 'use_case': record.use_case,
+            'related': record.related, 'has_frontmatter': record.has_frontmatter,
+        }])
+        chunks.append(body)
+        offset += len(body)
+
+    sections = {}
+    for name, serialized in (('search_index', search_index.serialize()),
+                             ('symbol_index', symbol_index.serialize()),
+                             ('section_index', section_index.serialize())):
+        data = json.dumps(serialized, separators=(',', ':')).encode('utf-8')
+        sections[name] = [offset, len(data)]
+        chunks.append(data)
+        offset += len(data)
+    header = json.dumps({
+        'format': CONTENT_BUNDLE_FORMAT,
+        'server_version': SERVER_VERSION,
+        'built_at': datetime.now().isoformat(timespec='seconds'),
+        'fingerprint': metadata_registry.fingerprint(),
+        'files': files,
+        **sections,
+    }, separators=(',', ':')).encode('utf-8')
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_BUNDLE_PREFIX.pack(CONTENT_BUNDLE_MAGIC, CONTENT_BUNDLE_FORMAT, len(header)))
+        f.write(header)
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_path, path)
+    return {"path": path, "files": len(files), "bytes": os.path.getsize(path),
+            "documents": len(search_index.documents), "terms": len(search_index.postings),
+            "symbols": len(symbol_index.symbols)}
+
+# === RESOURCE CONTENT STORE ===
+
+# How long a cached file is trusted before its mtime/size is checked again
+CONTENT_REVALIDATE_SECONDS = 5.0
+
+class _ContentEntry:
+    """Cached file content plus the stat data it was loaded from."""
+    __slots__ = ("content", "raw", "mtime_ns", "size", "checked_at")
+
+    def __init__(self, content: str, mtime_ns: int, size: int, checked_at: float):
+        self.content = content
+        # UTF-8 encoding of content, created on first byte-level access
+        self.raw: Optional[bytes] = None
+        self.mtime_ns = mtime_ns
+        self.size = size
+        self.checked_at = checked_at
+
+class ResourceContentStore:
+    """
+    Process-wide in-memory store for resource markdown files.
+
+    Each file is read once and then served from memory. An entry is
+    re-checked against the file's mtime and size at most once every
+    ``revalidate_interval`` seconds, so edits on disk are still picked up
+    without a stat() on every request. With a ContentBundle every read is
+    served from the bundle and the disk is never touched.
+    """
+
+    def __init__(self, root: Path, bundle: Optional[ContentBundle] = None,
+                 revalidate_interval: float = CONTENT_REVALIDATE_SECONDS):
+        self.root = root
+        self.bundle = bundle
+        self.revalidate_interval = revalidate_interval
+        self._entries: Dict[Path, _ContentEntry] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        # Bumped whenever cached content changes; lets derived data detect staleness
+        self.generation = 0
+
+    def get(self, path: Path, revalidate: bool = False) -> str:
+        """
+        Return the content of ``path``, raising FileNotFoundError if it is gone.
+
+        ``revalidate`` forces a stat() even if the entry was checked recently.
+        """
+        if self.bundle is not None:
+            return self._get_bundled(path)
+        entry = self._entries.get(path)
+        now = time.monotonic()
+        if not revalidate and entry is not None and now - entry.checked_at < self.revalidate_interval:
+            self.hits += 1
+            return entry.content
+        return self._revalidate(path, entry, now)
+
+    def get_bytes(self, path: Path) -> memoryview:
+        """
+        UTF-8 bytes of ``path`` as a read-only view, for byte-offset slicing
+        without copying: a view of the bundle mapping, or of an encoding
+        kept next to the cached text.
+        """
+        if self.bundle is not None:
+            try:
+                view = self.bundle.view(path.relative_to(self.root).as_posix())
+            except ValueError:
+                view = None
+            if view is None:
+                raise FileNotFoundError(path)
+            self.hits += 1
+            return view
+        content = self.get(path)
+        entry = self._entries.get(path)
+        if entry is None or entry.content is not content:
+            return memoryview(content.encode('utf-8'))
+        if entry.raw is None:
+            entry.raw = content.encode('utf-8')
+        return memoryview(entry.raw)
+
+    def _get_bundled(self, path: Path) -> str:
+        try:
+            content = self.bundle.read(path.relative_to(self.root).as_posix())
+        except ValueError:
+            content = None
+        if content is None:
+            raise FileNotFoundError(path)
+        self.hits += 1
+        return content
+
+    def _revalidate(self, path: Path, entry: Optional[_ContentEntry], now: float) -> str:
+        with self._lock:
+            try:
+                st = path.stat()
+            except OSError:
+                if self._entries.pop(path, None) is not None:
+                    self.generation += 1
+                raise FileNotFoundError(path)
+
+            if entry is not None and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                entry.checked_at = now
+                self.hits += 1
+                return entry.content
+
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+            self._entries[path] = _ContentEntry(content, st.st_mtime_ns, st.st_size, now)
+            if entry is None:
+                self.misses += 1
+            else:
+                self.reloads += 1
+            self.generation += 1
+            return content
+
+    def invalidate(self, path: Optional[Path] = None):
+        """Drop one cached file, or everything when no path is given."""
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path, None)
+            self.generation += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current memory footprint."""
+        lookups = self.hits + self.misses + self.reloads
+        if self.bundle is not None:
+            bundle = self.bundle.stats()
+            entries, size = bundle["files"], bundle["bytes"]
+        else:
+            bundle = None
+            entries, size = len(self._entries), sum(e.size for e in list(self._entries.values()))
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "reloads": self.reloads,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "revalidate_interval": self.revalidate_interval,
+            "bundle": bundle,
+        }
+
+content_store = ResourceContentStore(RESOURCES_DIR, ContentBundle.open(CONTENT_BUNDLE_PATH))
+
+def request_client_id() -> str:
+    """
+    Rate-limit key of the MCP request being served: the HTTP session id,
+    else the remote address. stdio and in-process requests, and calls made
+    outside a request, share "local": that transport serves a single client
+    per process. The client-supplied ``_meta.client_id`` is deliberately
+    ignored, since a caller could send a new one with every read to get a
+    fresh window.
+    """
+    from fastmcp.server.dependencies import get_context
+
+    try:
+        context = get_context()
+    except RuntimeError:
+        return "local"
+    request = context.request_context.request if context.request_context is not None else None
+    if request is not None:
+        session_id = request.headers.get("mcp-session-id")
+        if session_id:
+            return session_id
+        if request.client is not None:
+            return request.client.host
+    return "local"
+
+def enforce_resource_rate_limit():
+    """Raise once a client's resource reads exceed RESOURCE_RATE_LIMIT per RESOURCE_RATE_WINDOW."""
+    if RESOURCE_RATE_LIMIT and not security_manager.check_rate_limit(f"resources:{request_client_id()}",
+                                                                     RESOURCE_RATE_LIMIT, RESOURCE_RATE_WINDOW):
+        raise Exception(security_manager.secure_error_response('rate_limit_exceeded'))
+
 def load_resource_content(category: str, topic: str) -> str:
     """Load resource content from markdown files."""
-    resource_path = RESOURCES_DIR / category / f"{topic}.md"
-    if not resource_path.exists():
-        raise FileNotFoundError(f"Resource not found: {category}/{topic}")
-    with open(resource_path, 'r', encoding='utf-8') as f:
-        return f.read()
+    enforce_resource_rate_limit()
+    try:
+        return content_store.get(RESOURCES_DIR / category / f"{topic}.md")
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Resource not found: {category}/{topic}") from None
+
+# === RESOURCE METADATA REGISTRY ===
+
+_FRONTMATTER_RE = re.compile(r'---\n(.*?)\n---', re.DOTALL)
+_DIFFICULTY_RE = re.compile(r'difficulty:\s*(\w+)')
+_TAGS_RE = re.compile(r'tags:\s*\[(.*?)\]')
+_USE_CASE_RE = re.compile(r'use_case:\s*(.+)')
+_RELATED_RE = re.compile(r'related:\s*\[(.*?)\]')
+
+def parse_frontmatter(content: str) -> Dict[str, Any]:
+    """Extract difficulty/tags/use_case/related from a markdown frontmatter block."""
+    metadata = {'difficulty': 'Intermediate', 'tags': [], 'use_case': '', 'related': []}
+    if not content.startswith('---'):
+        return metadata
+    match = _FRONTMATTER_RE.search(content)
+    if not match:
+        return metadata
+    meta_str = match.group(1)
+
+    diff_match = _DIFFICULTY_RE.search(meta_str)
+    if diff_match:
+        metadata['difficulty'] = diff_match.group(1)
+
+    tags_match = _TAGS_RE.search(meta_str)
+    if tags_match:
+        metadata['tags'] = [t.strip() for t in tags_match.group(1).split(',')]
+
+    use_match = _USE_CASE_RE.search(meta_str)
+    if use_match:
+        metadata['use_case'] = use_match.group(1).strip()
+
+    related_match = _RELATED_RE.search(meta_str)
+    if related_match:
+        metadata['related'] = [r.strip() for r in related_match.group(1).split(',')]
+
+    return metadata
+
+class ResourceMetadata:
+    """Frontmatter and file facts for one markdown file under resources/."""
+    __slots__ = ("name", "category", "kind", "path", "difficulty", "tags", "use_case",
+                 "related", "size", "hash", "mtime_ns", "has_frontmatter")
+
+    def __init__(self, name: str, category: str, kind: str, path: str, difficulty: str,
+                 tags: List[str], use_case: str, related: List[str], size: int, hash: str,
+                 mtime_ns: int, has_frontmatter: bool):
+        self.name = name
+        self.category = category
+        self.kind = kind
+        self.path = path
+        self.difficulty = difficulty
+        self.tags = tags
+        self.use_case = use_case
+        self.related = related
+        self.size = size
+        self.hash = hash
+        self.mtime_ns = mtime_ns
+        self.has_frontmatter = has_frontmatter
+
+    @property
+    def uri(self) -> str:
+        if self.kind == "snippet":
+            return f"wordpress://snippets/{self.category}/{self.name}"
+        if self.kind == "catalog":
+            return "wordpress://catalog"
+        if self.kind == "prompt":
+            return f"wordpress://prompts/{self.name}"
+        return f"wordpress://{self.category}/{self.name}"
+
+class MetadataRegistry:
+    """
+    Parsed frontmatter for every resource, snippet and the catalog.
+
+    Built on first use and refreshed incrementally: at most once every
+    ``revalidate_interval`` seconds each file is stat()ed and only new or
+    changed files are re-read and re-parsed. ``generation`` increases
+    whenever any record is added, changed or removed. When the content
+    store serves a bundle, records come from its header and are never
+    rescanned.
+    """
+
+    def __init__(self, root: Path, store: ResourceContentStore,
+                 revalidate_interval: float = CONTENT_REVALIDATE_SECONDS):
+        self.root = root
+        self.store = store
+        self.revalidate_interval = revalidate_interval
+        self.generation = 0
+        self._records: Dict[str, ResourceMetadata] = {}
+        self._sorted: List[ResourceMetadata] = []
+        self._checked_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def refresh(self, force: bool = False):
+        """Re-scan the resource tree if the revalidation interval has passed."""
+        now = time.monotonic()
+        if not force and self._checked_at is not None and now - self._checked_at < self.revalidate_interval:
+            return
+        with self._lock:
+            if not force and self._checked_at is not None and now - self._checked_at < self.revalidate_interval:
+                return
+            if self.store.bundle is None:
+                self._scan()
+            elif self._checked_at is None:
+                self._load_bundle(self.store.bundle)
+            self._checked_at = now
+
+    def _load_bundle(self, bundle: ContentBundle):
+        for path, _, length, mtime_ns, content_hash, meta in bundle.header['files']:
+            name, category, kind = self._classify(path)
+            self._records[path] = ResourceMetadata(
+                name, category, kind, path, meta['difficulty'], meta['tags'], meta['use_case'],
+                meta['related'], length, content_hash, mtime_ns, meta['has_frontmatter'],
+            )
+        self._sorted = [self._records[key] for key in sorted(self._records)]
+        self.generation += 1
+
+    def _scan(self):
+        seen = set()
+        changed = False
+        for path in self.root.glob("**/*.md"):
+            relative = path.relative_to(self.root).as_posix()
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            seen.add(relative)
+
+            record = self._records.get(relative)
+            if record is not None and record.mtime_ns == st.st_mtime_ns and record.size == st.st_size:
+                continue
+            try:
+                content = self.store.get(path, revalidate=True)
+            except (OSError, UnicodeDecodeError) as e:
+                logger.warning(f"Skipping unreadable resource {relative}: {e}")
+                continue
+            self._records[relative] = self._parse(path, relative, content, st)
+            changed = True
+
+        for relative in set(self._records) - seen:
+            del self._records[relative]
+            changed = True
+
+        if changed:
+            self._sorted = [self._records[key] for key in sorted(self._records)]
+            self.generation += 1
+
+    @staticmethod
+    def _classify(relative: str) -> Tuple[str, str, str]:
+        """``(name, category, kind)`` for a path relative to the resource root."""
+        parts = relative.split("/")
+        name = parts[-1][:-3] if parts[-1].endswith(".md") else parts[-1]
+        if parts[0] == "snippets":
+            kind = "snippet"
+            parts = parts[1:]
+        elif len(parts) == 1 and name == "catalog":
+            kind = "catalog"
+        else:
+            kind = "resource"
+        category = parts[0] if len(parts) > 1 else "other"
+        return name, category, kind
+
+    def _parse(self, path: Path, relative: str, content: str, st: os.stat_result) -> ResourceMetadata:
+        name, category, kind = self._classify(relative)
+        meta = parse_frontmatter(content)
+        return ResourceMetadata(
+            name, category, kind, relative, meta['difficulty'], meta['tags'],
+            meta['use_case'], meta['related'], st.st_size,
+            hashlib.sha1(content.encode('utf-8')).hexdigest(), st.st_mtime_ns,
+            content.startswith('---') and 'difficulty:' in content,
+        )
+
+    def records(self, kind: Optional[str] = None) -> List[ResourceMetadata]:
+        """All records sorted by path, optionally restricted to one kind."""
+        self.refresh()
+        if kind is None:
+            return list(self._sorted)
+        return [record for record in self._sorted if record.kind == kind]
+
+    def get(self, relative_path: str) -> Optional[ResourceMetadata]:
+        self.refresh()
+        return self._records.get(relative_path)
+
+    def fingerprint(self, salt: str = "", kind: Optional[str] = None) -> str:
+        """Digest of every record's path and content hash, optionally for one kind."""
+        digest = hashlib.sha1(salt.encode())
+        for record in self.records(kind):
+            digest.update(f"{record.path}:{record.hash}\n".encode())
+        return digest.hexdigest()
+
+metadata_registry = MetadataRegistry(RESOURCES_DIR, content_store)
 
 # === CORE WORDPRESS APIs ===
 
@@ -427,136 +1196,100 @@ def get_quality_assurance() -> str:
 
 # === CODE SNIPPETS LIBRARY ===
 
-@mcp.resource("wordpress://snippets/list")
-def list_code_snippets() -> str:
-    """Complete catalog of all 62 code snippets with metadata, tags, and difficulty levels"""
-    import re
-    
-    snippets_dir = RESOURCES_DIR / "snippets"
-    
-    if not snippets_dir.exists():
-        return "# Code Snippets\n\nSnippet library is being initialized."
-    
-    output = "# WordPress Code Snippets Library\n\n"
-    output += "**62 ready-to-use code examples** with metadata and searchable tags.\n\n"
-    
-    output += "## 🔍 How to Use\n\n"
-    output += "### Get Specific Snippet:\n"
-    output += '```\nwordpress://snippets/{category}/{snippet-name}\n```\n\n'
-    output += "**Examples:**\n"
-    output += '- `wordpress://snippets/security/sanitize-input`\n'
-    output += '- `wordpress://snippets/ajax/admin-ajax`\n'
-    output += '- `wordpress://snippets/cpt/register-custom-post-type`\n\n'
-    
-    output += "### Search Snippets:\n"
-    output += 'Use `search_snippets()` tool:\n'
-    output += '- By difficulty: `search_snippets(difficulty="Beginner")`\n'
-    output += '- By tag: `search_snippets(tag="security")`\n'
-    output += '- By query: `search_snippets(query="ajax")`\n\n'
-    
-    output += "---\n\n"
-    
-    # Collect all snippets with metadata
-    all_snippets = []
-    total = 0
-    
-    for category_dir in sorted(snippets_dir.iterdir()):
-        if category_dir.is_dir():
-            category = category_dir.name
-            
-            for snippet_file in sorted(category_dir.glob("*.md")):
-                total += 1
-                snippet_name = snippet_file.stem
-                
-                # Read metadata
-                try:
-                    with open(snippet_file, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                    
-                    metadata = {
-                        'name': snippet_name,
-                        'category': category,
-                        'difficulty': 'Intermediate',
-                        'tags': [],
-                        'use_case': ''
-                    }
-                    
-                    # Parse frontmatter
-                    if content.startswith('---'):
-                        match = re.search(r'---\n(.*?)\n---', content, re.DOTALL)
-                        if match:
-                            meta_str = match.group(1)
-                            
-                            diff_match = re.search(r'difficulty:\s*(\w+)', meta_str)
-                            if diff_match:
-                                metadata['difficulty'] = diff_match.group(1)
-                            
-                            tags_match = re.search(r'tags:\s*\[(.*?)\]', meta_str)
-                            if tags_match:
-                                metadata['tags'] = [t.strip() for t in tags_match.group(1).split(',')]
-                            
-                            use_match = re.search(r'use_case:\s*(.+)', meta_str)
-                            if use_match:
-                                metadata['use_case'] = use_match.group(1).strip()
-                    
-                    all_snippets.append(metadata)
-                    
-                except:
-                    continue
+# Rendered snippet list, reused until the snippet fingerprint changes
+_snippet_list_cache: Dict[str, Any] = {"generation": None, "fingerprint": None, "output": ""}
+
+def _render_snippet_list(all_snippets: List[ResourceMetadata]) -> str:
+    """Build the wordpress://snippets/list document from registry records."""
+    parts = [
+        "# WordPress Code Snippets Library\n\n",
+        "**62 ready-to-use code examples** with metadata and searchable tags.\n\n",
+        "## 🔍 How to Use\n\n",
+        "### Get Specific Snippet:\n",
+        '```\nwordpress://snippets/{category}/{snippet-name}\n```\n\n',
+        "**Examples:**\n",
+        '- `wordpress://snippets/security/sanitize-input`\n',
+        '- `wordpress://snippets/ajax/admin-ajax`\n',
+        '- `wordpress://snippets/cpt/register-custom-post-type`\n\n',
+        "### Search Snippets:\n",
+        'Use `search_snippets()` tool:\n',
+        '- By difficulty: `search_snippets(difficulty="Beginner")`\n',
+        '- By tag: `search_snippets(tag="security")`\n',
+        '- By query: `search_snippets(query="ajax")`\n\n',
+        "---\n\n",
+    ]
     
     # Group by category
     by_category = {}
     for snippet in all_snippets:
-        cat = snippet['category']
-        if cat not in by_category:
-            by_category[cat] = []
-        by_category[cat].append(snippet)
+        by_category.setdefault(snippet.category, []).append(snippet)
     
     # Display by category
     for category in sorted(by_category.keys()):
         snippets = by_category[category]
-        output += f"## {category.replace('-', ' ').title()} ({len(snippets)} snippets)\n\n"
+        parts.append(f"## {category.replace('-', ' ').title()} ({len(snippets)} snippets)\n\n")
         
-        for snippet in sorted(snippets, key=lambda x: x['name']):
-            output += f"### {snippet['name']}\n\n"
-            output += f"**Difficulty:** {snippet['difficulty']}\n\n"
+        for snippet in sorted(snippets, key=lambda x: x.name):
+            parts.append(f"### {snippet.name}\n\n")
+            parts.append(f"**Difficulty:** {snippet.difficulty}\n\n")
             
-            if snippet['use_case']:
-                output += f"**Use Case:** {snippet['use_case']}\n\n"
+            if snippet.use_case:
+                parts.append(f"**Use Case:** {snippet.use_case}\n\n")
             
-            if snippet['tags']:
-                output += f"**Tags:** {', '.join(snippet['tags'][:5])}\n\n"
+            if snippet.tags:
+                parts.append(f"**Tags:** {', '.join(snippet.tags[:5])}\n\n")
             
-            output += f"**URI:** `wordpress://snippets/{snippet['category']}/{snippet['name']}`\n\n"
-            output += "---\n\n"
+            parts.append(f"**URI:** `{snippet.uri}`\n\n")
+            parts.append("---\n\n")
     
     # Summary
-    output += f"\n## 📊 Summary\n\n"
-    output += f"**Total Snippets:** {total}\n\n"
+    parts.append("\n## 📊 Summary\n\n")
+    parts.append(f"**Total Snippets:** {len(all_snippets)}\n\n")
     
     # Count by difficulty
     by_diff = {}
     for snippet in all_snippets:
-        diff = snippet['difficulty']
-        by_diff[diff] = by_diff.get(diff, 0) + 1
+        by_diff[snippet.difficulty] = by_diff.get(snippet.difficulty, 0) + 1
     
-    output += "**By Difficulty:**\n"
+    parts.append("**By Difficulty:**\n")
     for diff in ['Beginner', 'Intermediate', 'Advanced']:
         if diff in by_diff:
-            output += f"- {diff}: {by_diff[diff]} snippets\n"
+            parts.append(f"- {diff}: {by_diff[diff]} snippets\n")
     
-    output += "\n**Features:**\n"
-    output += "- ✅ Complete working code examples\n"
-    output += "- ✅ Security best practices built-in\n"
-    output += "- ✅ WordPress coding standards compliant\n"
-    output += "- ✅ Copy-paste ready implementations\n"
-    output += "- ✅ Searchable by tags and difficulty\n"
-    output += "- ✅ Related snippet suggestions\n"
+    parts.append(
+        "\n**Features:**\n"
+        "- ✅ Complete working code examples\n"
+        "- ✅ Security best practices built-in\n"
+        "- ✅ WordPress coding standards compliant\n"
+        "- ✅ Copy-paste ready implementations\n"
+        "- ✅ Searchable by tags and difficulty\n"
+        "- ✅ Related snippet suggestions\n"
+    )
     
-    return output
+    return "".join(parts)
+
+@mcp.resource("wordpress://snippets/list")
+def list_code_snippets() -> str:
+    """Complete catalog of all 62 code snippets with metadata, tags, and difficulty levels"""
+    metadata_registry.refresh()
+    cache = _snippet_list_cache
+    
+    # Only re-fingerprint when the registry saw a change, only re-render when snippets changed
+    if cache["generation"] != metadata_registry.generation:
+        all_snippets = metadata_registry.records("snippet")
+        fingerprint = metadata_registry.fingerprint(kind="snippet")
+        if fingerprint != cache["fingerprint"]:
+            if all_snippets:
+                cache["output"] = _render_snippet_list(all_snippets)
+            else:
+                cache["output"] = "# Code Snippets\n\nSnippet library is being initialized."
+            cache["fingerprint"] = fingerprint
+        cache["generation"] = metadata_registry.generation
+    
+    return cache["output"]
 
-@mcp.resource("wordpress://snippets/{category}/{topic}")
-def get_code_snippet(category: str, topic: str) -> str:
+@mcp.resource("wordpress://snippets/{category}/{topic}{?max_bytes,cursor}")
+def get_code_snippet(category: str, topic: str, max_bytes: int = 0, cursor: str = "") -> str:
     """
     Get specific WordPress code snippet
     
@@ -566,6 +1299,7 @@ def get_code_snippet(category: str, topic: str) -> str:
       wordpress://snippets/cpt/register-custom-post-type
       wordpress://snippets/hooks/save-post-hook
       wordpress://snippets/performance/caching-transients
+      wordpress://snippets/security/nonces?max_bytes=2000 (paged; follow the cursor in the footer)
     
     Use wordpress://snippets/list to see all available snippets
     """
@@ -575,14 +1309,14 @@ def get_code_snippet(category: str, topic: str) -> str:
         
         # Load the snippet using the existing function
         snippet_path = f"snippets/{category}"
-        return load_resource_content(snippet_path, topic)
+        return paged_response(load_resource_content(snippet_path, topic), max_bytes, cursor)
         
     except FileNotFoundError:
         # List available snippets in this category
         try:
-            category_path = RESOURCES_DIR / "snippets" / category
-            if category_path.exists():
-                available = sorted([f.stem for f in category_path.glob("*.md")])
+            available = sorted(record.name for record in metadata_registry.records("snippet")
+                               if record.category == category)
+            if available:
                 error_msg = f"Snippet not found: {category}/{topic}\n\n"
                 error_msg += f"Available in '{category}':\n"
                 for snippet in available:
@@ -602,102 +1336,534 @@ def get_resource_catalog() -> str:
     """Complete searchable catalog of all WordPress resources with metadata, tags, and learning paths"""
     return load_resource_content(".", "catalog")
 
+# === PAGINATION ===
+
+# Page size used when a cursor is given without max_bytes, and the smallest page allowed
+PAGE_DEFAULT_BYTES = 8000
+PAGE_MIN_BYTES = 512
+
+_FENCE_RE = re.compile(r"^\s*```\s*([\w+-]*)")
+_PAGE_HEADING_RE = re.compile(rb"#{1,6}\s")
+
+def _page_breaks(data: bytes) -> Tuple[List[int], List[int], List[int]]:
+    """
+    Offsets where a page may start, best first: block starts (headings
+    and code fences, or the line after a closing fence), paragraph starts
+    outside code, and any line start. Nothing directly below a heading
+    is a block or paragraph break, so headings stay with their content.
+    """
+    blocks, paragraphs, lines = [], [], []
+    in_code = False
+    after_fence = False
+    previous_blank = False
+    under_heading = False
+    offset = 0
+    for line in data.split(b"\n"):
+        stripped = line.strip()
+        fence = stripped.startswith((b"```", b"~~~"))
+        heading = not in_code and _PAGE_HEADING_RE.match(line) is not None
+        if offset:
+            lines.append(offset)
+            if not under_heading and (heading or after_fence or (not in_code and fence)):
+                blocks.append(offset)
+            elif not in_code and not under_heading and previous_blank and stripped:
+                paragraphs.append(offset)
+        after_fence = fence and in_code
+        if fence:
+            in_code = not in_code
+        if stripped:
+            under_heading = heading
+        previous_blank = not stripped
+        offset += len(line) + 1
+    return blocks, paragraphs, lines
+
+def _page_end(data: bytes, start: int, budget: int) -> int:
+    limit = start + budget
+    if limit >= len(data):
+        return len(data)
+    # Block and paragraph breaks only count if the page stays at least half full
+    floor = start + budget // 2
+    for tier, points in enumerate(_page_breaks(data)):
+        index = bisect.bisect_right(points, limit) - 1
+        if index >= 0 and points[index] > (start if tier == 2 else floor):
+            return points[index]
+    # One line longer than the budget: cut it on a UTF-8 character boundary
+    while limit > start + 1 and (data[limit] & 0xC0) == 0x80:
+        limit -= 1
+    return limit
+
+def page_text(data: bytes, max_bytes: int, cursor: str = "") -> Tuple[str, int, int, Optional[str]]:
+    """
+    One page of ``data`` (UTF-8) of at most ``max_bytes``, split on a
+    heading or code-block boundary where possible. Returns ``(text, start,
+    end, next_cursor)``; ``next_cursor`` is None on the last page. Cursors
+    carry the offset and a digest of ``data``, so a cursor from content
+    that has since changed raises ValueError instead of resuming mid-line
+    (as does a cursor that was not produced by this function).
+    """
+    budget = max(max_bytes or PAGE_DEFAULT_BYTES, PAGE_MIN_BYTES)
+    digest = hashlib.sha1(data).hexdigest()[:12]
+    start = 0
+    if cursor:
+        offset, _, cursor_digest = cursor.partition(".")
+        if (not offset.isdigit() or len(cursor_digest) != len(digest)
+                or any(c not in "0123456789abcdef" for c in cursor_digest)):
+            raise ValueError("malformed cursor; pass the cursor exactly as printed at the end of the previous page")
+        if cursor_digest != digest:
+            raise ValueError("cursor is stale because the content changed; start again without a cursor")
+        start = int(offset)
+        if start >= len(data):
+            raise ValueError("cursor is past the end of the content")
+    end = _page_end(data, start, budget)
+    next_cursor = f"{end}.{digest}" if end < len(data) else None
+    return data[start:end].decode('utf-8'), start, end, next_cursor
+
+def paged_response(output: str, max_bytes: int = 0, cursor: str = "") -> str:
+    """``output`` unchanged, or one page of it with a footer carrying the continuation cursor."""
+    if max_bytes <= 0 and not cursor:
+        return output
+    return render_page(output.encode('utf-8'), max_bytes, cursor)
+
+def render_page(data: bytes, max_bytes: int, cursor: str = "") -> str:
+    """One page of ``data`` followed by its byte range and the next cursor."""
+    try:
+        text, start, end, next_cursor = page_text(data, max_bytes, cursor)
+    except ValueError as e:
+        return f"Error: {e}"
+    text = text.rstrip("\n")
+    footer = "\n\n" if text.endswith("---") else "\n\n---\n"
+    footer += f"📄 **Page:** bytes {start + 1:,}–{end:,} of {len(data):,}"
+    if next_cursor:
+        footer += f" | **Next cursor:** `{next_cursor}`\n"
+    else:
+        footer += " | **End of content**\n"
+    return text + footer
+
+# === SEARCH INDEX ===
+
+SEARCH_INDEX_VERSION = 3
+SEARCH_INDEX_CACHE = Path(__file__).parent / ".search_index.json"
+
+# Indexed fields, in the order their term frequencies are stored in postings
+SEARCH_FIELDS = ("name", "category", "tags", "use_case", "headings", "body")
+# BM25F field boosts: a hit in the file name or tags outweighs one in the body
+SEARCH_FIELD_WEIGHTS = (5.0, 2.0, 4.0, 3.0, 2.0, 1.0)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Registry record kinds that are indexed; prompts are added as virtual documents
+SEARCH_KINDS = ("resource", "snippet", "catalog")
+# Fuzzy matches score this fraction of an exact hit per edit
+FUZZY_MATCH_WEIGHT = 0.6
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+(?:_[a-z0-9]+)*")
+_HEADING_RE = re.compile(r"^#{1,6}\s+(.+?)\s*#*$", re.MULTILINE)
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has how if in into is it its of on or "
+    "that the this to was were will with you your".split()
+)
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens; snake_case identifiers also yield their parts."""
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        tokens.append(token)
+        if "_" in token:
+            tokens.extend(part for part in token.split("_") if part not in _STOPWORDS)
+    return tokens
+
+def trigrams(term: str) -> List[str]:
+    """Character trigrams of ``term`` padded with ``$`` so its start and end count."""
+    padded = f"${term}$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+def max_edit_distance(term: str) -> int:
+    """Typos tolerated for a query term: none under 4 characters, 2 from 8 up."""
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Levenshtein distance between ``a`` and ``b``, or ``limit + 1`` once it exceeds ``limit``."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return min(previous[-1], limit + 1)
+
+class SearchIndex:
+    """
+    Inverted full-text index over every resource and snippet.
+
+    Documents are MetadataRegistry records; ``lengths[doc_id]`` holds their
+    per-field token counts. Postings map a term to ``[doc_id, tf_name,
+    tf_category, ...]`` rows, one term frequency per entry in SEARCH_FIELDS.
+    The index is loaded from the content bundle or ``cache_path`` when the
+    registry fingerprint still matches, otherwise rebuilt and written back.
+    It is re-checked whenever the registry generation changes.
+
+    ``virtual_documents`` optionally returns ``(record, text)`` pairs for
+    documents that are not files (the registered prompts); their hashes
+    are part of the fingerprint.
+
+    A character-trigram index over the vocabulary (``trigram_index`` maps a
+    trigram to vocabulary positions) resolves query terms that match no
+    indexed term exactly or by prefix: first as substrings, then as typos
+    within max_edit_distance().
+    """
+
+    def __init__(self, registry: MetadataRegistry, cache_path: Optional[Path] = None):
+        self.registry = registry
+        self.cache_path = cache_path
+        self.documents: List[ResourceMetadata] = []
+        self.lengths: List[List[int]] = []
+        self.postings: Dict[str, List[List[int]]] = {}
+        self.vocabulary: List[str] = []
+        self.trigram_index: Dict[str, List[int]] = {}
+        self.avg_lengths: List[float] = [0.0] * len(SEARCH_FIELDS)
+        self.fingerprint: Optional[str] = None
+        self.generation = -1
+        self.built_from = None
+        self.virtual_documents: Optional[Callable[[], List[Tuple[ResourceMetadata, str]]]] = None
+        self._lock = threading.Lock()
+
+    def ensure_current(self):
+        """Load or rebuild the index if the registry reports changes."""
+        self.registry.refresh()
+        if self.generation == self.registry.generation:
+            return
+        with self._lock:
+            generation = self.registry.generation
+            if self.generation == generation:
+                return
+            virtual = self.virtual_documents() if self.virtual_documents else []
+            salt = str(SEARCH_INDEX_VERSION) + "".join(f"{record.path}:{record.hash}" for record, _ in virtual)
+            fingerprint = self.registry.fingerprint(salt)
+            if fingerprint != self.fingerprint:
+                records = [r for r in self.registry.records() if r.kind in SEARCH_KINDS]
+                records += [record for record, _ in virtual]
+                source = self._load(fingerprint, records)
+                if source:
+                    self.built_from = source
+                else:
+                    self._build(fingerprint, records, {record.path: text for record, text in virtual})
+                    self.built_from = "source"
+                    self._save()
+            self.generation = generation
+
+    def _build(self, fingerprint: str, records: List[ResourceMetadata], texts: Dict[str, str]):
+        documents = []
+        lengths = []
+        postings: Dict[str, List[List[int]]] = {}
+        field_count = len(SEARCH_FIELDS)
+
+        for record in records:
+            content = texts.get(record.path)
+            if content is None:
+                try:
+                    content = self.registry.store.get(self.registry.root / record.path)
+                except (OSError, UnicodeDecodeError):
+                    continue
+
+            body = _FRONTMATTER_RE.sub("", content, count=1) if content.startswith('---') else content
+            field_tokens = (
+                tokenize(record.name.replace('-', ' ')),
+                tokenize(record.category.replace('-', ' ')),
+                tokenize(' '.join(record.tags).replace('-', ' ')),
+                tokenize(record.use_case),
+                tokenize(' '.join(_HEADING_RE.findall(body))),
+                tokenize(body),
+            )
+
+            doc_id = len(documents)
+            documents.append(record)
+            lengths.append([len(tokens) for tokens in field_tokens])
+
+            rows: Dict[str, List[int]] = {}
+            for field, tokens in enumerate(field_tokens):
+                for token in tokens:
+                    row = rows.get(token)
+                    if row is None:
+                        row = rows[token] = [doc_id] + [0] * field_count
+                    row[field + 1] += 1
+            for token, row in rows.items():
+                postings.setdefault(token, []).append(row)
+
+        self.documents = documents
+        self.lengths = lengths
+        self.postings = postings
+        self._finalize(fingerprint)
+        logger.info(f"Search index built: {len(documents)} documents, {len(postings)} terms")
+
+    def _load(self, fingerprint: str, records: List[ResourceMetadata]) -> Optional[str]:
+        """Adopt a prebuilt index; returns where it came from, or None to rebuild."""
+        bundle = self.registry.store.bundle
+        if bundle is not None:
+            source = "bundle"
+        elif self.cache_path is not None and self.cache_path.exists():
+            source = "cache"
+        else:
+            return None
+        by_path = {record.path: record for record in records}
+        try:
+            if bundle is not None:
+                data = bundle.search_index()
+            else:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            if not data or data.get('version') != SEARCH_INDEX_VERSION or data.get('fingerprint') != fingerprint:
+                return None
+            self.documents = [by_path[path] for path, _ in data['documents']]
+            self.lengths = [lengths for _, lengths in data['documents']]
+            self.postings = data['postings']
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable search index {source}: {e}")
+            return None
+        self._finalize(fingerprint)
+        return source
+
+    def _finalize(self, fingerprint: str):
+        self.vocabulary = sorted(self.postings)
+        trigram_index: Dict[str, List[int]] = {}
+        for position, term in enumerate(self.vocabulary):
+            for trigram in set(trigrams(term)):
+                trigram_index.setdefault(trigram, []).append(position)
+        self.trigram_index = trigram_index
+        count = len(self.documents) or 1
+        self.avg_lengths = [
+            (sum(lengths[field] for lengths in self.lengths) / count) or 1.0
+            for field in range(len(SEARCH_FIELDS))
+        ]
+        self.fingerprint = fingerprint
+
+    def serialize(self) -> Dict[str, Any]:
+        """The index as stored in the JSON cache file and in content bundles."""
+        return {
+            'version': SEARCH_INDEX_VERSION,
+            'fingerprint': self.fingerprint,
+            'documents': [[doc.path, lengths] for doc, lengths in zip(self.documents, self.lengths)],
+            'postings': self.postings,
+        }
+
+    def _save(self):
+        if self.cache_path is None or self.registry.store.bundle is not None:
+            return
+        data = self.serialize()
+        tmp_path = self.cache_path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logger.warning(f"Could not write search index cache: {e}")
+
+    def expand_term(self, term: str) -> List[Tuple[str, int]]:
+        """
+        Indexed terms a query term stands for, as ``(term, edits)`` pairs:
+        the exact term, else terms it is a prefix or substring of (0 edits),
+        else the closest terms within max_edit_distance().
+        """
+        if term in self.postings:
+            return [(term, 0)]
+        if len(term) < 3:
+            return []
+        start = bisect.bisect_left(self.vocabulary, term)
+        matches = []
+        for candidate in self.vocabulary[start:start + 50]:
+            if not candidate.startswith(term):
+                break
+            matches.append((candidate, 0))
+        if not matches:
+            matches = [(candidate, 0) for candidate in self.substring_terms(term)]
+        return matches or self.fuzzy_terms(term)
+
+    def _trigram_counts(self, grams: List[str]) -> Dict[int, int]:
+        counts: Dict[int, int] = {}
+        for trigram in set(grams):
+            for position in self.trigram_index.get(trigram, ()):
+                counts[position] = counts.get(position, 0) + 1
+        return counts
+
+    def substring_terms(self, term: str, limit: int = 50) -> List[str]:
+        """Indexed terms containing ``term``, found through its inner trigrams."""
+        if len(term) < 4:
+            return []
+        grams = trigrams(term)[1:-1]
+        needed = len(set(grams))
+        matches = [self.vocabulary[position] for position, count in self._trigram_counts(grams).items()
+                   if count == needed and term in self.vocabulary[position]]
+        matches.sort(key=lambda candidate: (len(candidate), candidate))
+        return matches[:limit]
+
+    def fuzzy_terms(self, term: str, limit: int = 5) -> List[Tuple[str, int]]:
+        """
+        Closest indexed terms within max_edit_distance(), as ``(term, edits)``
+        pairs ordered by edits and then document frequency. Only terms that
+        share enough trigrams to possibly be that close are compared.
+        """
+        max_edits = max_edit_distance(term)
+        if not max_edits:
+            return []
+        grams = trigrams(term)
+        # Each edit destroys at most three trigrams
+        needed = max(len(set(grams)) - 3 * max_edits, 1)
+        matches = []
+        for position, count in self._trigram_counts(grams).items():
+            if count < needed:
+                continue
+            candidate = self.vocabulary[position]
+            edits = edit_distance(term, candidate, max_edits)
+            if edits <= max_edits:
+                matches.append((candidate, edits))
+        matches.sort(key=lambda match: (match[1], -len(self.postings[match[0]]), match[0]))
+        return matches[:limit]
+
+    def suggest(self, query: str) -> Dict[str, str]:
+        """"Did you mean" corrections for query terms with no exact, prefix or substring match."""
+        self.ensure_current()
+        suggestions = {}
+        for term in dict.fromkeys(tokenize(query)):
+            expanded = self.expand_term(term)
+            if expanded and expanded[0][1]:
+                suggestions[term] = expanded[0][0]
+        return suggestions
+
+    def search(self, query: str = "", kind: Optional[str] = None) -> List[Tuple[ResourceMetadata, float]]:
+        """
+        Return ``(document, score)`` pairs matching every query term, best first.
+
+        Scores are BM25F: per-field term frequencies are length-normalised,
+        boosted by SEARCH_FIELD_WEIGHTS and saturated once per term. Typo
+        matches from the trigram index count FUZZY_MATCH_WEIGHT per edit. An
+        empty query matches all documents of ``kind`` with a score of 0.
+        """
+        self.ensure_current()
+        documents = self.documents
+        terms = tokenize(query)
+        if not terms:
+            return [(doc, 0.0) for doc in documents if kind is None or doc.kind == kind]
+
+        total = len(documents)
+        scores: Optional[Dict[int, float]] = None
+        for term in dict.fromkeys(terms):
+            term_scores: Dict[int, float] = {}
+            for expanded, edits in self.expand_term(term):
+                rows = self.postings[expanded]
+                idf = math.log(1 + (total - len(rows) + 0.5) / (len(rows) + 0.5))
+                idf *= FUZZY_MATCH_WEIGHT ** edits
+                for row in rows:
+                    score = idf * self._saturate(row, self.lengths[row[0]])
+                    # A term may expand to several indexed terms; only the best one counts
+                    if score > term_scores.get(row[0], 0.0):
+                        term_scores[row[0]] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc_id: score + term_scores[doc_id]
+                          for doc_id, score in scores.items() if doc_id in term_scores}
+            if not scores:
+                return []
+
+        results = [(documents[doc_id], score) for doc_id, score in scores.items()
+                   if kind is None or documents[doc_id].kind == kind]
+        results.sort(key=lambda item: (-item[1], item[0].path))
+        return results
+
+    def _saturate(self, row: List[int], lengths: List[int]) -> float:
+        weighted_tf = 0.0
+        for field, tf in enumerate(row[1:]):
+            if tf:
+                norm = 1 - BM25_B + BM25_B * lengths[field] / self.avg_lengths[field]
+                weighted_tf += SEARCH_FIELD_WEIGHTS[field] * tf / norm
+        return weighted_tf / (BM25_K1 + weighted_tf)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "documents": len(self.documents),
+            "terms": len(self.postings),
+            "trigrams": len(self.trigram_index),
+            "built_from": self.built_from,
+        }
+
+search_index = SearchIndex(metadata_registry, SEARCH_INDEX_CACHE)
+
+def _corrected_query(query: str) -> str:
+    """``query`` with misspelled terms replaced by the index's suggestions, or "" if none."""
+    suggestions = search_index.suggest(query) if query else {}
+    if not suggestions:
+        return ""
+    return " ".join(suggestions.get(term, term) for term in dict.fromkeys(tokenize(query)))
+
 @mcp.tool()
 def search_snippets(
     query: str = "",
     difficulty: str = "",
     tag: str = "",
-    category: str = ""
+    category: str = "",
+    sort: str = "relevance",
+    limit: int = 0,
+    max_bytes: int = 0,
+    cursor: str = ""
 ) -> str:
     """
     Search and filter WordPress code snippets
     
     Args:
-        query: Search term (searches names, tags, use cases)
+        query: Search terms, all of which must match (names, tags, use cases, headings, body)
         difficulty: Filter by difficulty (Beginner, Intermediate, Advanced)
         tag: Filter by tag (e.g., "security", "ajax", "performance")
         category: Filter by category (e.g., "security", "ajax", "blocks")
+        sort: "relevance" ranks query hits by BM25 score; "category" groups them alphabetically
+        limit: Maximum number of results to return (0 for all)
+        max_bytes: Page size in bytes (0 for everything); longer output ends with a continuation cursor
+        cursor: Cursor printed at the end of the previous page, to continue from there
     
     Returns:
         List of matching code snippets with metadata and URIs
         
     Examples:
+        search_snippets(query="nonce ajax", limit=5)
         search_snippets(query="security")
         search_snippets(difficulty="Beginner")
         search_snippets(tag="ajax", difficulty="Intermediate")
         search_snippets(category="performance")
     """
-    import re
+    if sort not in ("relevance", "category"):
+        return "Error: sort must be one of: relevance, category"
     
+    corrected = _corrected_query(query)
     results = []
-    snippets_dir = RESOURCES_DIR / "snippets"
-    
-    # Scan all snippet files
-    for snippet_file in snippets_dir.glob("**/*.md"):
-        relative_path = snippet_file.relative_to(snippets_dir)
-        file_category = relative_path.parts[0] if len(relative_path.parts) > 1 else "other"
-        snippet_name = snippet_file.stem
-        
-        # Read file and metadata
-        try:
-            with open(snippet_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except:
-            continue
-        
-        snippet_data = {
-            'name': snippet_name,
-            'category': file_category,
-            'difficulty': 'Intermediate',
-            'tags': [],
-            'use_case': '',
-            'related': []
-        }
-        
-        # Parse frontmatter
-        if content.startswith('---'):
-            match = re.search(r'---\n(.*?)\n---', content, re.DOTALL)
-            if match:
-                meta_str = match.group(1)
-                
-                diff_match = re.search(r'difficulty:\s*(\w+)', meta_str)
-                if diff_match:
-                    snippet_data['difficulty'] = diff_match.group(1)
-                
-                tags_match = re.search(r'tags:\s*\[(.*?)\]', meta_str)
-                if tags_match:
-                    snippet_data['tags'] = [t.strip() for t in tags_match.group(1).split(',')]
-                
-                use_match = re.search(r'use_case:\s*(.+)', meta_str)
-                if use_match:
-                    snippet_data['use_case'] = use_match.group(1).strip()
-                
-                related_match = re.search(r'related:\s*\[(.*?)\]', meta_str)
-                if related_match:
-                    snippet_data['related'] = [r.strip() for r in related_match.group(1).split(',')]
-        
+    for doc, score in search_index.search(query, kind="snippet"):
         # Apply filters
-        if difficulty and snippet_data['difficulty'] != difficulty:
+        if difficulty and doc.difficulty != difficulty:
             continue
         
-        if tag and tag not in snippet_data['tags']:
+        if tag and tag not in doc.tags:
             continue
         
-        if category and file_category != category:
+        if category and doc.category != category:
             continue
         
-        if query:
-            query_lower = query.lower()
-            if (query_lower not in snippet_name.lower() and
-                query_lower not in file_category.lower() and
-                query_lower not in snippet_data['use_case'].lower() and
-                not any(query_lower in t.lower() for t in snippet_data['tags'])):
-                continue
-        
-        results.append(snippet_data)
+        results.append({
+            'name': doc.name,
+            'category': doc.category,
+            'difficulty': doc.difficulty,
+            'tags': doc.tags,
+            'use_case': doc.use_case,
+            'related': doc.related,
+            'score': score
+        })
     
     # Format results
     if not results:
+        hint = f"**Did you mean:** `search_snippets(query=\"{corrected}\")`\n\n" if corrected else ""
         return f"""# No Snippets Found
 
 **Search criteria:**
@@ -706,14 +1872,23 @@ def search_snippets(
 - Tag: {tag or 'all'}
 - Category: {category or 'all'}
 
-Try broader search terms or check `wordpress://snippets/list` for all snippets.
+{hint}Try broader search terms or check `wordpress://snippets/list` for all snippets.
 """
     
+    found = len(results)
+    if limit > 0:
+        results = results[:limit]
+    
     output = f"# Code Snippets Search Results\n\n"
-    output += f"**Found {len(results)} snippet(s)**\n\n"
+    if len(results) < found:
+        output += f"**Showing top {len(results)} of {found} snippet(s)**\n\n"
+    else:
+        output += f"**Found {found} snippet(s)**\n\n"
     
     if query:
         output += f"**Query:** {query}\n"
+        if corrected:
+            output += f"**Did you mean:** {corrected} (close matches included)\n"
     if difficulty:
         output += f"**Difficulty:** {difficulty}\n"
     if tag:
@@ -723,6 +1898,23 @@ Try broader search terms or check `wordpress://snippets/list` for all snippets.
     
     output += "\n---\n\n"
     
+    # Ranked list, best match first
+    if query and sort == "relevance":
+        for rank, snippet in enumerate(results, 1):
+            output += f"### {rank}. {snippet['name']} ({snippet['category']})\n\n"
+            output += f"**Score:** {snippet['score']:.2f} | **Difficulty:** {snippet['difficulty']}\n\n"
+            
+            if snippet['use_case']:
+                output += f"**Use Case:** {snippet['use_case']}\n\n"
+            
+            if snippet['tags']:
+                output += f"**Tags:** {', '.join(snippet['tags'][:5])}\n\n"
+            
+            output += f"**Get Snippet:** `wordpress://snippets/{snippet['category']}/{snippet['name']}`\n\n"
+            output += "---\n\n"
+        
+        return paged_response(output, max_bytes, cursor)
+    
     # Group by category
     by_category = {}
     for snippet in results:
@@ -754,106 +1946,71 @@ Try broader search terms or check `wordpress://snippets/list` for all snippets.
     
     output += f"\n💡 **Tip:** Use `wordpress://snippets/list` to browse all 62 snippets.\n"
     
-    return output
+    return paged_response(output, max_bytes, cursor)
 
 @mcp.tool()
 def search_resources(
     query: str = "",
     difficulty: str = "",
     tag: str = "",
-    category: str = ""
+    category: str = "",
+    sort: str = "relevance",
+    limit: int = 0,
+    max_bytes: int = 0,
+    cursor: str = ""
 ) -> str:
     """
     Search and filter WordPress development resources
     
     Args:
-        query: Search term (searches titles and tags)
+        query: Search terms, all of which must match (titles, tags, headings, body)
         difficulty: Filter by difficulty (Beginner, Intermediate, Advanced)
         tag: Filter by tag (e.g., "security", "blocks", "api")
         category: Filter by category (e.g., "security", "blocks", "themes")
+        sort: "relevance" ranks query hits by BM25 score; "category" groups them alphabetically
+        limit: Maximum number of results to return (0 for all)
+        max_bytes: Page size in bytes (0 for everything); longer output ends with a continuation cursor
+        cursor: Cursor printed at the end of the previous page, to continue from there
     
     Returns:
         List of matching resources with metadata
         
     Examples:
+        search_resources(query="nonce ajax", limit=5)
         search_resources(query="security")
         search_resources(difficulty="Beginner")
         search_resources(tag="blocks", difficulty="Intermediate")
         search_resources(category="security")
     """
-    import re
-    from pathlib import Path
+    if sort not in ("relevance", "category"):
+        return "Error: sort must be one of: relevance, category"
     
+    corrected = _corrected_query(query)
     results = []
-    resources_dir = RESOURCES_DIR
-    
-    # Scan all resource files (excluding snippets)
-    for md_file in resources_dir.glob("**/*.md"):
-        if "snippets" in str(md_file) or md_file.name == "catalog.md":
-            continue
-        
-        relative_path = md_file.relative_to(resources_dir)
-        file_category = relative_path.parts[0] if len(relative_path.parts) > 1 else "other"
-        
-        # Read file
-        try:
-            with open(md_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except:
-            continue
-        
-        # Extract metadata
-        resource_data = {
-            'name': md_file.stem,
-            'category': file_category,
-            'path': str(relative_path),
-            'difficulty': 'Intermediate',
-            'tags': [],
-            'related': []
-        }
-        
-        # Parse frontmatter if exists
-        if content.startswith('---'):
-            match = re.search(r'---\n(.*?)\n---', content, re.DOTALL)
-            if match:
-                metadata_str = match.group(1)
-                
-                # Extract difficulty
-                diff_match = re.search(r'difficulty:\s*(\w+)', metadata_str)
-                if diff_match:
-                    resource_data['difficulty'] = diff_match.group(1)
-                
-                # Extract tags
-                tags_match = re.search(r'tags:\s*\[(.*?)\]', metadata_str)
-                if tags_match:
-                    resource_data['tags'] = [t.strip() for t in tags_match.group(1).split(',')]
-                
-                # Extract related
-                related_match = re.search(r'related:\s*\[(.*?)\]', metadata_str)
-                if related_match:
-                    resource_data['related'] = [r.strip() for r in related_match.group(1).split(',')]
-        
+    for doc, score in search_index.search(query, kind="resource"):
         # Apply filters
-        if difficulty and resource_data['difficulty'] != difficulty:
+        if difficulty and doc.difficulty != difficulty:
             continue
         
-        if tag and tag not in resource_data['tags']:
+        if tag and tag not in doc.tags:
             continue
         
-        if category and file_category != category:
+        if category and doc.category != category:
             continue
         
-        if query:
-            query_lower = query.lower()
-            if (query_lower not in resource_data['name'].lower() and
-                query_lower not in file_category.lower() and
-                not any(query_lower in t.lower() for t in resource_data['tags'])):
-                continue
-        
-        results.append(resource_data)
+        results.append({
+            'name': doc.name,
+            'category': doc.category,
+            'path': doc.path,
+            'difficulty': doc.difficulty,
+            'tags': doc.tags,
+            'related': doc.related,
+            'score': score
+        })
     
     # Format results
     if not results:
+        hint = f"**Did you mean:** `search_resources(query=\"{corrected}\")`\n\n" if corrected else ""
         return f"""# No Resources Found
 
 **Search criteria:**
@@ -862,14 +2019,23 @@ def search_resources(
 - Tag: {tag or 'all'}
 - Category: {category or 'all'}
 
-Try broader search terms or check `wordpress://catalog` for complete resource list.
+{hint}Try broader search terms or check `wordpress://catalog` for complete resource list.
 """
     
+    found = len(results)
+    if limit > 0:
+        results = results[:limit]
+    
     output = f"# WordPress Resources Search Results\n\n"
-    output += f"**Found {len(results)} resource(s)**\n\n"
+    if len(results) < found:
+        output += f"**Showing top {len(results)} of {found} resource(s)**\n\n"
+    else:
+        output += f"**Found {found} resource(s)**\n\n"
     
     if query:
         output += f"**Query:** {query}\n"
+        if corrected:
+            output += f"**Did you mean:** {corrected} (close matches included)\n"
     if difficulty:
         output += f"**Difficulty:** {difficulty}\n"
     if tag:
@@ -879,6 +2045,20 @@ Try broader search terms or check `wordpress://catalog` for complete resource li
     
     output += "\n---\n\n"
     
+    # Ranked list, best match first
+    if query and sort == "relevance":
+        for rank, res in enumerate(results, 1):
+            output += f"### {rank}. {res['name']} ({res['category']})\n\n"
+            output += f"**Score:** {res['score']:.2f} | **Difficulty:** {res['difficulty']}\n\n"
+            
+            if res['tags']:
+                output += f"**Tags:** {', '.join(res['tags'])}\n\n"
+            
+            output += f"**Resource:** `wordpress://{res['category']}/{res['name']}`\n\n"
+            output += "---\n\n"
+        
+        return paged_response(output, max_bytes, cursor)
+    
     # Group by category
     by_category = {}
     for res in results:
@@ -907,7 +2087,341 @@ Try broader search terms or check `wordpress://catalog` for complete resource li
     
     output += f"\n💡 **Tip:** Use `wordpress://catalog` to browse all {len(results)} resources by category, difficulty, and tags.\n"
     
-    return output
+    return paged_response(output, max_bytes, cursor)
+
+# Hit type shown by the unified search tool for each indexed record kind
+SEARCH_HIT_TYPES = {"resource": "doc", "snippet": "snippet", "prompt": "prompt", "catalog": "catalog"}
+
+@mcp.tool()
+def search(query: str, types: str = "", limit: int = 10, max_bytes: int = 0, cursor: str = "") -> str:
+    """
+    Search docs, snippets, prompts and the catalog in one call
+    
+    Args:
+        query: Search terms, all of which must match (names, tags, use cases, headings, body)
+        types: Comma-separated hit types to include: doc, snippet, prompt, catalog (default all)
+        limit: Maximum number of hits to return (0 for all)
+        max_bytes: Page size in bytes (0 for everything); longer output ends with a continuation cursor
+        cursor: Cursor printed at the end of the previous page, to continue from there
+    
+    Returns:
+        Ranked hits with their type and the URI to read each one
+        
+    Examples:
+        search(query="nonce ajax")
+        search(query="security audit", types="prompt,doc", limit=5)
+    """
+    if not query.strip():
+        return "Error: query is required. Use search_snippets or search_resources to browse without one."
+    
+    wanted = {t.strip().lower() for t in types.split(",") if t.strip()}
+    unknown = wanted - set(SEARCH_HIT_TYPES.values())
+    if unknown:
+        return f"Error: unknown type(s) {', '.join(sorted(unknown))}. Use: doc, snippet, prompt, catalog"
+    
+    corrected = _corrected_query(query)
+    hits = [(doc, score) for doc, score in search_index.search(query)
+            if not wanted or SEARCH_HIT_TYPES[doc.kind] in wanted]
+    
+    if not hits:
+        hint = f"**Did you mean:** `search(query=\"{corrected}\")`\n\n" if corrected else ""
+        return f"""# No Results Found
+
+**Query:** {query}
+**Types:** {', '.join(sorted(wanted)) or 'all'}
+
+{hint}Try broader search terms or fewer words.
+"""
+    
+    found = len(hits)
+    if limit > 0:
+        hits = hits[:limit]
+    
+    counts: Dict[str, int] = {}
+    for doc, _ in hits:
+        counts[SEARCH_HIT_TYPES[doc.kind]] = counts.get(SEARCH_HIT_TYPES[doc.kind], 0) + 1
+    
+    output = "# Search Results\n\n"
+    if len(hits) < found:
+        output += f"**Showing top {len(hits)} of {found} hit(s)**"
+    else:
+        output += f"**Found {found} hit(s)**"
+    output += " (" + ", ".join(f"{count} {hit_type}" for hit_type, count in sorted(counts.items())) + ")\n\n"
+    output += f"**Query:** {query}\n"
+    if corrected:
+        output += f"**Did you mean:** {corrected} (close matches included)\n"
+    output += "\n---\n\n"
+    
+    for rank, (doc, score) in enumerate(hits, 1):
+        hit_type = SEARCH_HIT_TYPES[doc.kind]
+        output += f"### {rank}. {doc.name} [{hit_type}]\n\n"
+        output += f"**Score:** {score:.2f}"
+        if doc.kind in ("resource", "snippet"):
+            output += f" | **Category:** {doc.category} | **Difficulty:** {doc.difficulty}"
+        output += "\n\n"
+        
+        if doc.use_case:
+            output += f"**{'Description' if doc.kind == 'prompt' else 'Use Case'}:** {doc.use_case}\n\n"
+        
+        if doc.tags:
+            output += f"**Tags:** {', '.join(doc.tags[:5])}\n\n"
+        
+        output += f"**URI:** `{doc.uri}`\n\n"
+        output += "---\n\n"
+    
+    return paged_response(output, max_bytes, cursor)
+
+# === SYMBOL INDEX ===
+
+SYMBOL_INDEX_VERSION = 1
+SYMBOL_KINDS = ("function", "hook", "class", "rest_route")
+
+_PHP_FENCES = frozenset(("php",))
+_JS_FENCES = frozenset(("js", "javascript", "jsx", "ts", "typescript", "tsx"))
+
+_PHP_HOOK_RE = re.compile(
+    r"\b(add_action|add_filter|remove_action|remove_filter|has_action|has_filter|did_action|"
+    r"do_action|do_action_ref_array|apply_filters|apply_filters_ref_array)\s*\(\s*(['\"])(.+?)\2"
+)
+_JS_HOOK_RE = re.compile(
+    r"\b(addAction|addFilter|removeAction|removeFilter|doAction|applyFilters)\s*\(\s*(['\"])(.+?)\2"
+)
+# Plain calls only: no $callables, ->methods, ::statics or namespaced names
+_PHP_CALL_RE = re.compile(r"(?<![\w$>:\\])([a-z_][a-z0-9_]*)\s*\(")
+_PHP_CLASS_RES = (
+    (re.compile(r"^\s*(?:abstract\s+|final\s+)?class\s+([A-Za-z_]\w*)"), "class"),
+    (re.compile(r"\bextends\s+\\?([A-Za-z_][\w\\]*)"), "extends"),
+    (re.compile(r"\bnew\s+\\?([A-Z][\w\\]*)"), "new"),
+    (re.compile(r"(?<![\w$\\])([A-Z][A-Za-z0-9_]*)::"), "static"),
+)
+_REST_ROUTE_RE = re.compile(r"\bregister_rest_route\s*\(\s*(?:(['\"])(.+?)\1|[^,]+?)\s*,\s*(['\"])(.+?)\3")
+_CORE_ROUTE_RE = re.compile(r"['\"`](?:/wp-json)?/?(wp/v2/[\w/-]*)")
+_PHP_CONSTRUCTS = frozenset(
+    "if elseif else for foreach while switch match array list isset empty unset return echo print "
+    "function fn require require_once include include_once die exit catch and or not new use "
+    "declare eval clone self parent static".split()
+)
+
+def normalize_symbol(name: str) -> str:
+    """Canonical lookup key: no call parentheses, leading namespace separator or route slashes."""
+    name = name.strip().strip("`")
+    if name.endswith("()"):
+        name = name[:-2]
+    name = name.lstrip("\\")
+    if "/" in name:
+        name = name.strip("/")
+        if name.startswith("wp-json/"):
+            name = name[len("wp-json/"):]
+    return name
+
+def extract_symbols(content: str) -> List[Tuple[str, str, int, str]]:
+    """
+    ``(kind, name, line, role)`` for every WordPress symbol in the fenced
+    PHP and JavaScript code blocks of a markdown document. ``line`` is
+    1-based within the document; ``role`` is how the symbol is used, e.g.
+    ``add_action``, ``call``, ``new`` or ``register_rest_route``.
+    """
+    found = []
+    language = None
+    for number, line in enumerate(content.split("\n"), 1):
+        fence = _FENCE_RE.match(line)
+        if fence:
+            language = None if language is not None else (fence.group(1).lower() or "text")
+            continue
+        if language in _PHP_FENCES:
+            for match in _PHP_HOOK_RE.finditer(line):
+                found.append(("hook", match.group(3), number, match.group(1)))
+            for match in _PHP_CALL_RE.finditer(line):
+                name = match.group(1)
+                if name not in _PHP_CONSTRUCTS and not line[:match.start()].rstrip().endswith("function"):
+                    found.append(("function", name, number, "call"))
+            for regex, role in _PHP_CLASS_RES:
+                for match in regex.finditer(line):
+                    if match.group(1) not in _PHP_CONSTRUCTS:
+                        found.append(("class", match.group(1).lstrip("\\"), number, role))
+            for match in _REST_ROUTE_RE.finditer(line):
+                namespace = f"{match.group(2).strip('/')}/" if match.group(2) else ""
+                found.append(("rest_route", namespace + match.group(4).strip("/"), number, "register_rest_route"))
+        elif language in _JS_FENCES:
+            for match in _JS_HOOK_RE.finditer(line):
+                found.append(("hook", match.group(3), number, match.group(1)))
+        if language in _PHP_FENCES or language in _JS_FENCES:
+            for match in _CORE_ROUTE_RE.finditer(line):
+                found.append(("rest_route", match.group(1).rstrip("/"), number, "request"))
+    return found
+
+class SymbolIndex:
+    """
+    Functions, hooks, classes and REST routes used in the code blocks of
+    every resource and snippet.
+
+    ``symbols`` maps a symbol name to ``[kind, path, line, role]`` rows in
+    document order. Rebuilt when the metadata registry's generation
+    changes, or adopted from the content bundle when its fingerprint
+    still matches.
+    """
+
+    def __init__(self, registry: MetadataRegistry):
+        self.registry = registry
+        self.symbols: Dict[str, List[list]] = {}
+        self.names: List[str] = []
+        self._folded: Dict[str, List[str]] = {}
+        self.fingerprint: Optional[str] = None
+        self.generation = -1
+        self.built_from = None
+        self._lock = threading.Lock()
+
+    def ensure_current(self):
+        self.registry.refresh()
+        if self.generation == self.registry.generation:
+            return
+        with self._lock:
+            generation = self.registry.generation
+            if self.generation == generation:
+                return
+            fingerprint = self.registry.fingerprint(f"symbols{SYMBOL_INDEX_VERSION}")
+            if fingerprint != self.fingerprint:
+                bundle = self.registry.store.bundle
+                data = bundle.section('symbol_index') if bundle is not None else None
+                if data and data.get('version') == SYMBOL_INDEX_VERSION and data.get('fingerprint') == fingerprint:
+                    self.symbols = data['symbols']
+                    self.built_from = "bundle"
+                else:
+                    self.symbols = self._build()
+                    self.built_from = "source"
+                self.names = sorted(self.symbols)
+                self._folded = {}
+                for name in self.names:
+                    self._folded.setdefault(name.lower(), []).append(name)
+                self.fingerprint = fingerprint
+            self.generation = generation
+
+    def _build(self) -> Dict[str, List[list]]:
+        symbols: Dict[str, List[list]] = {}
+        for record in self.registry.records():
+            if record.kind not in ("resource", "snippet"):
+                continue
+            try:
+                content = content_store.get(self.registry.root / record.path)
+            except (OSError, UnicodeDecodeError):
+                continue
+            for kind, name, line, role in extract_symbols(content):
+                symbols.setdefault(name, []).append([kind, record.path, line, role])
+        logger.info(f"Symbol index built: {len(symbols)} symbols")
+        return symbols
+
+    def lookup(self, name: str, kind: Optional[str] = None) -> Tuple[str, List[list]]:
+        """
+        ``(matched_name, rows)`` for ``name``: an exact match, else a
+        case-insensitive one. Rows are filtered to ``kind`` if given.
+        """
+        self.ensure_current()
+        key = normalize_symbol(name)
+        matched = key if key in self.symbols else next(iter(self._folded.get(key.lower(), [])), None)
+        if matched is None:
+            return key, []
+        rows = self.symbols[matched]
+        return matched, [row for row in rows if kind is None or row[0] == kind]
+
+    def suggest(self, name: str, limit: int = 8) -> List[str]:
+        """Symbol names starting with ``name``, else within max_edit_distance() of it."""
+        self.ensure_current()
+        key = normalize_symbol(name)
+        start = bisect.bisect_left(self.names, key)
+        matches = []
+        for candidate in self.names[start:start + limit]:
+            if not candidate.startswith(key):
+                break
+            matches.append(candidate)
+        if matches or not max_edit_distance(key):
+            return matches
+        max_edits = max_edit_distance(key)
+        close = [(edit_distance(key.lower(), candidate.lower(), max_edits), candidate) for candidate in self.names
+                 if abs(len(candidate) - len(key)) <= max_edits]
+        return [candidate for edits, candidate in sorted(close) if edits <= max_edits][:limit]
+
+    def serialize(self) -> Dict[str, Any]:
+        return {'version': SYMBOL_INDEX_VERSION, 'fingerprint': self.fingerprint, 'symbols': self.symbols}
+
+    def stats(self) -> Dict[str, Any]:
+        counts = {kind: 0 for kind in SYMBOL_KINDS}
+        for rows in self.symbols.values():
+            for kind in {row[0] for row in rows}:
+                counts[kind] += 1
+        return {"symbols": len(self.symbols), "by_kind": counts, "built_from": self.built_from}
+
+symbol_index = SymbolIndex(metadata_registry)
+
+@mcp.tool()
+def lookup_symbol(name: str, kind: str = "", limit: int = 50, max_bytes: int = 0, cursor: str = "") -> str:
+    """
+    Find where a WordPress function, hook, class or REST route is used in the resources
+    
+    Args:
+        name: Symbol to look up, e.g. "wp_enqueue_script", "save_post", "WP_Query", "wp/v2/posts"
+        kind: Restrict to one kind: function, hook, class, rest_route (default any)
+        limit: Maximum number of locations to list (0 for all)
+        max_bytes: Page size in bytes (0 for everything); longer output ends with a continuation cursor
+        cursor: Cursor printed at the end of the previous page, to continue from there
+    
+    Returns:
+        Every resource and snippet whose code blocks use the symbol, with line numbers and the matching line
+        
+    Examples:
+        lookup_symbol(name="save_post")
+        lookup_symbol(name="wp_enqueue_script", limit=10)
+        lookup_symbol(name="WP_REST_Controller", kind="class")
+    """
+    if not name.strip():
+        return "Error: name is required"
+    if kind and kind not in SYMBOL_KINDS:
+        return f"Error: kind must be one of: {', '.join(SYMBOL_KINDS)}"
+    
+    matched, rows = symbol_index.lookup(name, kind or None)
+    if not rows:
+        suggestions = symbol_index.suggest(name)
+        output = f"# Symbol Not Found: `{matched}`\n\n"
+        if kind:
+            output += f"No `{kind}` named `{matched}` appears in any code block.\n\n"
+        else:
+            output += f"`{matched}` does not appear in any code block.\n\n"
+        if suggestions:
+            output += "**Did you mean:**\n" + "".join(f"- `{suggestion}`\n" for suggestion in suggestions)
+            output += "\n"
+        output += "Use `search(query=...)` for a full-text search instead.\n"
+        return output
+    
+    found = len(rows)
+    files = len({row[1] for row in rows})
+    if limit > 0:
+        rows = rows[:limit]
+    
+    by_path: Dict[str, List[list]] = {}
+    for row in rows:
+        by_path.setdefault(row[1], []).append(row)
+    kinds = sorted({row[0] for row in rows})
+    
+    output = f"# Symbol: `{matched}`\n\n"
+    output += f"**Kind:** {', '.join(kinds)} | **Occurrences:** {found} in {files} file(s)\n\n"
+    if len(rows) < found:
+        output += f"**Showing first {len(rows)} of {found} occurrence(s)**\n\n"
+    output += "---\n\n"
+    
+    for path, path_rows in by_path.items():
+        record = metadata_registry.get(path)
+        try:
+            lines = content_store.get(RESOURCES_DIR / path).split("\n")
+        except FileNotFoundError:
+            lines = []
+        output += f"## `{record.uri if record else path}`\n\n"
+        for _, _, line, role in path_rows:
+            text = lines[line - 1].strip() if line <= len(lines) else ""
+            if len(text) > 120:
+                text = text[:117] + "..."
+            output += f"- **Line {line}** ({role}): `{text}`\n"
+        output += "\n"
+    
+    return paged_response(output, max_bytes, cursor)
 
 # === MCP PROMPTS ===
 
@@ -1824,17 +3338,472 @@ add_filter( 'rest_authentication_errors', function( $result ) {
 I'll provide specific hardening steps for your site. What's your current security concern?
 """
 
-# === MCP TOOLS IMPLEMENTATION ===
+# === MANAGEMENT TOOL RUNNERS ===
+
+# Run management tools in a child Python process (slower, but isolated from the server)
+TOOL_ISOLATION = os.environ.get("WORDPRESS_MCP_TOOL_ISOLATION", "").lower() in ("1", "true", "yes")
+
+class ToolResult:
+    """Structured outcome of an in-process management tool call."""
+    __slots__ = ("success", "data", "output")
+
+    def __init__(self, success: bool, data: Any = None, output: Optional[List[str]] = None):
+        self.success = success
+        self.data = data
+        self.output = output if output is not None else []
+
+    def text(self) -> str:
+        """Log lines followed by the JSON-encoded result data, if any."""
+        parts = list(self.output)
+        if self.data is not None and not isinstance(self.data, bool):
+            parts.append(json.dumps(self.data, indent=2, default=str))
+        return "\n".join(parts)
+
+def _import_tool(module_name: str):
+    """Import a module from the tools package next to this file."""
+    server_dir = str(Path(__file__).parent)
+    if server_dir not in sys.path:
+        sys.path.insert(0, server_dir)
+    return importlib.import_module(f"tools.{module_name}")
+
+def _run_each(func, targets: List[str]) -> Tuple[bool, Dict[str, bool]]:
+    """Apply a per-item tool method and report overall success plus per-item results."""
+    results = {target: bool(func(target)) for target in targets}
+    return all(results.values()), results
+
+def run_plugin_manager(wp_path: str, action: str, plugin: str = None, plugins: list = None,
+                       activate: bool = False, status: str = "all", limit: int = 10,
+                       query: str = None) -> ToolResult:
+    """Run a plugin_manager action in-process."""
+    PluginManager = _import_tool("plugin_manager").PluginManager
+
+    output: List[str] = []
+    manager = PluginManager(wp_path, log=output.append)
+    targets = [plugin] if plugin else list(plugins or [])
+
+    def install(slug: str) -> bool:
+        if slug.endswith('.zip'):
+            return manager.install_from_zip(slug, activate)
+        if slug.startswith(('http://', 'https://')):
+            return manager.install_from_url(slug, activate)
+        return manager.install_plugin(slug, activate)
+
+    if action == "list":
+        return ToolResult(True, manager.list_plugins(status), output)
+    if action == "search":
+        return ToolResult(True, manager.search_plugins(query, limit), output)
+    if action == "health":
+        return ToolResult(True, manager.get_plugin_health(), output)
+    if action == "update" and not targets:
+        return ToolResult(manager.update_plugin(), None, output)
+
+    per_item = {
+        "install": install,
+        "activate": manager.activate_plugin,
+        "deactivate": manager.deactivate_plugin,
+        "uninstall": manager.uninstall_plugin,
+        "update": manager.update_plugin,
+    }
+    if action not in per_item:
+        return ToolResult(False, None, [f"Unknown plugin action: {action}"])
+    success, results = _run_each(per_item[action], targets)
+    return ToolResult(success, results, output)
+
+def run_theme_customizer(wp_path: str, action: str, theme: str = None, themes: list = None,
+                         parent: str = None, child_name: str = None, child_slug: str = None,
+                         status: str = "all", limit: int = 10, query: str = None,
+                         mod_key: str = None, mod_value: str = None, content: str = None,
+                         output_file: str = None) -> ToolResult:
+    """Run a theme_customizer action in-process."""
+    ThemeCustomizer = _import_tool("theme_customizer").ThemeCustomizer
+
+    output: List[str] = []
+    customizer = ThemeCustomizer(wp_path, log=output.append)
+    targets = [theme] if theme else list(themes or [])
+
+    def install(slug: str) -> bool:
+        if slug.endswith('.zip'):
+            return customizer.install_from_zip(slug)
+        if slug.startswith(('http://', 'https://')):
+            return customizer.install_from_url(slug)
+        return customizer.install_theme(slug)
+
+    if action == "list":
+        return ToolResult(True, customizer.list_themes(status), output)
+    if action == "search":
+        return ToolResult(True, customizer.search_themes(query, limit), output)
+    if action == "health":
+        return ToolResult(True, customizer.get_theme_health(), output)
+    if action == "child":
+        return ToolResult(customizer.create_child_theme(parent, child_name, child_slug), None, output)
+    if action == "mod":
+        if mod_key and mod_value:
+            return ToolResult(customizer.set_theme_mod(mod_key, mod_value), None, output)
+        if mod_key:
+            value = customizer.get_theme_mod(mod_key)
+            return ToolResult(value is not None, {mod_key: value}, output)
+        return ToolResult(True, customizer.list_theme_mods(), output)
+    if action == "css":
+        return ToolResult(customizer.create_custom_css(content, output_file), None, output)
+    if action == "update" and not targets:
+        return ToolResult(customizer.update_theme(), None, output)
+
+    per_item = {
+        "install": install,
+        "activate": customizer.activate_theme,
+        "delete": customizer.delete_theme,
+        "update": customizer.update_theme,
+    }
+    if action not in per_item:
+        return ToolResult(False, None, [f"Unknown theme action: {action}"])
+    success, results = _run_each(per_item[action], targets)
+    return ToolResult(success, results, output)
+
+def run_database_manager(wp_path: str, action: str, table: str = None, output_file: str = None,
+                         backup: str = None, compress: bool = False, search: str = None,
+                         replace: str = None, execute: bool = False, sql: str = None,
+                         lines: Optional[List[str]] = None) -> ToolResult:
+    """Run a database_manager action in-process (log lines go to ``lines`` if given)."""
+    DatabaseManager = _import_tool("database_manager").DatabaseManager
+
+    output: List[str] = [] if lines is None else lines
+    db_manager = DatabaseManager(wp_path, log=output.append)
+
+    if action == "info":
+        return ToolResult(True, db_manager.get_database_info(), output)
+    if action == "tables":
+        return ToolResult(True, db_manager.list_tables(), output)
+    if action == "table-info":
+        return ToolResult(True, db_manager.get_table_info(table), output)
+    if action == "backup":
+        return ToolResult(db_manager.backup_database(output_file, compress), None, output)
+    if action == "restore":
+        return ToolResult(db_manager.restore_database(backup), None, output)
+    if action == "optimize":
+        return ToolResult(db_manager.optimize_database(), None, output)
+    if action == "repair":
+        return ToolResult(db_manager.repair_database(), None, output)
+    if action == "clean":
+        return ToolResult(db_manager.clean_database(), None, output)
+    if action == "search-replace":
+        return ToolResult(db_manager.search_replace(search, replace, not execute), None, output)
+    if action == "query":
+        return ToolResult(True, [list(row) for row in db_manager.query_database(sql)], output)
+    return ToolResult(False, None, [f"Unknown database action: {action}"])
+
+def run_backup_tool(wp_path: str, action: str, output_file: str = None, backup: str = None,
+                    target: str = None, directory: str = None, compress: bool = False,
+                    lines: Optional[List[str]] = None) -> ToolResult:
+    """Run a backup_tool action in-process (log lines go to ``lines`` if given)."""
+    WordPressBackup = _import_tool("backup_tool").WordPressBackup
+
+    output: List[str] = [] if lines is None else lines
+    backup_tool = WordPressBackup(wp_path, log=output.append)
+
+    if action == "backup":
+        return ToolResult(backup_tool.create_full_backup(output_file, compress), None, output)
+    if action == "restore":
+        return ToolResult(backup_tool.restore_backup(backup, target), None, output)
+    if action == "list":
+        return ToolResult(True, backup_tool.list_backups(directory), output)
+    if action == "verify":
+        return ToolResult(backup_tool.verify_backup(backup), None, output)
+    if action == "info":
+        return ToolResult(True, backup_tool.get_backup_info(), output)
+    return ToolResult(False, None, [f"Unknown backup action: {action}"])
+
+def run_wordpress_installer(target_dir: str, version: str = "latest", config: Dict[str, str] = None,
+                            plugins: list = None, themes: list = None,
+                            lines: Optional[List[str]] = None) -> ToolResult:
+    """Run a full WordPress installation in-process (log lines go to ``lines`` if given)."""
+    WordPressInstaller = _import_tool("wordpress_installer").WordPressInstaller
+
+    output: List[str] = [] if lines is None else lines
+    installer = WordPressInstaller(log=output.append)
+    installer.wordpress_version = version
+    full_config = installer.default_config.copy()
+    full_config.update(config or {})
+    success = installer.full_install(target_dir, full_config, plugins, themes)
+    return ToolResult(success, None, output)
+
+# === TOOL EXECUTION LIMITS ===
+
+# Concurrent calls allowed per management tool and hard timeout in seconds
+TOOL_LIMITS: Dict[str, Tuple[int, float]] = {
+    "wordpress_installer": (1, 1800.0),
+    "backup_tool": (1, 3600.0),
+    "database_manager": (2, 1800.0),
+    "plugin_manager": (4, 600.0),
+    "theme_customizer": (4, 600.0),
+}
 
-@mcp.tool()
-def wordpress_installer(target_dir: str, version: str = "latest", site_url: str = "http://localhost", 
-                       site_title: str = "My WordPress Site", admin_user: str = "admin", 
-                       admin_pass: str = "admin", admin_email: str = "admin@example.com",
-                       db_host: str = "localhost", db_name: str = "wordpress", 
+class ToolLimiter:
+    """
+    Runs management tools off the event loop with a concurrency cap and a
+    hard timeout per tool, so resource reads and searches are never queued
+    behind a backup or install.
+
+    In-process calls run on a dedicated thread pool inside a WP-CLI
+    execution scope; on timeout or cancellation the scope kills any running
+    WP-CLI child and the slot is only released once the worker returns.
+    Isolated calls run through asyncio subprocesses and are killed outright.
+    """
+    __slots__ = ("limits", "_semaphores", "_executor", "_active", "timeouts", "cancellations")
+
+    def __init__(self, limits: Dict[str, Tuple[int, float]]):
+        self.limits = limits
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._executor = ThreadPoolExecutor(max_workers=sum(slots for slots, _ in limits.values()),
+                                            thread_name_prefix="mcp-tool")
+        self._active: Dict[str, int] = {name: 0 for name in limits}
+        self.timeouts = 0
+        self.cancellations = 0
+
+    def _semaphore(self, name: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(name)
+        if semaphore is None:
+            semaphore = self._semaphores[name] = asyncio.Semaphore(self.limits[name][0])
+        return semaphore
+
+    def _release(self, name: str):
+        self._active[name] -= 1
+        self._semaphore(name).release()
+
+    async def run(self, name: str, func, *args) -> ToolResult:
+        """Run ``func(*args)`` (returning a ToolResult) on the tool thread pool."""
+        wp_cli = _import_tool("wp_cli")
+        timeout = self.limits[name][1]
+        await self._semaphore(name).acquire()
+        self._active[name] += 1
+
+        scope = wp_cli.ExecutionScope(timeout)
+
+        def work():
+            with wp_cli.execution_scope(scope):
+                return func(*args)
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._executor, work)
+        except BaseException:
+            self._release(name)
+            raise
+        future.add_done_callback(lambda _: self._release(name))
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            scope.cancel()
+            self.timeouts += 1
+            logger.warning(f"{name} timed out after {timeout:.0f}s")
+            return ToolResult(False, None, [f"{name} timed out after {timeout:.0f} seconds"])
+        except asyncio.CancelledError:
+            scope.cancel()
+            self.cancellations += 1
+            logger.warning(f"{name} cancelled")
+            raise
+
+    async def run_process(self, name: str, cmd: List[str]) -> ToolResult:
+        """Run a tool script in a child Python process under the same limits."""
+        timeout = self.limits[name][1]
+        async with self._semaphore(name):
+            self._active[name] += 1
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd, cwd=os.path.dirname(os.path.abspath(__file__)),
+                    stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE)
+                try:
+                    stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+                except asyncio.TimeoutError:
+                    process.kill()
+                    await process.wait()
+                    self.timeouts += 1
+                    logger.warning(f"{name} subprocess timed out after {timeout:.0f}s")
+                    return ToolResult(False, None, [f"{name} timed out after {timeout:.0f} seconds"])
+                except asyncio.CancelledError:
+                    process.kill()
+                    self.cancellations += 1
+                    raise
+            finally:
+                self._active[name] -= 1
+
+        success = process.returncode == 0
+        return ToolResult(success, None, [(stdout if success else stderr).decode(errors="replace")])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": dict(self._active),
+            "limits": {name: {"concurrency": slots, "timeout": timeout}
+                       for name, (slots, timeout) in self.limits.items()},
+            "timeouts": self.timeouts,
+            "cancellations": self.cancellations,
+        }
+
+tool_limiter = ToolLimiter(TOOL_LIMITS)
+
+# === BACKGROUND JOBS ===
+
+# Worker threads for background jobs, separate from the request-serving tool pool
+JOB_WORKERS = int(os.environ.get("WORDPRESS_MCP_JOB_WORKERS", "2"))
+JOB_HISTORY = 50
+
+class Job:
+    """A management tool call running (or queued) on the background job pool."""
+    __slots__ = ("id", "tool", "action", "status", "created_at", "started_at", "finished_at",
+                 "scope", "lines", "result", "future", "timed_out")
+
+    def __init__(self, job_id: str, tool: str, action: str, scope):
+        self.id = job_id
+        self.tool = tool
+        self.action = action
+        self.status = "queued"
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.scope = scope
+        self.lines: List[str] = []
+        self.result: Optional[ToolResult] = None
+        self.future = None
+        self.timed_out = False
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("succeeded", "failed", "cancelled", "timed out")
+
+    def elapsed(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+class JobManager:
+    """
+    Runs long management tool calls in the background. A job streams its
+    log lines and progress counters (bytes archived, tables dumped, plugins
+    installed, ...) while it runs, and can be cancelled at any point: the
+    job's execution scope kills running WP-CLI or tool processes and the
+    tool code stops at its next cancellation check.
+    """
+    __slots__ = ("_executor", "_jobs", "_lock", "history")
+
+    def __init__(self, max_workers: int, history: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-job")
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self.history = history
+
+    def _create(self, tool: str, action: str) -> Job:
+        wp_cli = _import_tool("wp_cli")
+        job = Job(hashlib.sha1(os.urandom(16)).hexdigest()[:12], tool, action, wp_cli.ExecutionScope())
+        with self._lock:
+            self._jobs[job.id] = job
+            finished = [j for j in self._jobs.values() if j.finished]
+            for old in finished[:max(len(finished) - self.history, 0)]:
+                del self._jobs[old.id]
+        return job
+
+    def submit(self, tool: str, action: str, func, *args) -> Job:
+        """Run ``func(*args, lines=job.lines)`` (returning a ToolResult) as a job."""
+        job = self._create(tool, action)
+        job.future = self._executor.submit(self._run, job, lambda: func(*args, lines=job.lines))
+        return job
+
+    def submit_script(self, tool: str, action: str, cmd: List[str]) -> Job:
+        """Run a tool script in a child process as a job, streaming its output."""
+        job = self._create(tool, action)
+        job.future = self._executor.submit(self._run, job, lambda: self._run_script(job, cmd))
+        return job
+
+    def _run_script(self, job: Job, cmd: List[str]) -> ToolResult:
+        import subprocess
+
+        process = subprocess.Popen(cmd, cwd=os.path.dirname(os.path.abspath(__file__)),
+                                   stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+        job.scope.register(process)
+        try:
+            for line in process.stdout:
+                job.lines.append(line.rstrip("\n"))
+            process.wait()
+        finally:
+            job.scope.unregister(process)
+        return ToolResult(process.returncode == 0, None, job.lines)
+
+    def _expire(self, job: Job):
+        job.timed_out = True
+        job.scope.cancel()
+
+    def _run(self, job: Job, work):
+        wp_cli = _import_tool("wp_cli")
+        if job.scope.cancelled.is_set():
+            job.status = "cancelled"
+            job.finished_at = time.time()
+            return
+        timeout = TOOL_LIMITS[job.tool][1]
+        job.status = "running"
+        job.started_at = time.time()
+        # The deadline counts from the start of the run, not from the time the job was queued
+        job.scope.deadline = time.monotonic() + timeout
+        timer = threading.Timer(timeout, self._expire, (job,))
+        timer.daemon = True
+        timer.start()
+        try:
+            with wp_cli.execution_scope(job.scope):
+                job.result = work()
+            if job.timed_out:
+                job.status = "timed out"
+            elif job.scope.cancelled.is_set():
+                job.status = "cancelled"
+            elif job.scope.expired():
+                job.timed_out = True
+                job.status = "timed out"
+            else:
+                job.status = "succeeded" if job.result.success else "failed"
+        except Exception as e:
+            job.lines.append(f"Error: {e}")
+            job.status = "failed"
+            logger.warning(f"Job {job.id} ({job.tool} {job.action}) failed: {e}")
+        finally:
+            timer.cancel()
+            job.finished_at = time.time()
+        logger.info(f"Job {job.id} ({job.tool} {job.action}) {job.status} in {job.elapsed():.1f}s")
+
+    def get(self, job_id: str) -> Optional[Job]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> Optional[Job]:
+        job = self._jobs.get(job_id)
+        if job is not None and not job.finished:
+            job.scope.cancel()
+            if job.future is not None and job.future.cancel():
+                job.status = "cancelled"
+                job.finished_at = time.time()
+        return job
+
+    def jobs(self) -> List[Job]:
+        with self._lock:
+            return list(self._jobs.values())
+
+job_manager = JobManager(JOB_WORKERS, JOB_HISTORY)
+
+def _job_started(job: Job) -> str:
+    return (f"Started background job `{job.id}` ({job.tool} {job.action})\n"
+            f"Poll progress with `job_status(\"{job.id}\")` or stop it with `cancel_job(\"{job.id}\")`.")
+
+# === MCP TOOLS IMPLEMENTATION ===
+
+@mcp.tool()
+async def wordpress_installer(target_dir: str, version: str = "latest", site_url: str = "http://localhost", 
+                       site_title: str = "My WordPress Site", admin_user: str = "admin", 
+                       admin_pass: str = "admin", admin_email: str = "admin@example.com",
+                       db_host: str = "localhost", db_name: str = "wordpress", 
                        db_user: str = "root", db_pass: str = "", plugins: list = None, 
-                       themes: list = None) -> str:
-    """Install WordPress with custom configuration and optional plugins/themes"""
-    import subprocess
+                       themes: list = None, isolated: bool = False, background: bool = False) -> str:
+    """
+    Install WordPress with custom configuration and optional plugins/themes
+    
+    Runs in-process by default; set isolated=True (or WORDPRESS_MCP_TOOL_ISOLATION=1)
+    to run the tool script in a separate Python process. With background=True the
+    install runs as a job and a job id is returned immediately (see job_status).
+    """
     import sys
     
     try:
@@ -1858,22 +3827,40 @@ def wordpress_installer(target_dir: str, version: str = "latest", site_url: str
         if themes:
             cmd.extend(["--themes"] + themes)
         
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.path.dirname(__file__))
+        config = {
+            'site_url': site_url, 'site_title': site_title,
+            'admin_user': admin_user, 'admin_pass': admin_pass, 'admin_email': admin_email,
+            'db_host': db_host, 'db_name': db_name, 'db_user': db_user, 'db_pass': db_pass
+        }
+        
+        if background:
+            if isolated or TOOL_ISOLATION:
+                job = job_manager.submit_script("wordpress_installer", "install", cmd)
+            else:
+                job = job_manager.submit("wordpress_installer", "install", run_wordpress_installer,
+                                         target_dir, version, config, plugins, themes)
+            return _job_started(job)
+        
+        if isolated or TOOL_ISOLATION:
+            result = await tool_limiter.run_process("wordpress_installer", cmd)
+        else:
+            result = await tool_limiter.run("wordpress_installer", run_wordpress_installer,
+                                           target_dir, version, config, plugins, themes)
+        success, output = result.success, result.text()
         
-        if result.returncode == 0:
-            return f"WordPress installed successfully in {target_dir}\nOutput: {result.stdout}"
+        if success:
+            return f"WordPress installed successfully in {target_dir}\nOutput: {output}"
         else:
-            return f"WordPress installation failed: {result.stderr}"
+            return f"WordPress installation failed: {output}"
             
     except Exception as e:
         return f"Error running WordPress installer: {str(e)}"
 
 @mcp.tool()
-def plugin_manager(wp_path: str, action: str, plugin: str = None, plugins: list = None, 
+async def plugin_manager(wp_path: str, action: str, plugin: str = None, plugins: list = None, 
                   activate: bool = False, status: str = "all", limit: int = 10, 
-                  query: str = None) -> str:
-    """Manage WordPress plugins - install, activate, deactivate, search, list"""
-    import subprocess
+                  query: str = None, isolated: bool = False) -> str:
+    """Manage WordPress plugins - install, activate, deactivate, search, list (isolated=True runs in a subprocess)"""
     import sys
     
     try:
@@ -1897,12 +3884,17 @@ def plugin_manager(wp_path: str, action: str, plugin: str = None, plugins: list
             else:
                 return f"Plugin name or list is required for {action} action"
         
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.path.dirname(__file__))
+        if isolated or TOOL_ISOLATION:
+            result = await tool_limiter.run_process("plugin_manager", cmd)
+        else:
+            result = await tool_limiter.run("plugin_manager", run_plugin_manager, wp_path, action,
+                                           plugin, plugins, activate, status, limit, query)
+        success, output = result.success, result.text()
         
-        if result.returncode == 0:
-            return f"Plugin management completed successfully\nOutput: {result.stdout}"
+        if success:
+            return f"Plugin management completed successfully\nOutput: {output}"
         else:
-            return f"Plugin management failed: {result.stderr}"
+            return f"Plugin management failed: {output}"
             
     except Exception as e:
         return f"Error running plugin manager: {str(e)}"
@@ -2398,25 +4390,36 @@ def get_server_status() -> str:
     - Version and deployment status
     - Current capabilities and statistics
     - Recent changes and updates
-    - Health check results
+    - Startup readiness checks
     """
     try:
-        # Get current statistics
+        # Live counts from the capability registry snapshot (no directory walk)
+        live = capability_registry.stats()
         stats = CURRENT_STATS.copy()
+        stats.update({
+            "tools_count": live["tools"],
+            "resources_count": live["resources"],
+            "prompts_count": live["prompts"],
+            "snippets_count": live["snippets"],
+            "total_files": live["total_files"],
+        })
         
-        # Add real-time counts
-        try:
-            resource_files = list(RESOURCES_DIR.glob("**/*.md"))
-            doc_files = [f for f in resource_files if "snippets" not in str(f)]
-            snippet_files = [f for f in resource_files if "snippets" in str(f)]
-            
-            stats["actual_resources"] = len(doc_files)
-            stats["actual_snippets"] = len(snippet_files)
-            stats["actual_total_files"] = len(resource_files)
-        except Exception:
-            stats["actual_resources"] = "Unable to count"
-            stats["actual_snippets"] = "Unable to count"
-            stats["actual_total_files"] = "Unable to count"
+        cache = content_store.stats()
+        source = (f"bundle {cache['bundle']['path']} (built {cache['bundle']['built_at']})"
+                  if cache['bundle'] else f"{RESOURCES_DIR} (revalidated every {cache['revalidate_interval']:g}s)")
+        tools = tool_limiter.stats()
+        running = ", ".join(f"{name} {count}/{tools['limits'][name]['concurrency']}"
+                            for name, count in tools["active"].items())
+        tool_list = "\n".join(f"{i}. `{c.name}` - {c.description}" for i, c in enumerate(
+            (c for c in capability_registry.capabilities() if c.kind == "tool"), 1))
+        readiness = server_state.readiness()
+        checks = "\n".join(f"- {'✅' if check['ok'] else '❌'} **{name}:** {check['detail']}"
+                           for name, check in readiness["checks"].items()) or "- Startup checks have not run yet"
+        verdict = {
+            "ready": "**Server is ready.** 🎉",
+            "starting": "**Server is still starting;** startup checks are running.",
+            "failed": "**Server is not ready:** a startup check failed (see Readiness).",
+        }[readiness["status"]]
         
         # Format response
         output = f"""# 🚀 WordPress MCP Server Status Report
@@ -2434,15 +4437,18 @@ def get_server_status() -> str:
 - **Snippets:** {stats['snippets_count']} (code examples with metadata)
 - **Total Files:** {stats['total_files']}
 
+## ⚡ Content Cache
+- **Source:** {source}
+- **Cached Files:** {cache['entries']} ({cache['bytes']:,} bytes)
+- **Hits / Misses / Reloads:** {cache['hits']} / {cache['misses']} / {cache['reloads']}
+- **Hit Rate:** {cache['hit_rate']:.1%}
+
+## 🧵 Management Tool Slots
+- **Running:** {running}
+- **Timeouts / Cancellations:** {tools['timeouts']} / {tools['cancellations']}
+
 ## 🔧 Available Tools
-1. `search_snippets` - Search and filter code snippets
-2. `search_resources` - Search and filter documentation
-3. `wordpress_installer` - Install WordPress instances
-4. `plugin_manager` - Manage WordPress plugins
-5. `generate_playground_blueprint` - Generate WordPress Playground blueprints
-6. `theme_customizer` - Manage WordPress themes
-7. `database_manager` - Manage WordPress database
-8. `backup_tool` - Create and manage backups
+{tool_list}
 
 ## 🎯 Key Features
 {chr(10).join(f"- {feature}" for feature in stats['features'])}
@@ -2450,11 +4456,8 @@ def get_server_status() -> str:
 ## 📋 Recent Changes (v{SERVER_VERSION})
 {chr(10).join(f"- {change}" for change in CHANGES_LOG[SERVER_VERSION]['changes'])}
 
-## 🔍 Health Check
-- ✅ Server syntax validated
-- ✅ All tools properly defined
-- ✅ Resources organized with metadata
-- ✅ Ready for production deployment
+## 🔍 Readiness ({readiness['status']})
+{checks}
 
 ## 📚 Usage Examples
 - `wordpress://catalog` - Browse all resources
@@ -2462,13 +4465,161 @@ def get_server_status() -> str:
 - `generate_playground_blueprint(blueprint_type="plugin-dev")` - Create dev environment
 - `search_resources(query="security")` - Find security resources
 
-**Server is fully operational and ready for use!** 🎉"""
+{verdict}"""
         
         return output
         
     except Exception as e:
         return f"Error getting server status: {str(e)}"
 
+@mcp.resource("wordpress://server/metrics")
+def get_server_metrics() -> str:
+    """Server Metrics - Live call counts, errors, latency percentiles and payload sizes per tool, resource and prompt"""
+    return request_metrics.render_markdown()
+
+if hasattr(mcp, "custom_route"):
+    @mcp.custom_route("/metrics", methods=["GET"])
+    async def prometheus_metrics(request):
+        """Prometheus text exposition of the request metrics (HTTP transports only)."""
+        from starlette.responses import PlainTextResponse
+        return PlainTextResponse(request_metrics.render_prometheus(),
+                                 media_type="text/plain; version=0.0.4; charset=utf-8")
+
+# === SAMPLING PROFILER ===
+
+PROFILE_MAX_SECONDS = 300
+PROFILE_MAX_STACKS = 500
+
+# Leaf frames of threads that are blocked waiting, not running (filtered unless include_idle=True)
+_IDLE_LEAVES = {
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("selectors.py", "select"),
+    ("queue.py", "get"),
+    ("handlers.py", "dequeue"),
+    ("thread.py", "_worker"),
+    ("socket.py", "accept"),
+    ("subprocess.py", "_communicate"),
+}
+
+class StackSampler:
+    """
+    Wall-clock sampling profiler for every thread in the process. Each tick
+    reads ``sys._current_frames()`` and folds the stacks into collapsed
+    form (``thread;outer;...;leaf count``), which flamegraph.pl and
+    speedscope read directly. Nothing is traced between ticks, so overhead
+    is proportional to the sampling rate, not to the work being profiled.
+    """
+    __slots__ = ("interval", "include_idle", "stacks", "self_counts", "total_counts", "samples", "ticks")
+
+    def __init__(self, interval: float, include_idle: bool = False):
+        self.interval = interval
+        self.include_idle = include_idle
+        self.stacks: Dict[str, int] = {}
+        self.self_counts: Dict[str, int] = {}
+        self.total_counts: Dict[str, int] = {}
+        self.samples = 0
+        self.ticks = 0
+
+    @staticmethod
+    def _label(code) -> str:
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+    def sample(self):
+        own = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        self.ticks += 1
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            leaf = frame.f_code
+            if not self.include_idle and (os.path.basename(leaf.co_filename), leaf.co_name) in _IDLE_LEAVES:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(self._label(frame.f_code))
+                frame = frame.f_back
+            labels.reverse()
+
+            key = ";".join([names.get(ident, f"thread-{ident}").replace(";", ":")] + labels)
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.self_counts[labels[-1]] = self.self_counts.get(labels[-1], 0) + 1
+            for label in set(labels):
+                self.total_counts[label] = self.total_counts.get(label, 0) + 1
+            self.samples += 1
+
+    def run(self, seconds: float):
+        deadline = time.perf_counter() + seconds
+        next_tick = time.perf_counter()
+        while next_tick < deadline:
+            self.sample()
+            next_tick += self.interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_tick = time.perf_counter()
+
+_profile_lock = threading.Lock()
+
+@mcp.tool()
+async def profile_server(seconds: float = 30, interval_ms: float = 10, top: int = 20,
+                         include_idle: bool = False) -> str:
+    """
+    Sample every thread of the running server for a bounded window and report hot code
+    
+    Args:
+        seconds: Sampling window (max 300); the server keeps serving requests meanwhile
+        interval_ms: Time between samples (min 1ms)
+        top: Number of functions to list by self and total samples
+        include_idle: Keep samples of threads blocked in waits/selects/queue gets
+    
+    Returns the top functions and flamegraph-ready collapsed stacks.
+    """
+    seconds = min(max(seconds, 0.1), PROFILE_MAX_SECONDS)
+    sampler = StackSampler(max(interval_ms, 1.0) / 1000.0, include_idle)
+    
+    if not _profile_lock.acquire(blocking=False):
+        return "Error: A profiling session is already running"
+    try:
+        started = time.perf_counter()
+        await asyncio.to_thread(sampler.run, seconds)
+        elapsed = time.perf_counter() - started
+    finally:
+        _profile_lock.release()
+    
+    def table(counts: Dict[str, int]) -> str:
+        rows = sorted(counts.items(), key=lambda item: -item[1])[:top]
+        return "\n".join(f"| {count} | {count / max(sampler.samples, 1):.1%} | `{label}` |" for label, count in rows)
+    
+    stacks = sorted(sampler.stacks.items(), key=lambda item: -item[1])
+    shown = stacks[:PROFILE_MAX_STACKS]
+    
+    result = f"""# 🔥 Server Profile
+
+- **Window:** {elapsed:.1f}s, {sampler.ticks} ticks every {sampler.interval * 1000:.0f}ms
+- **Samples:** {sampler.samples} ({'including' if include_idle else 'excluding'} idle threads)
+- **Distinct stacks:** {len(stacks)}
+
+## Top {top} Functions by Self Samples
+| Samples | Share | Function |
+|--------:|------:|----------|
+{table(sampler.self_counts)}
+
+## Top {top} Functions by Total Samples
+| Samples | Share | Function |
+|--------:|------:|----------|
+{table(sampler.total_counts)}
+
+## Collapsed Stacks
+Feed to `flamegraph.pl` or paste into speedscope.{f" Showing the {len(shown)} most frequent." if len(shown) < len(stacks) else ""}
+
+```
+{chr(10).join(f"{stack} {count}" for stack, count in shown)}
+```
+"""
+    return result
+
 @mcp.tool()
 def get_server_changelog(version: str = None) -> str:
     """
@@ -2522,8 +4673,16 @@ def get_server_changelog(version: str = None) -> str:
     except Exception as e:
         return f"Error getting changelog: {str(e)}"
 
+# The deep health check below is an explicit diagnostic: its report is reused for
+# HEALTH_CHECK_CACHE_SECONDS and it runs at most HEALTH_CHECK_RATE_LIMIT times a minute.
+# Probes should use /healthz and /readyz instead.
+HEALTH_CHECK_CACHE_SECONDS = 60
+HEALTH_CHECK_RATE_LIMIT = 6
+
+_health_report_cache: Dict[str, Any] = {"output": None, "checked_at": 0.0}
+
 @mcp.tool()
-def check_server_health() -> str:
+def check_server_health(force: bool = False) -> str:
     """
     Perform comprehensive health check on the server
     
@@ -2533,7 +4692,28 @@ def check_server_health() -> str:
     - Resource file integrity
     - Metadata consistency
     - File counts and organization
+    
+    The report, failed ones included, is cached for a minute; force=True
+    re-runs it. Every run is rate limited: past the limit the last report is
+    served, or an error if there is none.
+    For cheap probes use the /healthz (liveness) and /readyz (readiness) routes.
     """
+    cached = _health_report_cache["output"]
+    age = time.time() - _health_report_cache["checked_at"]
+    if cached is not None and not force and age < HEALTH_CHECK_CACHE_SECONDS:
+        return f"{cached}\n\n_Cached report from {age:.0f}s ago._"
+    if not security_manager.check_rate_limit("check_server_health", HEALTH_CHECK_RATE_LIMIT, 60):
+        if cached is not None:
+            return f"{cached}\n\n_Cached report from {age:.0f}s ago._"
+        return f"Error: {security_manager.secure_error_response('rate_limit_exceeded')}"
+    
+    output = _run_health_check()
+    _health_report_cache["output"] = output
+    _health_report_cache["checked_at"] = time.time()
+    return output
+
+def _run_health_check() -> str:
+    """The full (expensive) health check behind check_server_health."""
     try:
         health_results = []
         issues = []
@@ -2547,22 +4727,27 @@ def check_server_health() -> str:
         except Exception as e:
             issues.append(f"❌ Syntax error: {e}")
         
+        # Checks 2-4 use what FastMCP actually registered, not decorator strings in the source
+        metadata_registry.refresh(force=True)
+        capability_registry.build()
+        live = capability_registry.stats()
+        
         # Check 2: Tool definitions
-        tool_count = server_code.count('@mcp.tool()')
+        tool_count = live["tools"]
         if tool_count >= 8:
             health_results.append(f"✅ Tools properly defined ({tool_count} found)")
         else:
             issues.append(f"❌ Expected 8+ tools, found {tool_count}")
         
         # Check 3: Resource definitions
-        resource_count = server_code.count('@mcp.resource')
+        resource_count = live["resources"] + live["templates"]
         if resource_count >= 80:
             health_results.append(f"✅ Resources properly defined ({resource_count} found)")
         else:
             issues.append(f"❌ Expected 80+ resources, found {resource_count}")
         
         # Check 4: Prompt definitions
-        prompt_count = server_code.count('@mcp.prompt')
+        prompt_count = live["prompts"]
         if prompt_count >= 15:
             health_results.append(f"✅ Prompts properly defined ({prompt_count} found)")
         else:
@@ -2570,31 +4755,27 @@ def check_server_health() -> str:
         
         # Check 5: Resource files
         try:
-            resource_files = list(RESOURCES_DIR.glob("**/*.md"))
-            doc_files = [f for f in resource_files if "snippets" not in str(f)]
-            snippet_files = [f for f in resource_files if "snippets" in str(f)]
+            doc_count = live["total_files"] - live["snippets"]
+            snippet_count = live["snippets"]
             
-            if len(doc_files) >= 80:
-                health_results.append(f"✅ Documentation files present ({len(doc_files)} found)")
+            if doc_count >= 80:
+                health_results.append(f"✅ Documentation files present ({doc_count} found)")
             else:
-                issues.append(f"❌ Expected 80+ doc files, found {len(doc_files)}")
+                issues.append(f"❌ Expected 80+ doc files, found {doc_count}")
             
-            if len(snippet_files) >= 60:
-                health_results.append(f"✅ Snippet files present ({len(snippet_files)} found)")
+            if snippet_count >= 60:
+                health_results.append(f"✅ Snippet files present ({snippet_count} found)")
             else:
-                issues.append(f"❌ Expected 60+ snippet files, found {len(snippet_files)}")
+                issues.append(f"❌ Expected 60+ snippet files, found {snippet_count}")
                 
         except Exception as e:
             issues.append(f"❌ Error checking resource files: {e}")
         
         # Check 6: Metadata consistency
         try:
-            metadata_count = 0
-            for snippet_file in RESOURCES_DIR.glob("snippets/**/*.md"):
-                with open(snippet_file, 'r') as f:
-                    content = f.read()
-                if content.startswith('---') and 'difficulty:' in content:
-                    metadata_count += 1
+            metadata_count = sum(
+                1 for record in metadata_registry.records("snippet") if record.has_frontmatter
+            )
             
             if metadata_count >= 60:
                 health_results.append(f"✅ Snippet metadata consistent ({metadata_count} files)")
@@ -2633,13 +4814,12 @@ def check_server_health() -> str:
         return f"Error performing health check: {str(e)}"
 
 @mcp.tool()
-def theme_customizer(wp_path: str, action: str, theme: str = None, themes: list = None,
+async def theme_customizer(wp_path: str, action: str, theme: str = None, themes: list = None,
                     parent: str = None, child_name: str = None, child_slug: str = None,
                     status: str = "all", limit: int = 10, query: str = None,
                     mod_key: str = None, mod_value: str = None, content: str = None,
-                    output: str = None) -> str:
-    """Manage WordPress themes - install, activate, create child themes, customize"""
-    import subprocess
+                    output: str = None, isolated: bool = False) -> str:
+    """Manage WordPress themes - install, activate, create child themes, customize (isolated=True runs in a subprocess)"""
     import sys
     
     try:
@@ -2678,22 +4858,32 @@ def theme_customizer(wp_path: str, action: str, theme: str = None, themes: list
             if output:
                 cmd.extend(["--output", output])
         
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.path.dirname(__file__))
+        if isolated or TOOL_ISOLATION:
+            result = await tool_limiter.run_process("theme_customizer", cmd)
+        else:
+            result = await tool_limiter.run("theme_customizer", run_theme_customizer, wp_path, action,
+                                           theme, themes, parent, child_name, child_slug, status,
+                                           limit, query, mod_key, mod_value, content, output)
+        success, output = result.success, result.text()
         
-        if result.returncode == 0:
-            return f"Theme management completed successfully\nOutput: {result.stdout}"
+        if success:
+            return f"Theme management completed successfully\nOutput: {output}"
         else:
-            return f"Theme management failed: {result.stderr}"
+            return f"Theme management failed: {output}"
             
     except Exception as e:
         return f"Error running theme customizer: {str(e)}"
 
 @mcp.tool()
-def database_manager(wp_path: str, action: str, table: str = None, output: str = None,
+async def database_manager(wp_path: str, action: str, table: str = None, output: str = None,
                     backup: str = None, compress: bool = False, search: str = None,
-                    replace: str = None, execute: bool = False, sql: str = None) -> str:
-    """Manage WordPress database - backup, restore, optimize, query, search-replace"""
-    import subprocess
+                    replace: str = None, execute: bool = False, sql: str = None,
+                    isolated: bool = False, background: bool = False) -> str:
+    """
+    Manage WordPress database - backup, restore, optimize, query, search-replace
+    
+    isolated=True runs in a subprocess; background=True starts a job and returns its id.
+    """
     import sys
     
     try:
@@ -2724,21 +4914,38 @@ def database_manager(wp_path: str, action: str, table: str = None, output: str =
                 return "SQL query is required for query action"
             cmd.append(sql)
         
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.path.dirname(__file__))
+        if background:
+            if isolated or TOOL_ISOLATION:
+                job = job_manager.submit_script("database_manager", action, cmd)
+            else:
+                job = job_manager.submit("database_manager", action, run_database_manager, wp_path, action,
+                                         table, output, backup, compress, search, replace, execute, sql)
+            return _job_started(job)
+        
+        if isolated or TOOL_ISOLATION:
+            result = await tool_limiter.run_process("database_manager", cmd)
+        else:
+            result = await tool_limiter.run("database_manager", run_database_manager, wp_path, action,
+                                           table, output, backup, compress, search, replace, execute, sql)
+        success, output = result.success, result.text()
         
-        if result.returncode == 0:
-            return f"Database management completed successfully\nOutput: {result.stdout}"
+        if success:
+            return f"Database management completed successfully\nOutput: {output}"
         else:
-            return f"Database management failed: {result.stderr}"
+            return f"Database management failed: {output}"
             
     except Exception as e:
         return f"Error running database manager: {str(e)}"
 
 @mcp.tool()
-def backup_tool(wp_path: str, action: str, output: str = None, backup: str = None,
-               target: str = None, directory: str = None, compress: bool = False) -> str:
-    """Manage WordPress backups - create, restore, list, verify backups"""
-    import subprocess
+async def backup_tool(wp_path: str, action: str, output: str = None, backup: str = None,
+               target: str = None, directory: str = None, compress: bool = False,
+               isolated: bool = False, background: bool = False) -> str:
+    """
+    Manage WordPress backups - create, restore, list, verify backups
+    
+    isolated=True runs in a subprocess; background=True starts a job and returns its id.
+    """
     import sys
     
     try:
@@ -2765,16 +4972,89 @@ def backup_tool(wp_path: str, action: str, output: str = None, backup: str = Non
                 return "Backup file path is required for verify action"
             cmd.append(backup)
         
-        result = subprocess.run(cmd, capture_output=True, text=True, cwd=os.path.dirname(__file__))
+        if background:
+            if isolated or TOOL_ISOLATION:
+                job = job_manager.submit_script("backup_tool", action, cmd)
+            else:
+                job = job_manager.submit("backup_tool", action, run_backup_tool, wp_path, action,
+                                         output, backup, target, directory, compress)
+            return _job_started(job)
         
-        if result.returncode == 0:
-            return f"Backup operation completed successfully\nOutput: {result.stdout}"
+        if isolated or TOOL_ISOLATION:
+            result = await tool_limiter.run_process("backup_tool", cmd)
         else:
-            return f"Backup operation failed: {result.stderr}"
+            result = await tool_limiter.run("backup_tool", run_backup_tool, wp_path, action,
+                                           output, backup, target, directory, compress)
+        success, output = result.success, result.text()
+        
+        if success:
+            return f"Backup operation completed successfully\nOutput: {output}"
+        else:
+            return f"Backup operation failed: {output}"
             
     except Exception as e:
         return f"Error running backup tool: {str(e)}"
 
+@mcp.tool()
+def job_status(job_id: str, since: int = 0) -> str:
+    """
+    Show the status, progress counters and output of a background job.
+    
+    Pass the `since` value from the previous call to only get new output lines.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        return f"Error: Unknown job '{job_id}'"
+    
+    lines = job.lines[max(since, 0):]
+    end = max(since, 0) + len(lines)
+    progress = ", ".join(f"{name}={value:,}" for name, value in sorted(job.scope.counters.items()))
+    
+    result = f"""# 🧰 Job `{job.id}`
+
+- **Tool:** {job.tool} ({job.action})
+- **Status:** {job.status}
+- **Created:** {datetime.fromtimestamp(job.created_at).strftime('%Y-%m-%d %H:%M:%S')}
+- **Elapsed:** {job.elapsed():.1f}s
+- **Progress:** {progress or 'n/a'}
+
+## Output (lines {since + 1 if lines else end}-{end} of {len(job.lines)})
+"""
+    if lines:
+        result += "```\n" + "\n".join(lines) + "\n```\n"
+    
+    if job.finished and job.result is not None and job.result.data is not None \
+            and not isinstance(job.result.data, bool):
+        result += f"\n## Result\n```json\n{json.dumps(job.result.data, indent=2, default=str)}\n```\n"
+    
+    if not job.finished:
+        result += f"\nNext: `job_status(\"{job.id}\", since={end})`\n"
+    return result
+
+@mcp.tool()
+def cancel_job(job_id: str) -> str:
+    """Cancel a queued or running background job"""
+    job = job_manager.get(job_id)
+    if job is None:
+        return f"Error: Unknown job '{job_id}'"
+    if job.finished:
+        return f"Job `{job.id}` already {job.status}"
+    
+    job_manager.cancel(job_id)
+    return f"Cancellation requested for job `{job.id}` ({job.tool} {job.action}); status: {job.status}"
+
+@mcp.tool()
+def list_jobs() -> str:
+    """List recent background jobs"""
+    jobs = job_manager.jobs()
+    if not jobs:
+        return "No background jobs"
+    
+    result = f"# 🧰 Background Jobs ({len(jobs)})\n\n"
+    for job in reversed(jobs):
+        result += f"- `{job.id}` **{job.tool}** {job.action} - {job.status} ({job.elapsed():.1f}s, {len(job.lines)} lines)\n"
+    return result
+
 # === WORDPRESS HOSTING AND DEPLOYMENT ===
 
 @mcp.resource("wordpress://hosting/wordpress-hosting-providers")
@@ -2821,20 +5101,395 @@ def get_industry_tools() -> str:
     return load_resource_content("ecosystem", "industry-tools")
 # === MCP SERVER SECURITY ===
 
-import time
-import hashlib
+import atexit
 import hmac
-from typing import Optional, Dict, Any
+import inspect
+import logging.handlers
+import queue
+import sqlite3
+from collections import OrderedDict, deque
 from functools import wraps
 
+# Most client rate-limit windows kept in memory; least recently used ones are evicted first
+RATE_LIMIT_MAX_CLIENTS = int(os.environ.get("WORDPRESS_MCP_RATE_LIMIT_CLIENTS", "10000"))
+
+# Where rate-limit windows and API keys live: "memory" (per process) or "sqlite:/path/to/state.db"
+# (shared by every worker process on the host)
+STATE_BACKEND = os.environ.get("WORDPRESS_MCP_STATE_BACKEND", "memory")
+
+# Requests a worker reserves in a shared window per transaction (1 = one write per request)
+RATE_LIMIT_LEASE = int(os.environ.get("WORDPRESS_MCP_RATE_LIMIT_LEASE", "10"))
+
+# Limit applied to every resource read, per RESOURCE_RATE_WINDOW seconds (0 disables it)
+RESOURCE_RATE_LIMIT = int(os.environ.get("WORDPRESS_MCP_RESOURCE_RATE_LIMIT", "1200"))
+RESOURCE_RATE_WINDOW = 60
+
+class SlidingWindowLimiter:
+    """
+    Sliding-window rate limiter with bounded memory.
+
+    Each key's window is split into SLOTS slots of ``window / SLOTS``
+    seconds, each counting the requests admitted in it. A request is admitted
+    while the current slot and the SLOTS before it hold fewer than ``limit``:
+    that span covers every window of ``window`` seconds ending now, so no
+    such window ever admits more than ``limit`` requests. The price is a
+    sustained rate of ``limit`` per ``window * (SLOTS + 1) / SLOTS`` seconds.
+    Keys are kept in LRU order: idle keys are dropped once all their slots
+    have aged out (indistinguishable from a new client), and the least
+    recently used key is evicted when ``max_clients`` is reached. Every call
+    is O(SLOTS).
+    """
+    SLOTS = 10
+
+    __slots__ = ("max_clients", "_windows", "_lock", "allowed", "denied", "evictions")
+
+    def __init__(self, max_clients: int):
+        self.max_clients = max_clients
+        # key -> [expires_at, last_slot, count per slot (ring of SLOTS + 1)]
+        self._windows: "OrderedDict[Any, List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.allowed = 0
+        self.denied = 0
+        self.evictions = 0
+
+    def _evict(self, now: float):
+        windows = self._windows
+        while windows:
+            key, entry = next(iter(windows.items()))
+            if entry[0] > now and len(windows) < self.max_clients:
+                break
+            if entry[0] > now:
+                self.evictions += 1
+            del windows[key]
+
+    def allow(self, key: Any, limit: int, window: float) -> bool:
+        """Count one request against ``key``; False if its window is full."""
+        now = time.monotonic()
+        width = window / self.SLOTS
+        slot = int(now // width)
+        ring = self.SLOTS + 1
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry is None or slot - entry[1] >= ring:
+                if entry is None:
+                    self._evict(now)
+                counts = [0] * ring
+            else:
+                counts = entry[2]
+                for stale in range(entry[1] + 1, slot + 1):
+                    counts[stale % ring] = 0
+                self._windows.move_to_end(key)
+
+            allowed = sum(counts) < limit
+            if allowed:
+                counts[slot % ring] += 1
+                self.allowed += 1
+            else:
+                self.denied += 1
+            self._windows[key] = [(slot + ring) * width, slot, counts]
+            return allowed
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "clients": len(self._windows),
+            "max_clients": self.max_clients,
+            "allowed": self.allowed,
+            "denied": self.denied,
+            "evictions": self.evictions,
+        }
+
+# Security events kept in memory for export_security_events
+SECURITY_LOG_CAPACITY = 1000
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves message formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+class _PropagatingHandler(logging.Handler):
+    """
+    Hands records to the handlers of ``logger``'s ancestors, looked up when
+    each record is written, as propagation would if ``logger`` propagated.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        super().__init__()
+        self.logger = logger
+
+    def emit(self, record: logging.LogRecord):
+        if self.logger.parent is not None:
+            self.logger.parent.handle(record)
+
+# Security events are written by a background listener so the request path only enqueues them
+security_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+security_logger = logging.getLogger(f"{__name__}.security")
+security_logger.addHandler(_DeferredQueueHandler(security_log_queue))
+security_logger.propagate = False
+security_log_listener = logging.handlers.QueueListener(security_log_queue, _PropagatingHandler(security_logger))
+security_log_listener.start()
+atexit.register(security_log_listener.stop)
+
+def _parse_event_time(value: Optional[str]) -> Optional[float]:
+    """Accept a Unix timestamp, an ISO 8601 datetime, or a relative age such as '15m', '2h' or '1d'."""
+    if value is None or value == "":
+        return None
+    value = str(value).strip()
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    if value[-1:] in units and value[:-1].replace(".", "", 1).isdigit():
+        return time.time() - float(value[:-1]) * units[value[-1]]
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+def _hash_api_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+class MemoryStateBackend:
+    """Rate-limit windows and API keys held in this process only."""
+    __slots__ = ("limiter", "_api_keys")
+
+    def __init__(self, max_clients: int = RATE_LIMIT_MAX_CLIENTS):
+        self.limiter = SlidingWindowLimiter(max_clients)
+        self._api_keys: Dict[str, str] = {}
+
+    def take_token(self, key: str, limit: int, window: float) -> bool:
+        return self.limiter.allow(key, limit, window)
+
+    def add_api_key(self, api_key: str, owner: str = ""):
+        self._api_keys[_hash_api_key(api_key)] = owner
+
+    def remove_api_key(self, api_key: str):
+        self._api_keys.pop(_hash_api_key(api_key), None)
+
+    def has_api_key(self, api_key: str) -> bool:
+        return _hash_api_key(api_key) in self._api_keys
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": "memory", "api_keys": len(self._api_keys), **self.limiter.stats()}
+
+class SQLiteStateBackend:
+    """
+    Rate-limit windows and API keys (stored as SHA-256 hashes) in a SQLite
+    database in WAL mode, shared by every worker process on the host.
+
+    Windows use the same slots as SlidingWindowLimiter, one row per key and
+    slot, and each update is one ``BEGIN IMMEDIATE`` transaction, so the
+    count-check-add is atomic across processes. With ``lease`` > 1 a worker
+    reserves up to that many requests per transaction (capped at 5% of the
+    limit) and spends them locally, cutting writes by the same factor.
+    Reservations are counted in the slot they were made in and expire after
+    LEASE_TTL seconds or at the end of that slot, whichever is first, and are
+    never returned, so workers together can only under-use the limit, not
+    exceed it. Slots that have aged out are pruned every PRUNE_INTERVAL
+    seconds.
+    """
+    LEASE_TTL = 1.0
+    PRUNE_INTERVAL = 60.0
+
+    __slots__ = ("path", "lease", "max_clients", "_local", "_leases", "_lock", "_last_prune",
+                 "allowed", "denied", "transactions")
+
+    def __init__(self, path: str, lease: int = 1, max_clients: int = RATE_LIMIT_MAX_CLIENTS):
+        self.path = path
+        self.lease = max(lease, 1)
+        self.max_clients = max_clients
+        self._local = threading.local()
+        self._leases: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._last_prune = 0.0
+        self.allowed = 0
+        self.denied = 0
+        self.transactions = 0
+
+        conn = self._connect()
+        conn.execute("CREATE TABLE IF NOT EXISTS rate_slots (key TEXT NOT NULL, slot INTEGER NOT NULL, "
+                     "count INTEGER NOT NULL, expires REAL NOT NULL, PRIMARY KEY (key, slot))")
+        conn.execute("CREATE INDEX IF NOT EXISTS rate_slots_expires ON rate_slots (expires)")
+        conn.execute("CREATE TABLE IF NOT EXISTS api_keys "
+                     "(key_hash TEXT PRIMARY KEY, owner TEXT NOT NULL DEFAULT '', created REAL NOT NULL)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def take_token(self, key: str, limit: int, window: float) -> bool:
+        now = time.time()
+        with self._lock:
+            lease = self._leases.get(key)
+            if lease is not None and lease[0] >= 1 and lease[1] > now:
+                lease[0] -= 1
+                self.allowed += 1
+                return True
+
+        width = window / SlidingWindowLimiter.SLOTS
+        slot = int(now // width)
+        granted = self._take(key, limit, window, min(self.lease, max(1, limit // 20)), now)
+
+        with self._lock:
+            if not granted:
+                self._leases.pop(key, None)
+                self.denied += 1
+                return False
+            self.allowed += 1
+            if granted > 1:
+                if len(self._leases) >= self.max_clients:
+                    self._leases = {k: v for k, v in self._leases.items() if v[1] > now}
+                self._leases[key] = [granted - 1, min(now + self.LEASE_TTL, (slot + 1) * width)]
+            return True
+
+    def _take(self, key: str, limit: int, window: float, wanted: int, now: float) -> int:
+        """Atomically admit up to ``wanted`` requests into ``key``'s shared window."""
+        slots = SlidingWindowLimiter.SLOTS
+        width = window / slots
+        slot = int(now // width)
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            used = conn.execute("SELECT COALESCE(SUM(count), 0) FROM rate_slots WHERE key = ? AND slot >= ?",
+                                (key, slot - slots)).fetchone()[0]
+            granted = max(0, min(wanted, limit - used))
+            if granted:
+                conn.execute("INSERT INTO rate_slots (key, slot, count, expires) VALUES (?, ?, ?, ?) "
+                             "ON CONFLICT(key, slot) DO UPDATE SET count = count + excluded.count",
+                             (key, slot, granted, (slot + slots + 1) * width))
+            if now - self._last_prune > self.PRUNE_INTERVAL:
+                self._last_prune = now
+                conn.execute("DELETE FROM rate_slots WHERE expires <= ?", (now,))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        self.transactions += 1
+        return granted
+
+    def add_api_key(self, api_key: str, owner: str = ""):
+        self._connect().execute("INSERT OR REPLACE INTO api_keys (key_hash, owner, created) VALUES (?, ?, ?)",
+                                (_hash_api_key(api_key), owner, time.time()))
+
+    def remove_api_key(self, api_key: str):
+        self._connect().execute("DELETE FROM api_keys WHERE key_hash = ?", (_hash_api_key(api_key),))
+
+    def has_api_key(self, api_key: str) -> bool:
+        row = self._connect().execute("SELECT 1 FROM api_keys WHERE key_hash = ?",
+                                      (_hash_api_key(api_key),)).fetchone()
+        return row is not None
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        return {
+            "backend": f"sqlite:{self.path}",
+            "api_keys": conn.execute("SELECT COUNT(*) FROM api_keys").fetchone()[0],
+            "clients": conn.execute("SELECT COUNT(DISTINCT key) FROM rate_slots").fetchone()[0],
+            "leased_keys": len(self._leases),
+            "allowed": self.allowed,
+            "denied": self.denied,
+            "transactions": self.transactions,
+        }
+
+def create_state_backend(spec: str):
+    """Build the state backend named by WORDPRESS_MCP_STATE_BACKEND."""
+    if spec.startswith("sqlite:"):
+        return SQLiteStateBackend(spec[len("sqlite:"):], RATE_LIMIT_LEASE)
+    if spec not in ("", "memory"):
+        raise ValueError(f"Unknown state backend: {spec}")
+    return MemoryStateBackend()
+
+class SanitizePolicy:
+    """
+    Compiled single-pass sanitizer for one kind of parameter. Strings are
+    cleaned with one ``str.translate`` table or one precompiled regex;
+    lists and dicts are cleaned element by element; anything else passes
+    through untouched.
+    """
+    __slots__ = ("name", "_table", "_pattern")
+
+    def __init__(self, name: str, delete: str = "", pattern: Optional[str] = None):
+        self.name = name
+        self._table = str.maketrans("", "", delete)
+        self._pattern = re.compile(pattern) if pattern else None
+
+    def __call__(self, value: Any) -> Any:
+        if isinstance(value, str):
+            if self._pattern is not None:
+                return self._pattern.sub("", value).strip()
+            return value.translate(self._table).strip()
+        if isinstance(value, dict):
+            return {k: self(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self(item) for item in value]
+        return value
+
+SANITIZE_POLICIES: Dict[str, Optional[SanitizePolicy]] = {
+    # Free text: drop markup, quote, path and shell-sensitive characters
+    "text": SanitizePolicy("text", delete='<>"\'&\\/;()'),
+    # Identifiers such as plugin/theme slugs and table names
+    "slug": SanitizePolicy("slug", pattern=r"[^A-Za-z0-9_.\-]+"),
+    # Filesystem paths and URLs: keep separators, drop shell metacharacters and control characters
+    "path": SanitizePolicy("path", pattern=r"[\x00-\x1f<>\"'`|;$]+"),
+    # Parameters that must reach the function unchanged (code, CSS, SQL, JSON)
+    "trusted": None,
+}
+
+_UNSANITIZED_TYPES = (int, float, bool)
+
+def compile_sanitizer(func, policies: Optional[Dict[str, str]] = None):
+    """
+    Build the per-parameter sanitizer for ``func`` once, at decoration time.
+
+    ``policies`` maps parameter names to a SANITIZE_POLICIES key; other
+    parameters use "text", except those annotated as int/float/bool, which
+    are never touched. Returns ``sanitize(args, kwargs) -> (args, kwargs)``.
+    """
+    policies = policies or {}
+    unknown = set(policies.values()) - set(SANITIZE_POLICIES)
+    if unknown:
+        raise ValueError(f"Unknown sanitize policy: {', '.join(sorted(unknown))}")
+    default = SANITIZE_POLICIES["text"]
+
+    positional: List[Optional[SanitizePolicy]] = []
+    by_name: Dict[str, Optional[SanitizePolicy]] = {}
+    for param in inspect.signature(func).parameters.values():
+        if param.name in policies:
+            policy = SANITIZE_POLICIES[policies[param.name]]
+        elif param.annotation in _UNSANITIZED_TYPES:
+            policy = None
+        else:
+            policy = default
+        by_name[param.name] = policy
+        if param.kind in (param.POSITIONAL_ONLY, param.POSITIONAL_OR_KEYWORD):
+            positional.append(policy)
+
+    def sanitize(args: tuple, kwargs: Dict[str, Any]) -> Tuple[tuple, Dict[str, Any]]:
+        if args:
+            args = tuple(
+                policy(arg) if policy is not None else arg
+                for policy, arg in zip(positional + [default] * (len(args) - len(positional)), args)
+            )
+        if kwargs:
+            cleaned = {}
+            for name, value in kwargs.items():
+                policy = by_name.get(name, default)
+                cleaned[name] = policy(value) if policy is not None else value
+            kwargs = cleaned
+        return args, kwargs
+
+    return sanitize
+
 class MCPSecurityManager:
     """Security manager for MCP server operations."""
     
-    def __init__(self):
-        self.rate_limits: Dict[str, Dict[str, Any]] = {}
-        self.api_keys: Dict[str, str] = {}  # In production, use secure storage
+    def __init__(self, state=None):
+        # Rate-limit windows and API keys (MemoryStateBackend or SQLiteStateBackend)
+        self.state = state if state is not None else MemoryStateBackend()
         self.blocked_ips: set = set()
-        self.request_log: list = []
+        self.request_log: deque = deque(maxlen=SECURITY_LOG_CAPACITY)
         
     def validate_request(self, request_data: Dict[str, Any]) -> bool:
         """Validate incoming MCP requests."""
@@ -2853,26 +5508,17 @@ class MCPSecurityManager:
         return True
     
     def check_rate_limit(self, client_id: str, limit: int = 100, window: int = 3600) -> bool:
-        """Check if client has exceeded rate limit."""
-        current_time = time.time()
-        
-        if client_id not in self.rate_limits:
-            self.rate_limits[client_id] = {'count': 0, 'window_start': current_time}
-        
-        rate_data = self.rate_limits[client_id]
-        
-        # Reset window if expired
-        if current_time - rate_data['window_start'] > window:
-            rate_data['count'] = 0
-            rate_data['window_start'] = current_time
-        
-        # Check limit
-        if rate_data['count'] >= limit:
-            self.log_security_event('rate_limit_exceeded', {'client_id': client_id})
-            return False
+        """Check if client has exceeded rate limit (one sliding window per client and limit/window)."""
+        try:
+            if self.state.take_token(f"{client_id}|{limit}|{window}", limit, window):
+                return True
+        except sqlite3.Error as e:
+            # Fail open: a locked or unavailable state file must not take the server down
+            logger.warning(f"Rate limit state unavailable, allowing request: {e}")
+            return True
         
-        rate_data['count'] += 1
-        return True
+        self.log_security_event('rate_limit_exceeded', {'client_id': client_id})
+        return False
     
     def authenticate_request(self, api_key: Optional[str] = None) -> bool:
         """Authenticate API requests."""
@@ -2886,25 +5532,16 @@ class MCPSecurityManager:
             return False
             
         # Check against stored keys (in production, use secure database)
-        if api_key in self.api_keys:
+        if self.state.has_api_key(api_key):
             return True
             
         self.log_security_event('unauthorized_access', {'api_key': api_key[:10]})
         return False
     
-    def sanitize_input(self, input_data: Any) -> Any:
-        """Sanitize input data to prevent injection attacks."""
-        if isinstance(input_data, str):
-            # Remove potentially dangerous characters
-            dangerous_chars = ['<', '>', '"', "'", '&', '\\', '/', ';', '(', ')']
-            for char in dangerous_chars:
-                input_data = input_data.replace(char, '')
-            return input_data.strip()
-        elif isinstance(input_data, dict):
-            return {k: self.sanitize_input(v) for k, v in input_data.items()}
-        elif isinstance(input_data, list):
-            return [self.sanitize_input(item) for item in input_data]
-        return input_data
+    def sanitize_input(self, input_data: Any, policy: str = "text") -> Any:
+        """Sanitize input data to prevent injection attacks (see SANITIZE_POLICIES)."""
+        sanitizer = SANITIZE_POLICIES[policy]
+        return sanitizer(input_data) if sanitizer is not None else input_data
     
     def log_security_event(self, event_type: str, details: Dict[str, Any]):
         """Log security events for monitoring."""
@@ -2914,13 +5551,22 @@ class MCPSecurityManager:
             'details': details,
             'ip': details.get('ip', 'unknown')
         }
+        # Ring buffer: the oldest entry drops off once SECURITY_LOG_CAPACITY is reached
         self.request_log.append(log_entry)
         
-        # Keep only last 1000 entries
-        if len(self.request_log) > 1000:
-            self.request_log = self.request_log[-1000:]
-        
-        logger.warning(f"Security event: {event_type} - {details}")
+        security_logger.warning("Security event: %s - %s", event_type, details)
+    
+    def security_events(self, event_types: Optional[List[str]] = None, since: Optional[float] = None,
+                        until: Optional[float] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Recent security events, oldest first, filtered by type and time range."""
+        wanted = set(event_types) if event_types else None
+        events = [
+            entry for entry in list(self.request_log)
+            if (wanted is None or entry['event_type'] in wanted)
+            and (since is None or entry['timestamp'] >= since)
+            and (until is None or entry['timestamp'] <= until)
+        ]
+        return events[-limit:] if limit else events
     
     def secure_error_response(self, error_type: str) -> str:
         """Return secure error responses without exposing internals."""
@@ -2934,13 +5580,22 @@ class MCPSecurityManager:
         return secure_errors.get(error_type, 'An error occurred')
 
 # Initialize security manager
-security_manager = MCPSecurityManager()
+security_manager = MCPSecurityManager(create_state_backend(STATE_BACKEND))
 
-def secure_mcp_resource(rate_limit: int = 100, require_auth: bool = False):
-    """Decorator to add security to MCP resources."""
+def secure_mcp_resource(rate_limit: int = 100, require_auth: bool = False,
+                        sanitize: Optional[Dict[str, str]] = None):
+    """
+    Decorator to add security to MCP resources and tools (sync or async).
+    
+    ``sanitize`` maps parameter names to a SANITIZE_POLICIES key, e.g.
+    ``{"wp_path": "path", "plugin": "slug", "content": "trusted"}``. The
+    per-parameter sanitizer is compiled once here; int/float/bool
+    parameters are skipped and everything else defaults to "text".
+    """
     def decorator(func):
-        @wraps(func)
-        def wrapper(*args, **kwargs):
+        sanitize_call = compile_sanitizer(func, sanitize)
+        
+        def check(args, kwargs):
             # Get client identifier (in production, use proper client identification)
             client_id = kwargs.get('client_id', 'anonymous')
             
@@ -2953,25 +5608,64 @@ def secure_mcp_resource(rate_limit: int = 100, require_auth: bool = False):
             if require_auth and not security_manager.authenticate_request(api_key):
                 raise Exception(security_manager.secure_error_response('unauthorized_access'))
             
-            # Sanitize inputs
-            sanitized_args = [security_manager.sanitize_input(arg) for arg in args]
-            sanitized_kwargs = {k: security_manager.sanitize_input(v) for k, v in kwargs.items()}
-            
+            return sanitize_call(args, kwargs)
+        
+        def fail(e: Exception):
+            # Log error securely
+            security_manager.log_security_event('resource_error', {
+                'function': func.__name__,
+                'error': str(e)
+            })
+            return Exception(security_manager.secure_error_response('internal_error'))
+        
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                args, kwargs = check(args, kwargs)
+                try:
+                    return await func(*args, **kwargs)
+                except Exception as e:
+                    raise fail(e)
+            return async_wrapper
+        
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            args, kwargs = check(args, kwargs)
             try:
                 # Execute the original function
-                result = func(*sanitized_args, **sanitized_kwargs)
-                return result
+                return func(*args, **kwargs)
             except Exception as e:
-                # Log error securely
-                security_manager.log_security_event('resource_error', {
-                    'function': func.__name__,
-                    'error': str(e)
-                })
-                raise Exception(security_manager.secure_error_response('internal_error'))
+                raise fail(e)
         
         return wrapper
     return decorator
 
+def _security_events_jsonl(events: List[Dict[str, Any]]) -> str:
+    return "\n".join(json.dumps(entry, default=str, sort_keys=True) for entry in events)
+
+@mcp.resource("wordpress://security/events")
+def get_security_events() -> str:
+    """Recent security events (rate limits, auth failures, resource errors) as JSON lines, oldest first"""
+    return _security_events_jsonl(security_manager.security_events())
+
+@mcp.tool()
+def export_security_events(event_type: str = None, since: str = None, until: str = None,
+                           limit: int = 100) -> str:
+    """
+    Export recent security events as JSON lines, oldest first.
+    
+    event_type takes one type or a comma-separated list (e.g. "rate_limit_exceeded,unauthorized_access").
+    since/until accept a Unix timestamp, an ISO 8601 datetime, or an age such as "15m", "2h" or "1d".
+    """
+    try:
+        since_ts = _parse_event_time(since)
+        until_ts = _parse_event_time(until)
+    except ValueError as e:
+        return f"Error: Invalid time range: {e}"
+    
+    event_types = [t.strip() for t in event_type.split(",") if t.strip()] if event_type else None
+    return _security_events_jsonl(security_manager.security_events(event_types, since_ts, until_ts, limit))
+
 # Apply security to critical resources
 @mcp.resource("wordpress://security/mcp-server-security")
 @secure_mcp_resource(rate_limit=50, require_auth=False)
@@ -3037,4 +5731,563 @@ def get_analytics_tracking() -> str:
 @mcp.resource("wordpress://workflows/development-workflow")
 def get_development_workflow() -> str:
     """WordPress Development Workflow - Git, deployment, testing, and automation best practices"""
-    return load_resource_content("workflows", "development-workflow")
\ No newline at end of file
+    return load_resource_content("workflows", "development-workflow")
+
+# === CAPABILITY REGISTRY ===
+
+class Capability:
+    """One tool, resource, resource template or prompt registered with FastMCP."""
+    __slots__ = ("kind", "name", "description", "path", "size", "hash", "handler")
+
+    def __init__(self, kind: str, name: str, description: str, path: Optional[str] = None,
+                 handler: Optional[Callable] = None):
+        self.kind = kind
+        self.name = name
+        self.description = description
+        self.path = path
+        self.size: Optional[int] = None
+        self.hash: Optional[str] = None
+        self.handler = handler
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {slot: getattr(self, slot) for slot in self.__slots__ if slot != "handler"}
+
+def _resource_file(fn) -> Optional[str]:
+    """
+    Markdown file a resource handler serves, found from the (category, topic)
+    string constants it passes to load_resource_content.
+    """
+    constants = [value for value in inspect.unwrap(fn).__code__.co_consts if isinstance(value, str)]
+    for category, topic in zip(constants, constants[1:]):
+        if "/" not in category and "/" not in topic:
+            path = Path(category, f"{topic}.md").as_posix()
+            if metadata_registry.get(path) is not None:
+                return path
+    return None
+
+class CapabilityRegistry:
+    """
+    Snapshot of what the FastMCP instance actually serves, introspected once
+    after every handler is registered. File-backed resources carry the size
+    and content hash of their markdown file from the metadata registry; when
+    the registry's generation changes only those fields are re-resolved.
+    """
+    __slots__ = ("server", "registry", "_capabilities", "_generation", "_lock")
+
+    def __init__(self, server: FastMCP, registry: MetadataRegistry):
+        self.server = server
+        self.registry = registry
+        self._capabilities: Optional[List[Capability]] = None
+        self._generation = -1
+        self._lock = threading.Lock()
+
+    async def _list(self, name: str, legacy: str) -> list:
+        # FastMCP 2.x exposes get_*() returning dicts, later releases list_*() returning lists
+        method = getattr(self.server, name, None) or getattr(self.server, legacy)
+        components = await method()
+        return list(components.values()) if isinstance(components, dict) else list(components)
+
+    async def _introspect(self) -> List[Capability]:
+        def summary(component) -> str:
+            return (getattr(component, "description", None) or "").strip().split("\n")[0]
+
+        capabilities = [Capability("tool", tool.name, summary(tool))
+                        for tool in await self._list("list_tools", "get_tools")]
+        for resource in await self._list("list_resources", "get_resources"):
+            fn = getattr(resource, "fn", None)
+            capabilities.append(Capability("resource", str(resource.uri), summary(resource),
+                                           _resource_file(fn) if fn is not None else None, fn))
+        capabilities += [Capability("template", str(template.uri_template), summary(template))
+                         for template in await self._list("list_resource_templates", "get_resource_templates")]
+        capabilities += [Capability("prompt", prompt.name, summary(prompt), handler=getattr(prompt, "fn", None))
+                         for prompt in await self._list("list_prompts", "get_prompts")]
+        return capabilities
+
+    def build(self):
+        """Introspect the server (works with or without a running event loop)."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            capabilities = asyncio.run(self._introspect())
+        else:
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                capabilities = pool.submit(asyncio.run, self._introspect()).result()
+        with self._lock:
+            self._capabilities = capabilities
+            self._generation = -1
+
+    def capabilities(self) -> List[Capability]:
+        if self._capabilities is None:
+            self.build()
+        self.registry.refresh()
+        if self.registry.generation != self._generation:
+            with self._lock:
+                generation = self.registry.generation
+                for capability in self._capabilities:
+                    record = self.registry.get(capability.path) if capability.path else None
+                    capability.size = record.size if record else None
+                    capability.hash = record.hash if record else None
+                self._generation = generation
+        return self._capabilities
+
+    def resource(self, uri: str) -> Optional[Capability]:
+        for capability in self.capabilities():
+            if capability.kind == "resource" and capability.name == uri:
+                return capability
+        return None
+
+    def resource_path(self, uri: str) -> Optional[str]:
+        """Markdown file behind a resource URI (fragment ignored), or None for dynamic resources."""
+        uri = uri.split("#", 1)[0]
+        if uri.startswith("wordpress://snippets/"):
+            path = f"snippets/{uri[len('wordpress://snippets/'):]}.md"
+            return path if self.registry.get(path) is not None else None
+        capability = self.resource(uri)
+        return capability.path if capability is not None else None
+
+    def stats(self) -> Dict[str, Any]:
+        capabilities = self.capabilities()
+        counts = {"tool": 0, "resource": 0, "template": 0, "prompt": 0}
+        for capability in capabilities:
+            counts[capability.kind] += 1
+        records = self.registry.records()
+        return {
+            "tools": counts["tool"],
+            "resources": counts["resource"],
+            "templates": counts["template"],
+            "prompts": counts["prompt"],
+            "file_backed_resources": sum(1 for c in capabilities if c.hash),
+            "docs": sum(1 for record in records if record.kind == "resource"),
+            "snippets": sum(1 for record in records if record.kind == "snippet"),
+            "total_files": len(records),
+            "total_bytes": sum(record.size for record in records),
+            "fingerprint": self.registry.fingerprint(),
+        }
+
+capability_registry = CapabilityRegistry(mcp, metadata_registry)
+
+def _prompt_handler(name: str) -> Optional[Callable]:
+    for capability in capability_registry.capabilities():
+        if capability.kind == "prompt" and capability.name == name:
+            return capability.handler
+    return None
+
+def _prompt_documents() -> List[Tuple[ResourceMetadata, str]]:
+    """Every argument-free prompt as a search document built from the text it renders."""
+    documents = []
+    for capability in capability_registry.capabilities():
+        if capability.kind != "prompt" or capability.handler is None:
+            continue
+        try:
+            text = capability.handler()
+        except TypeError:
+            continue
+        if not isinstance(text, str):
+            continue
+        encoded = text.encode('utf-8')
+        record = ResourceMetadata(
+            capability.name, "prompts", "prompt", f"prompts/{capability.name}", "Intermediate", [],
+            capability.description, [], len(encoded), hashlib.sha1(encoded).hexdigest(), 0, False,
+        )
+        documents.append((record, text))
+    return documents
+
+search_index.virtual_documents = _prompt_documents
+
+@mcp.resource("wordpress://prompts/{name}")
+def get_prompt_text(name: str) -> str:
+    """Prompt Text - The workflow a prompt renders, readable by URI from search results"""
+    handler = _prompt_handler(name)
+    if handler is None:
+        return f"Prompt not found: {name}\n\nUse search(query=..., types=\"prompt\") to find prompts."
+    return handler()
+
+@mcp.resource("wordpress://server/capabilities")
+def get_server_capabilities() -> str:
+    """Server Capabilities - Every registered tool, resource, template and prompt, with file sizes and hashes, as JSON"""
+    return json.dumps({
+        "stats": capability_registry.stats(),
+        "capabilities": [capability.to_dict() for capability in capability_registry.capabilities()],
+    }, indent=2)
+
+# === RESOURCE SECTIONS ===
+
+SECTION_INDEX_VERSION = 1
+
+_ATX_HEADING_RE = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+
+def heading_anchor(title: str) -> str:
+    """GitHub-style anchor for a heading: lowercase, punctuation dropped, spaces as hyphens."""
+    slug = re.sub(r"[^\w\- ]", "", title.strip().lower())
+    return slug.replace(" ", "-").strip("-")
+
+def outline_sections(content: str) -> List[list]:
+    """
+    ``[level, anchor, title, start, end, line]`` for every ATX heading
+    outside fenced code, in document order. ``start``/``end`` are UTF-8
+    byte offsets spanning the heading and everything up to the next
+    heading of the same or a higher level; ``line`` is 1-based. Repeated
+    anchors get ``-1``, ``-2``... suffixes as on GitHub.
+    """
+    sections = []
+    seen: Dict[str, int] = {}
+    offset = 0
+    in_code = False
+    for number, line in enumerate(content.split("\n"), 1):
+        if _FENCE_RE.match(line):
+            in_code = not in_code
+        elif not in_code:
+            match = _ATX_HEADING_RE.match(line)
+            if match:
+                title = match.group(2)
+                anchor = heading_anchor(title) or "section"
+                if anchor in seen:
+                    seen[anchor] += 1
+                    anchor = f"{anchor}-{seen[anchor]}"
+                else:
+                    seen[anchor] = 0
+                sections.append([len(match.group(1)), anchor, title, offset, None, number])
+        offset += len(line.encode('utf-8')) + 1
+
+    end_of_file = offset - 1
+    open_sections: List[list] = []
+    for section in sections:
+        while open_sections and open_sections[-1][0] >= section[0]:
+            open_sections.pop()[4] = section[3]
+        open_sections.append(section)
+    for section in open_sections:
+        section[4] = end_of_file
+    return sections
+
+class SectionIndex:
+    """
+    Heading tree with byte offsets for every resource and snippet, so one
+    section can be served as a slice of the cached (or mapped) bytes.
+
+    ``sections`` maps a registry path to outline_sections() rows. Rebuilt
+    when the metadata registry's generation changes, or adopted from the
+    content bundle when its fingerprint still matches.
+    """
+
+    def __init__(self, registry: MetadataRegistry):
+        self.registry = registry
+        self.sections: Dict[str, List[list]] = {}
+        self.fingerprint: Optional[str] = None
+        self.generation = -1
+        self.built_from = None
+        self._lock = threading.Lock()
+
+    def ensure_current(self):
+        self.registry.refresh()
+        if self.generation == self.registry.generation:
+            return
+        with self._lock:
+            generation = self.registry.generation
+            if self.generation == generation:
+                return
+            fingerprint = self.registry.fingerprint(f"sections{SECTION_INDEX_VERSION}")
+            if fingerprint != self.fingerprint:
+                bundle = self.registry.store.bundle
+                data = bundle.section('section_index') if bundle is not None else None
+                if data and data.get('version') == SECTION_INDEX_VERSION and data.get('fingerprint') == fingerprint:
+                    self.sections = data['sections']
+                    self.built_from = "bundle"
+                else:
+                    self.sections = self._build()
+                    self.built_from = "source"
+                self.fingerprint = fingerprint
+            self.generation = generation
+
+    def _build(self) -> Dict[str, List[list]]:
+        sections = {}
+        for record in self.registry.records():
+            try:
+                sections[record.path] = outline_sections(content_store.get(self.registry.root / record.path))
+            except (OSError, UnicodeDecodeError):
+                continue
+        return sections
+
+    def outline(self, path: str) -> List[list]:
+        self.ensure_current()
+        return self.sections.get(path, [])
+
+    def read(self, path: str, section: str) -> Tuple[Optional[list], Optional[str]]:
+        """
+        ``(row, text)`` for the section of ``path`` whose anchor (or heading
+        text) is ``section``, or ``(None, None)``. The text is decoded from
+        a slice of the cached bytes; if the file changed since the outline
+        was indexed it is recomputed from the current content first.
+        """
+        view = content_store.get_bytes(RESOURCES_DIR / path)
+        row = self._find(self.outline(path), section)
+        if row is None or row[4] > len(view) or view[row[3]:row[3] + row[0] + 1] != b"#" * row[0] + b" ":
+            row = self._find(outline_sections(str(view, 'utf-8')), section)
+        if row is None:
+            return None, None
+        return row, str(view[row[3]:row[4]], 'utf-8')
+
+    @staticmethod
+    def _find(rows: List[list], section: str) -> Optional[list]:
+        """Exact anchor, then anchor of the given heading text, then first anchor it is a prefix of."""
+        section = section.strip().lstrip("#").strip()
+        anchor = heading_anchor(section)
+        for key in (section.lower(), anchor):
+            for row in rows:
+                if row[1] == key:
+                    return row
+        if anchor:
+            for row in rows:
+                if row[1].startswith(anchor + "-"):
+                    return row
+        return None
+
+    def serialize(self) -> Dict[str, Any]:
+        return {'version': SECTION_INDEX_VERSION, 'fingerprint': self.fingerprint, 'sections': self.sections}
+
+section_index = SectionIndex(metadata_registry)
+
+def _render_outline(uri: str, rows: List[list]) -> str:
+    output = f"# Outline: `{uri}`\n\n"
+    if not rows:
+        return output + "This resource has no headings; read it whole.\n"
+    top = min(row[0] for row in rows)
+    for level, anchor, title, start, end, _ in rows:
+        output += f"{'  ' * (level - top)}- {title} — `{uri}#{anchor}` ({end - start:,} bytes)\n"
+    output += f"\nRead one section with `get_section(uri=\"{uri}#<anchor>\")`.\n"
+    return output
+
+def read_resource_section(uri: str, section: str = "") -> str:
+    """One section of the resource behind ``uri``, or its outline when no section is given."""
+    if "#" in uri:
+        uri, fragment = uri.split("#", 1)
+        section = section or fragment
+    path = capability_registry.resource_path(uri)
+    if path is None:
+        return f"Error: {uri} is not a file-backed resource. Use search(query=...) to find resource URIs."
+    if not section:
+        return _render_outline(uri, section_index.outline(path))
+    try:
+        row, text = section_index.read(path, section)
+    except FileNotFoundError:
+        return f"Error: Resource not found: {uri}"
+    if row is None:
+        anchors = ", ".join(f"`{r[1]}`" for r in section_index.outline(path)[:30])
+        return f"Section not found: {uri}#{section}\n\nAvailable sections: {anchors or 'none'}"
+    return text
+
+@mcp.tool()
+def get_section(uri: str, section: str = "") -> str:
+    """
+    Read one section of a resource or snippet instead of the whole file
+    
+    Args:
+        uri: Resource URI, optionally with "#anchor" (e.g. "wordpress://core/database#prepared-statements")
+        section: Section anchor or heading text; leave empty (and omit "#anchor") to get the outline
+    
+    Returns:
+        The section's markdown (its heading and all subsections), or the resource's heading outline
+        
+    Examples:
+        get_section(uri="wordpress://advanced/woocommerce-development")
+        get_section(uri="wordpress://core/database#prepared-statements")
+        get_section(uri="wordpress://snippets/security/nonces", section="ajax-nonce")
+    """
+    return read_resource_section(uri, section)
+
+@mcp.resource("wordpress://{category}/{topic}#{anchor}")
+def get_resource_section(category: str, topic: str, anchor: str) -> str:
+    """Resource Section - One heading's section of a resource, e.g. wordpress://core/database#prepared-statements"""
+    enforce_resource_rate_limit()
+    uri = f"wordpress://{category}/{topic}"
+    if capability_registry.resource_path(uri) is None:
+        raise FileNotFoundError(f"Resource not found: {category}/{topic}")
+    return read_resource_section(uri, anchor)
+
+# === PAGINATED RESOURCE READS ===
+
+def read_resource_page(uri: str, max_bytes: int = PAGE_DEFAULT_BYTES, cursor: str = "") -> str:
+    """
+    One page of any static resource (or ``uri#anchor`` section). File
+    contents are paged from the cached bytes; dynamic resources such as
+    wordpress://snippets/list are rendered and then paged. Raises
+    FileNotFoundError for unknown URIs.
+    """
+    base, _, anchor = uri.partition("#")
+    path = capability_registry.resource_path(base)
+    if path is not None:
+        if anchor:
+            row, text = section_index.read(path, anchor)
+            if row is None:
+                return read_resource_section(uri)
+            data = text.encode('utf-8')
+        else:
+            try:
+                data = bytes(content_store.get_bytes(RESOURCES_DIR / path))
+            except FileNotFoundError:
+                raise FileNotFoundError(f"Resource not found: {base}") from None
+    else:
+        capability = capability_registry.resource(base)
+        if capability is None or capability.handler is None or anchor:
+            raise FileNotFoundError(f"Unknown resource {uri}")
+        result = capability.handler()
+        if inspect.isawaitable(result):
+            return "Error: This resource cannot be paged; read it directly."
+        data = str(result).encode('utf-8')
+    if max_bytes <= 0 and not cursor:
+        return data.decode('utf-8')
+    return render_page(data, max_bytes, cursor)
+
+@mcp.tool()
+def read_resource(uri: str, max_bytes: int = PAGE_DEFAULT_BYTES, cursor: str = "") -> str:
+    """
+    Read a resource in size-capped pages instead of one large response
+    
+    Args:
+        uri: Resource URI, optionally with "#anchor" for one section (e.g. "wordpress://advanced/woocommerce-development")
+        max_bytes: Page size in bytes (default 8000, minimum 512); pages end on heading or code-block boundaries
+        cursor: Cursor printed at the end of the previous page, to continue from there
+    
+    Returns:
+        One page of the resource, ending with the next cursor or an end-of-content marker
+        
+    Examples:
+        read_resource(uri="wordpress://advanced/woocommerce-development", max_bytes=6000)
+        read_resource(uri="wordpress://snippets/list", max_bytes=4000, cursor="3987.1a2b3c4d5e6f")
+    """
+    try:
+        return read_resource_page(uri, max_bytes, cursor)
+    except FileNotFoundError as e:
+        return f"Error: {e}. Use search(query=...) to find resource URIs."
+
+@mcp.resource("wordpress://{category}/{topic}{?max_bytes,cursor}")
+def get_resource_page(category: str, topic: str, max_bytes: int = PAGE_DEFAULT_BYTES, cursor: str = "") -> str:
+    """Resource Page - A size-capped page of a resource, e.g. wordpress://core/database?max_bytes=4000&cursor=..."""
+    enforce_resource_rate_limit()
+    return read_resource_page(f"wordpress://{category}/{topic}", max_bytes, cursor)
+
+@mcp.resource("wordpress://catalog{?max_bytes,cursor}")
+def get_catalog_page(max_bytes: int = PAGE_DEFAULT_BYTES, cursor: str = "") -> str:
+    """Catalog Page - A size-capped page of the resource catalog, e.g. wordpress://catalog?max_bytes=4000"""
+    enforce_resource_rate_limit()
+    return read_resource_page("wordpress://catalog", max_bytes, cursor)
+
+# === LIVENESS AND READINESS ===
+
+# Startup steps that must succeed before the server reports ready
+READINESS_CHECKS = ("resources", "metadata", "search_index", "symbol_index", "section_index", "capabilities")
+
+class ServerState:
+    """
+    Process state captured at startup, so liveness and readiness probes are
+    answered from memory in constant time without touching the disk.
+    """
+    __slots__ = ("started_at", "ready_at", "checks", "_warm_up", "_lock")
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.ready_at: Optional[float] = None
+        self.checks: Dict[str, Tuple[bool, str]] = {}
+        self._warm_up: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start_warm_up(self) -> threading.Thread:
+        """
+        Run _warm_up on a background thread, once per process. Called from
+        the server lifespan rather than at import, so importing the module
+        (scripts/build_bundle.py, tests) does not race a warm-up thread.
+        """
+        with self._lock:
+            if self._warm_up is None:
+                self._warm_up = threading.Thread(target=_warm_up, name="mcp-warm-up", daemon=True)
+                self._warm_up.start()
+            return self._warm_up
+
+    def mark(self, name: str, ok: bool, detail: str = ""):
+        self.checks[name] = (ok, detail)
+        if self.ready and self.ready_at is None:
+            self.ready_at = time.time()
+            logger.info(f"Server ready after {self.ready_at - self.started_at:.2f}s")
+
+    @property
+    def ready(self) -> bool:
+        return all(self.checks.get(name, (False, ""))[0] for name in READINESS_CHECKS)
+
+    def liveness(self) -> Dict[str, Any]:
+        return {"status": "ok", "version": SERVER_VERSION, "uptime": round(time.time() - self.started_at, 3)}
+
+    def readiness(self) -> Dict[str, Any]:
+        if self.ready:
+            status = "ready"
+        elif any(name in self.checks and not self.checks[name][0] for name in READINESS_CHECKS):
+            status = "failed"
+        else:
+            status = "starting"
+        return {
+            "status": status,
+            "version": SERVER_VERSION,
+            "uptime": round(time.time() - self.started_at, 3),
+            "checks": {name: {"ok": ok, "detail": detail} for name, (ok, detail) in self.checks.items()},
+        }
+
+server_state = ServerState()
+
+def _warm_up():
+    """Load the metadata registry and the content indexes once, recording each step for /readyz."""
+    if content_store.bundle is not None:
+        server_state.mark("resources", True, content_store.bundle.path)
+    else:
+        server_state.mark("resources", RESOURCES_DIR.is_dir(), str(RESOURCES_DIR))
+    try:
+        metadata_registry.refresh(force=True)
+        count = len(metadata_registry.records())
+        server_state.mark("metadata", count > 0, f"{count} files")
+    except Exception as e:
+        server_state.mark("metadata", False, str(e))
+    try:
+        search_index.ensure_current()
+        server_state.mark("search_index", True, f"{len(search_index.documents)} documents")
+    except Exception as e:
+        server_state.mark("search_index", False, str(e))
+    try:
+        symbol_index.ensure_current()
+        server_state.mark("symbol_index", True, f"{len(symbol_index.symbols)} symbols")
+    except Exception as e:
+        server_state.mark("symbol_index", False, str(e))
+    try:
+        section_index.ensure_current()
+        count = sum(len(rows) for rows in section_index.sections.values())
+        server_state.mark("section_index", True, f"{count} sections")
+    except Exception as e:
+        server_state.mark("section_index", False, str(e))
+    try:
+        capability_registry.build()
+        stats = capability_registry.stats()
+        server_state.mark("capabilities", stats["tools"] > 0,
+                          f"{stats['tools']} tools, {stats['resources']} resources, {stats['prompts']} prompts")
+    except Exception as e:
+        server_state.mark("capabilities", False, str(e))
+    # Walks resources/, so it runs only once the server is ready and never on the import path
+    if content_store.bundle is not None:
+        try:
+            content_store.bundle.warn_if_stale(RESOURCES_DIR)
+        except Exception as e:
+            logger.warning(f"Could not check content bundle freshness: {e}")
+
+@mcp.resource("wordpress://server/readiness")
+def get_server_readiness() -> str:
+    """Server Readiness - Startup checks (resources, metadata, indexes) as JSON, answered from memory"""
+    return json.dumps(server_state.readiness(), indent=2)
+
+if hasattr(mcp, "custom_route"):
+    @mcp.custom_route("/healthz", methods=["GET"])
+    async def liveness_probe(request):
+        """Liveness: the process is up and its event loop is answering."""
+        from starlette.responses import JSONResponse
+        return JSONResponse(server_state.liveness())
+
+    @mcp.custom_route("/readyz", methods=["GET"])
+    async def readiness_probe(request):
+        """Readiness: startup checks passed; 503 while starting or after a failed check."""
+        from starlette.responses import JSONResponse
+        state = server_state.readiness()
+        return JSONResponse(state, status_code=200 if state["status"] == "ready" else 503)